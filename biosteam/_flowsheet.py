@@ -237,7 +237,8 @@ class Flowsheet:
                       ends: Optional[Iterable[Stream]]=None,
                       facility_recycle: Optional[Stream]=None, 
                       operating_hours: Optional[float]=None,
-                      lang_factor: Optional[float]=None):
+                      lang_factor: Optional[float]=None,
+                      sequencing: Optional[str]=None):
         """
         Create a System object from all units and streams defined in the flowsheet.
         
@@ -260,10 +261,13 @@ class Flowsheet:
             Lang factor for getting fixed capital investment from
             total purchase cost. If no lang factor, installed equipment costs are
             estimated using bare module factors.
+        sequencing :
+            Algorithm for sequencing unit operations ('path' or 'scc'). 
+            Defaults to :attr:`System.default_sequencing <biosteam.System.default_sequencing>`.
         
         """
         return System.from_units(ID, self.unit, ends, facility_recycle,
-                                 operating_hours, lang_factor)
+                                 operating_hours, lang_factor, sequencing)
     
     def __call__(self, ID: str|type[Unit], strict: Optional[bool]=False):
         """
@@ -17,6 +17,8 @@ from thermosteam import Thermo, Stream, ThermalCondition, settings
 from .exceptions import DimensionError
 from math import copysign
 from collections import deque
+from bisect import bisect_right
+import numpy as np
 from typing import Optional, TYPE_CHECKING, Iterable, Literal, Sequence
 if TYPE_CHECKING: from biosteam import Unit
 
@@ -123,16 +125,25 @@ class UtilityAgent(Stream):
         if key in property_cache: return property_cache[key]
         calculate = getattr(self.mixture, name)
         if nophase:
-            property_cache[name] = value = calculate(
+            property_cache[key] = value = calculate(
                 composition, T, P
             )
         else:
-            property_cache[name] = value = calculate(
+            property_cache[key] = value = calculate(
                 phase, composition, T, P
             )
         if len(property_cache) > 100: property_cache.pop(property_cache.__iter__().__next__())
         return value
     
+    @property
+    def T(self) -> float:
+        """Temperature [K]."""
+        return self._thermal_condition._T
+    @T.setter
+    def T(self, T):
+        self._thermal_condition._T = float(T)
+        HeatUtility._agent_tables.clear() # Suitable agents may change
+    
     @property
     def iscooling_agent(self) -> bool:
         """Whether the agent is a cooling agent."""
@@ -297,6 +308,11 @@ class HeatUtility:
     
     #: All cooling utilities available.
     cooling_agents: list[UtilityAgent]
+    
+    #: Bisect-indexed tables of heating and cooling agents (by whether
+    #: agents cool) for selecting suitable agents. Tables are rebuilt when
+    #: agents are added, removed, or reordered or when their temperatures change.
+    _agent_tables: dict[bool, tuple[list[UtilityAgent], list[float]]] = {}
         
     #: All heating utilities available.
     heating_agents: list[UtilityAgent]
@@ -764,6 +780,31 @@ class HeatUtility:
             if agent.ID == ID: return agent
         raise LookupError(ID)
     
+    @classmethod
+    def _get_agent_table(cls, iscooling: bool):
+        """
+        Return agents (in order of preference) and bisection keys for 
+        selecting the first agent that works at a pinch temperature. 
+        Keys are the best (highest if heating and negative lowest if
+        cooling) agent temperatures found up to each agent, so the first 
+        agent that works is the first key that exceeds the (signed) pinch 
+        temperature.
+        
+        """
+        agents = cls.cooling_agents if iscooling else cls.heating_agents
+        tables = cls._agent_tables
+        if iscooling in tables:
+            table = tables[iscooling]
+            if table[0] == agents: return table
+        keys = []
+        best = -float('inf')
+        for agent in agents:
+            T = -agent.T if iscooling else agent.T
+            if T > best: best = T
+            keys.append(best)
+        tables[iscooling] = table = (agents.copy(), keys)
+        return table
+    
     @classmethod
     def get_suitable_heating_agent(cls, T_pinch: float):
         """
@@ -775,9 +816,11 @@ class HeatUtility:
             Pinch temperature [K].
         
         """
-        for agent in cls.heating_agents:
-            if T_pinch < agent.T: return agent
-        raise RuntimeError(f'no heating agent that can heat over {T_pinch} K')    
+        agents, keys = cls._get_agent_table(False)
+        index = bisect_right(keys, T_pinch)
+        if index == len(agents):
+            raise RuntimeError(f'no heating agent that can heat over {T_pinch} K')
+        return agents[index]
 
     @classmethod
     def get_suitable_cooling_agent(cls, T_pinch: float):
@@ -789,9 +832,131 @@ class HeatUtility:
             Pinch temperature [K].
         
         """
-        for agent in cls.cooling_agents:
-            if T_pinch > agent.T: return agent
-        raise RuntimeError(f'no cooling agent that can cool under {T_pinch} K')    
+        agents, keys = cls._get_agent_table(True)
+        index = bisect_right(keys, -T_pinch)
+        if index == len(agents):
+            raise RuntimeError(f'no cooling agent that can cool under {T_pinch} K')
+        return agents[index]
+    
+    @classmethod
+    def batch_evaluate(cls, 
+            unit_duties: Sequence[float], 
+            T_in: Sequence[float], 
+            T_out: Optional[Sequence[float]]=None, 
+            heat_transfer_efficiency: Optional[float]=None,
+            heat_utilities: Optional[Sequence[HeatUtility]]=None,
+        ):
+        """
+        Calculate utility requirements of many process streams at once. 
+        Suitable agents are selected by bisection and flow rates, duties, and 
+        costs are computed in a vectorized pass by agent. Results are the 
+        same as calling a HeatUtility object for each stream.
+        
+        Parameters
+        ----------
+        unit_duties :
+            Unit duty requirements [kJ/hr].
+        T_in : 
+            Inlet process stream temperatures [K].
+        T_out : 
+            Outlet process stream temperatures [K]. Defaults to inlet 
+            temperatures.
+        heat_transfer_efficiency : 
+            Enforced fraction of heat transfered from utilities. Defaults
+            to the heat transfer efficiency of agents.
+        heat_utilities :
+            Heat utilities to load results to (one per process stream).
+        
+        Returns
+        -------
+        agents : list[UtilityAgent|None]
+            Utility agents (None if no duty).
+        flows : 1d array
+            Utility flow rates [kmol/hr].
+        duties : 1d array
+            Utility duties [kJ/hr].
+        costs : 1d array
+            Utility costs [USD/hr].
+        
+        Examples
+        --------
+        >>> from biosteam import HeatUtility, default_utilities
+        >>> default_utilities() # Reset to biosteam defaults
+        >>> agents, flows, duties, costs = HeatUtility.batch_evaluate(
+        ...     [1000, -1000, 0], T_in=[300, 350, 300], T_out=[350, 320, 300]
+        ... )
+        >>> [i.ID if i else None for i in agents]
+        ['low_pressure_steam', 'cooling_water', None]
+        >>> [round(i, 4) for i in flows]
+        [0.0271, 0.6834, 0.0]
+        
+        """
+        unit_duties = np.asarray(unit_duties, dtype=float)
+        N = unit_duties.size
+        T_in = np.broadcast_to(np.asarray(T_in, dtype=float), N)
+        T_out = T_in if T_out is None else np.broadcast_to(np.asarray(T_out, dtype=float), N)
+        flows = np.zeros(N)
+        duties = np.zeros(N)
+        costs = np.zeros(N)
+        agents = N * [None]
+        dT = cls.dT
+        for iscooling in (False, True):
+            if iscooling:
+                index, = np.where(unit_duties < 0.)
+                T_pinch = -(T_out[index] - dT)
+                if (T_in[index] + 1e-1 < T_out[index]).any():
+                    raise ValueError("inlet must be hotter than outlet if cooling")
+            else:
+                index, = np.where(unit_duties > 0.)
+                T_pinch = T_out[index] + dT
+                if (T_in[index] > T_out[index] + 1e-1).any():
+                    raise ValueError("inlet must be cooler than outlet if heating")
+            if not index.size: continue
+            table_agents, keys = cls._get_agent_table(iscooling)
+            agent_index = np.searchsorted(keys, T_pinch, side='right')
+            if (agent_index == len(table_agents)).any():
+                T = T_pinch[agent_index == len(table_agents)][0]
+                if iscooling:
+                    raise RuntimeError(f'no cooling agent that can cool under {-T} K')
+                else:
+                    raise RuntimeError(f'no heating agent that can heat over {T} K')
+            for i in np.unique(agent_index):
+                agent = table_agents[i]
+                rows = index[agent_index == i]
+                duty = unit_duties[rows] / (heat_transfer_efficiency or agent.heat_transfer_efficiency)
+                if agent.T_limit:
+                    T_pinch_out = T_in[rows] - dT if iscooling else T_in[rows] + dT
+                    T_outlets = (np.minimum if iscooling else np.maximum)(T_pinch_out, agent.T_limit)
+                    H = agent._get_property('H')
+                    dh = np.array([H - agent._get_property('H', T=T) for T in T_outlets])
+                else:
+                    Hvap = agent._get_property('Hvap', nophase=True)
+                    dh = -Hvap if agent.phase == 'l' else Hvap
+                flows[rows] = flow = duty / dh
+                duties[rows] = duty
+                costs[rows] = agent._heat_transfer_price * np.abs(duty) + agent._regeneration_price * flow
+                for j in rows: agents[j] = agent
+        if heat_utilities is not None:
+            for hu, agent, flow, duty, cost, unit_duty, T in zip(
+                    heat_utilities, agents, flows, duties, costs, unit_duties, T_in
+                ):
+                if agent is None: 
+                    hu.empty()
+                    continue
+                hu.load_agent(agent)
+                outlet = hu.outlet_utility_stream
+                if agent.T_limit:
+                    outlet.T = hu.get_outlet_temperature(
+                        T - dT if unit_duty < 0. else T + dT, agent.T_limit, unit_duty < 0.
+                    )
+                else:
+                    outlet.phase = 'g' if agent.phase == 'l' else 'l'
+                outlet.mol[:] = flow
+                hu.unit_duty = unit_duty
+                hu.flow = flow
+                hu.duty = duty
+                hu.cost = cost
+        return agents, flows, duties, costs
 
     def load_agent(self, agent: UtilityAgent):
         """Initialize utility streams with given agent."""
@@ -802,6 +967,7 @@ class HeatUtility:
         if agent.utility_stream_dump:
             self.inlet_utility_stream, self.outlet_utility_stream = agent.utility_stream_dump.pop()
             self.inlet_utility_stream.copy_like(agent) # Prevent errors where utility streams are altered
+            self.outlet_utility_stream.copy_thermal_condition(agent)
         else:
             self.inlet_utility_stream = agent.to_stream()
             self.outlet_utility_stream = self.inlet_utility_stream.flow_proxy()
@@ -162,6 +162,226 @@ def nested_network_units(path):
             units.add(i)
     return units
 
+# %% Strongly connected components and tearing
+
+def unit_graph(units, ends=()):
+    """
+    Return a dictionary of unit operations (excluding facilities) and their
+    outlets to other unit operations. Outlets in `ends` and disjunctions 
+    are not included.
+    
+    """
+    isa = isinstance
+    units = [i for i in units if not isa(i, Facility)]
+    unit_set = set(units)
+    excluded = set(ends)
+    excluded.update([i.get_stream() for i in disjunctions])
+    return {i: [s for s in i._outs if s._sink in unit_set and s not in excluded]
+            for i in units}
+
+def subgraph(graph, units, tears=()):
+    """Return graph with only the given units and without tear streams."""
+    unit_set = set(units)
+    return {i: [s for s in graph[i] if s._sink in unit_set and s not in tears]
+            for i in units}
+
+def strongly_connected_components(graph):
+    """
+    Return the strongly connected components of a graph in reverse 
+    topological order using Tarjan's algorithm.
+    
+    """
+    index = {}
+    lowlink = {}
+    stack = []
+    stacked = set()
+    components = []
+    for root in graph:
+        if root in index: continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        stacked.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, outlets = work[-1]
+            for outlet in outlets:
+                sink = outlet._sink
+                if sink not in index:
+                    index[sink] = lowlink[sink] = len(index)
+                    stack.append(sink)
+                    stacked.add(sink)
+                    work.append((sink, iter(graph[sink])))
+                    break
+                elif sink in stacked and index[sink] < lowlink[node]:
+                    lowlink[node] = index[sink]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]: lowlink[parent] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        unit = stack.pop()
+                        stacked.remove(unit)
+                        component.append(unit)
+                        if unit is node: break
+                    components.append(component)
+    return components
+
+def iscyclic(graph, component):
+    if len(component) > 1: return True
+    unit, = component
+    return any([i._sink is unit for i in graph[unit]])
+
+def topological_sort(sinks, order):
+    """
+    Return nodes of an acyclic graph in topological order, where `sinks` 
+    is a dictionary of nodes and their downstream nodes. Ties are broken
+    by the given order.
+    
+    """
+    N_inlets = {i: 0 for i in sinks}
+    for i in sinks.values():
+        for j in i: N_inlets[j] += 1
+    ready = [i for i, N in N_inlets.items() if not N]
+    nodes = []
+    while ready:
+        ready.sort(key=order.__getitem__, reverse=True)
+        node = ready.pop()
+        nodes.append(node)
+        for i in sinks[node]:
+            N_inlets[i] -= 1
+            if not N_inlets[i]: ready.append(i)
+    return nodes
+
+def simple_cycles(graph, limit):
+    """
+    Return simple cycles (as lists of streams) of a graph by depth-first
+    search. Search is stopped after `limit` steps.
+    
+    """
+    order = {j: i for i, j in enumerate(graph)}
+    cycles = []
+    steps = 0
+    for start in graph:
+        first = order[start]
+        path = []
+        visited = {start}
+        work = [(start, iter(graph[start]))]
+        while work:
+            node, outlets = work[-1]
+            for outlet in outlets:
+                steps += 1
+                if steps > limit: return cycles
+                sink = outlet._sink
+                if sink is start: 
+                    cycles.append([*path, outlet])
+                elif order[sink] > first and sink not in visited:
+                    path.append(outlet)
+                    visited.add(sink)
+                    work.append((sink, iter(graph[sink])))
+                    break
+            else:
+                work.pop()
+                visited.discard(node)
+                if path: path.pop()
+    return cycles
+
+def tear_size(stream):
+    """
+    Return the number of tear variables of a stream (temperature, pressure,
+    and molar flow rates). Temporary streams cannot be torn and are only 
+    removed from cycles without other streams.
+    
+    """
+    if isinstance(stream, Stream):
+        return stream._imol._data.size + 2
+    else:
+        return float('inf')
+
+def select_tear_streams(graph, order, limit=10000):
+    """
+    Return a list of tear streams that breaks all cycles of a strongly 
+    connected graph with as few tear variables as possible. Tear streams
+    are sorted by the number of cycles they break per tear variable 
+    (highest first).
+    
+    Simple cycles are covered by greedily tearing the stream that breaks
+    the most cycles per tear variable. Ties are broken in favor of streams 
+    that go furthest back in the given order of unit operations. Redundant
+    tear streams are removed afterwards (largest first). If the search for
+    cycles reaches its `limit` before finding any cycle, the stream that 
+    goes furthest back is torn instead.
+    
+    """
+    fed = set([i for i in graph if any([isinstance(j, Stream) and j._source not in graph for j in i._ins])])
+    tears = set()
+    cycle_counts = {}
+    while True:
+        residual = subgraph(graph, graph, tears)
+        cycles = simple_cycles(residual, limit)
+        if not cycles:
+            streams = [s for i in strongly_connected_components(residual) 
+                       if iscyclic(residual, i) for j in i for s in residual[j]
+                       if s._sink in i]
+            if not streams: break
+            tears.add(max(streams, key=lambda s: (isinstance(s, Stream),
+                                                  order[s._source] - order[s._sink])))
+            continue
+        cycles = [set(i) for i in cycles]
+        while cycles:
+            counts = {}
+            for cycle in cycles:
+                for s in cycle: counts[s] = counts.get(s, 0) + 1
+            if not cycle_counts: cycle_counts = counts
+            tear = max(counts, key=lambda s: (counts[s] / tear_size(s), s._sink in fed,
+                                              order[s._source] - order[s._sink]))
+            tears.add(tear)
+            cycles = [i for i in cycles if tear not in i]
+    for tear in sorted(tears, key=tear_size, reverse=True):
+        tears.remove(tear)
+        residual = subgraph(graph, graph, tears)
+        if any([iscyclic(residual, i) for i in strongly_connected_components(residual)]):
+            tears.add(tear)
+    return sorted(tears, reverse=True,
+                  key=lambda s: (cycle_counts.get(s, 0) / tear_size(s), s._sink in fed,
+                                 order[s._source] - order[s._sink]))
+
+def sequence_graph(graph, order):
+    """
+    Return the path of a network. Strongly connected components are 
+    sequenced in topological order. Each cyclic component is converged
+    as a recycle network by tearing the stream of its minimal tear set 
+    that breaks the most cycles; the rest of the component is sequenced
+    recursively as nested recycle networks.
+    
+    """
+    components = strongly_connected_components(graph)
+    component_index = {}
+    for n, component in enumerate(components):
+        for unit in component: component_index[unit] = n
+    component_sinks = {
+        n: [component_index[s._sink] for i in component for s in graph[i]
+            if component_index[s._sink] != n]
+        for n, component in enumerate(components)
+    }
+    component_order = {n: min([order[i] for i in component])
+                       for n, component in enumerate(components)}
+    path = []
+    for n in topological_sort(component_sinks, component_order):
+        component = components[n]
+        if iscyclic(graph, component):
+            tear, *_ = select_tear_streams(subgraph(graph, component), order)
+            subpath = sequence_graph(subgraph(graph, component, (tear,)), order)
+            if isinstance(tear, Stream):
+                path.append(Network(subpath, tear))
+            else:
+                path.extend(subpath)
+        else:
+            path.extend(component)
+    return path
+
 # %% Network
 
 class Network:
@@ -338,7 +558,61 @@ class Network:
         return network
     
     @classmethod
-    def from_units(cls, units, ends=None):
+    def from_strongly_connected_components(cls, units, ends=None):
+        """
+        Create a Network object from all units given by decomposing the 
+        process graph into strongly connected components (Tarjan's 
+        algorithm). Cycles of each component are broken by a minimal set 
+        of tear streams (weighted by the number of tear variables). The
+        tear stream that breaks the most cycles is the recycle of the 
+        component and the rest of the component is decomposed recursively
+        into nested recycle networks.
+
+        Parameters
+        ----------
+        units : Iterable[:class:`biosteam.Unit`]
+            Unit operations to be included.
+        ends : Iterable[:class:`~thermosteam.Stream`], optional
+            Streams which are not torn, but are ignored in the process graph.
+
+        Examples
+        --------
+        >>> from biosteam import (
+        ...     main_flowsheet as f,
+        ...     Mixer, Splitter,
+        ...     Stream, settings
+        ... )
+        >>> f.set_flowsheet('two_recycle_loops')
+        >>> settings.set_thermo(['Water'], cache=True)
+        >>> feedstock = Stream('feedstock', Water=1000)
+        >>> recycle = Stream('recycle')
+        >>> inner_recycle = Stream('inner_recycle')
+        >>> M1 = Mixer('M1', [feedstock, recycle])
+        >>> M2 = Mixer('M2', [M1-0, inner_recycle])
+        >>> S2 = Splitter('S2', M2-0, ['', inner_recycle], split=0.5)
+        >>> S1 = Splitter('S1', S2-0, ['product', recycle], split=0.5)
+        
+        Both recycle loops are broken by tearing the outlet of M2:
+        
+        >>> network = Network.from_strongly_connected_components([M1, M2, S2, S1])
+        >>> network.show()
+        Network(
+            [S2,
+             S1,
+             M1,
+             M2],
+            recycle=M2-0)
+        
+        """
+        units = tuple(units)
+        order = {j: i for i, j in enumerate(units)}
+        graph = unit_graph(units, ends or ())
+        path = sequence_graph(graph, order)
+        if len(path) == 1 and isinstance(path[0], Network): return path[0]
+        return cls(path)
+    
+    @classmethod
+    def from_units(cls, units, ends=None, sequencing=None):
         """
         Create a System object from all units given.
 
@@ -350,8 +624,20 @@ class Network:
             End streams of the system which are not products. Specify this
             argument if only a section of the complete system is wanted, or if
             recycle streams should be ignored.
+        sequencing : str, optional
+            * 'path': Recycle networks are found by enumerating paths from 
+              feeds (default).
+            * 'scc': Strongly connected components are converged with the
+              fewest tear variables (see :meth:`Network.from_strongly_connected_components`).
 
         """
+        if sequencing == 'scc':
+            return cls.from_strongly_connected_components(units, ends)
+        elif sequencing not in (None, 'path'):
+            raise ValueError(
+                f"invalid sequencing {repr(sequencing)}; valid options "
+                "include 'path' and 'scc'"
+            )
         feeds = bst.utils.feeds_from_units(units) + [piping.MissingStream(None, i) for i in units if not i._ins]
         bst.utils.sort_feeds_big_to_small(feeds)
         if feeds:
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+Conditional solvers for converging recycle loops. All solvers share the
+signature solver(f, x, **kwargs) where f(x) = (g, not_converged) runs
+the system at recycle data `x` and returns the new recycle data `g`.
+
+Stateful solvers also accept a `state` dictionary to save their 
+acceleration data (e.g., secant slopes or Jacobian approximations) 
+for the next call.
+
+"""
+import numpy as np
+import flexsolve as flx
+from inspect import signature
+from flexsolve.utils import aitken_iter, wegstein_iter
+
+__all__ = ('conditional_aitken', 'conditional_wegstein',
+           'conditional_anderson', 'conditional_broyden')
+
+#: Default bounds and damping exponent of Wegstein's relaxation weight 
+#: (only in versions of flexsolve that support them).
+wegstein_defaults = {
+    name: parameter.default for name, parameter
+    in signature(flx.conditional_wegstein).parameters.items()
+    if name in ('lb', 'ub', 'exp')
+}
+
+def wegstein_step(x, dx, g1, g0, options):
+    """Return the next Wegstein iteration with flexsolve's options (if any)."""
+    if wegstein_defaults:
+        options = {**wegstein_defaults, **options}
+        return wegstein_iter(x, dx, g1, g0, options['lb'], options['ub'], options['exp'])
+    elif options:
+        raise TypeError(
+            "installed version of flexsolve does not support Wegstein "
+            f"options {', '.join(options)}"
+        )
+    else:
+        return wegstein_iter(x, dx, g1, g0)
+
+def residual_norm(r):
+    return np.abs(r).sum()
+
+def relaxation_weights(state, x):
+    """Return bounded relaxation weights saved in state (if any) or None."""
+    if state is None: return None
+    weights = state.get('weights')
+    if weights is not None and weights.size == x.size: 
+        # Bounded as in the classic Wegstein method (-5 <= q <= 0, w = 1 - q)
+        return np.clip(weights, 1., 6.)
+
+def update_relaxation_weights(weights, numerator, denominator):
+    """
+    Update relaxation weights, w = numerator / denominator, where valid 
+    (same criteria as flexsolve's Aitken and Wegstein iterations).
+    
+    """
+    valid = (np.abs(denominator) > 1e-16) & (np.abs(numerator) < 1e16)
+    if weights is None: weights = np.ones_like(numerator)
+    weights[valid] = numerator[valid] / denominator[valid]
+    return weights
+
+def relaxed_step(f, x, g, weights):
+    """
+    Return the next guess and its results using relaxation weights from a 
+    previous call; w * g + (1 - w) * x. If the residual does not decrease,
+    the fixed-point step is taken instead and weights are discarded 
+    (returned as None).
+    
+    """
+    x_new = weights * g + (1. - weights) * x
+    if np.isfinite(x_new).all():
+        try:
+            g_new, not_converged = f(x_new)
+        except Exception:
+            pass
+        else:
+            if (not not_converged 
+                or residual_norm(g_new - x_new) < residual_norm(g - x)):
+                return x_new, g_new, not_converged, weights
+    g_new, not_converged = f(g)
+    return g, g_new, not_converged, None
+
+def conditional_aitken(f, x, state=None):
+    """
+    Conditional iterative Aitken solver. Without a state, 
+    :func:`flexsolve.conditional_aitken` is used.
+
+    Parameters
+    ----------
+    f : Callable
+        Function with signature f(x) = (g, not_converged).
+    x : numpy.ndarray
+        Initial guess.
+    state : dict, optional
+        Relaxation weights (secant slopes) of previous calls. The first 
+        step is accelerated using these weights and the last weights 
+        are saved for the next call.
+
+    """
+    if state is None: return flx.conditional_aitken(f, x)
+    weights = relaxation_weights(state, x)
+    gg = x
+    if weights is not None:
+        g, condition = f(x)
+        if condition: 
+            x, g, condition, weights = relaxed_step(f, x, g, weights)
+        if not condition: return g
+        gg, condition = f(g)
+        dxg = x - g
+        dgg_g = gg - g
+        weights = update_relaxation_weights(weights, dxg, dgg_g + dxg)
+        x = aitken_iter(x, gg, dxg, dgg_g)
+    else:
+        condition = True
+    while condition:
+        try:
+            g, condition = f(x)
+        except: # pragma: no cover
+            x = gg.copy()
+            g, condition = f(x)
+        if not condition: break
+        gg, condition = f(g)
+        dxg = x - g
+        dgg_g = gg - g
+        weights = update_relaxation_weights(weights, dxg, dgg_g + dxg)
+        x = aitken_iter(x, gg, dxg, dgg_g)
+    else:
+        g = x
+    if weights is not None: state['weights'] = weights
+    return g
+
+def conditional_wegstein(f, x, state=None, **options):
+    """
+    Conditional iterative Wegstein solver. Without a state, 
+    :func:`flexsolve.conditional_wegstein` is used.
+
+    Parameters
+    ----------
+    f : Callable
+        Function with signature f(x) = (g, not_converged).
+    x : numpy.ndarray
+        Initial guess.
+    state : dict, optional
+        Relaxation weights (secant slopes) of previous calls. The first 
+        step is taken using these weights instead of a fixed-point step 
+        and the last weights are saved for the next call.
+    **options :
+        Bounds (`lb` and `ub`) and damping exponent (`exp`) of relaxation
+        weights passed to flexsolve's Wegstein iteration.
+
+    """
+    if state is None: return flx.conditional_wegstein(f, x, **options)
+    weights = relaxation_weights(state, x)
+    x0 = x
+    g0, condition = f(x0)
+    if weights is not None and condition:
+        x0, g0, condition, weights = relaxed_step(f, x0, g0, weights)
+    g1 = x1 = g0
+    while condition:
+        try: g1, condition = f(x1)
+        except: # pragma: no cover
+            x1 = g1
+            g1, condition = f(x1)
+        dx = x1 - x0
+        weights = update_relaxation_weights(weights, dx, dx - g1 + g0)
+        x0 = x1
+        x1 = wegstein_step(x1, dx, g1, g0, options)
+        g0 = g1
+    if weights is not None: state['weights'] = weights
+    return x1
+
+def conditional_anderson(f, x, depth=5, mixing=1.):
+    """
+    Conditional Anderson-accelerated fixed-point solver (type II).
+
+    Parameters
+    ----------
+    f : Callable
+        Function with signature f(x) = (g, not_converged).
+    x : numpy.ndarray
+        Initial guess.
+    depth : int, optional
+        Number of previous iterations used to extrapolate the next guess.
+        Defaults to 5.
+    mixing : float, optional
+        Fraction of the fixed-point update added at each iteration.
+        Defaults to 1.
+
+    """
+    g, not_converged = f(x)
+    if not not_converged: return g
+    w = 1. / np.maximum(np.abs(g), 1.)
+    r = g - x
+    dX = []
+    dR = []
+    x_new = x + mixing * r
+    while True:
+        try:
+            g_new, not_converged = f(x_new)
+        except Exception: # Extrapolation failed; take a fixed-point step instead
+            dX.clear()
+            dR.clear()
+            x_new = g
+            g_new, not_converged = f(x_new)
+        if not not_converged: return g_new
+        r_new = g_new - x_new
+        dX.append(x_new - x)
+        dR.append(r_new - r)
+        if len(dX) > depth:
+            del dX[0], dR[0]
+        x = x_new
+        g = g_new
+        r = r_new
+        DR = np.column_stack(dR)
+        gamma = np.linalg.lstsq(w[:, None] * DR, w * r, rcond=None)[0]
+        x_new = x + mixing * r - (np.column_stack(dX) + mixing * DR) @ gamma
+        if not np.isfinite(x_new).all():
+            dX.clear()
+            dR.clear()
+            x_new = x + mixing * r
+
+def conditional_broyden(f, x, state=None, depth=30, divergence=10.):
+    """
+    Conditional quasi-Newton solver using Broyden's (good) update of the
+    inverse Jacobian of the residual, g(x) - x. The inverse Jacobian is
+    stored as a limited number of rank-one updates to the fixed-point
+    iteration (i.e. minus the identity matrix).
+
+    Parameters
+    ----------
+    f : Callable
+        Function with signature f(x) = (g, not_converged).
+    x : numpy.ndarray
+        Initial guess.
+    state : dict, optional
+        Rank-one updates of the inverse Jacobian from previous calls. The
+        updates are reused (and saved) so that successive calls start with
+        the last Jacobian approximation.
+    depth : int, optional
+        Maximum number of rank-one updates. Defaults to 30.
+    divergence : float, optional
+        Factor of residual increase after which the Jacobian approximation
+        is discarded. Defaults to 10. A Jacobian approximation reused from
+        a previous call is discarded if the first step does not decrease 
+        the residual.
+
+    """
+    if state is None: state = {}
+    if state.get('size') != x.size or 'U' not in state:
+        state['size'] = x.size
+        state['U'] = []
+        state['V'] = []
+    U = state['U']
+    V = state['V']
+
+    def H_dot(v):
+        y = -v
+        for u, w in zip(U, V): y += u * (w @ v)
+        return y
+
+    def H_transpose_dot(v):
+        y = -v
+        for u, w in zip(U, V): y += w * (u @ v)
+        return y
+
+    g, not_converged = f(x)
+    if not not_converged: return g
+    r = g - x
+    norm = residual_norm(r)
+    reused = bool(U)
+    while True:
+        x_new = x - H_dot(r)
+        if not np.isfinite(x_new).all():
+            U.clear()
+            V.clear()
+            x_new = g
+        try:
+            g_new, not_converged = f(x_new)
+        except Exception: # Quasi-Newton step failed; take a fixed-point step instead
+            U.clear()
+            V.clear()
+            x_new = g
+            g_new, not_converged = f(x_new)
+        if not not_converged: return g_new
+        r_new = g_new - x_new
+        norm_new = residual_norm(r_new)
+        if U and norm_new > (1. if reused else divergence) * norm:
+            # Discard Jacobian approximation and take a
+            # fixed-point step from last guess
+            U.clear()
+            V.clear()
+            reused = False
+            continue
+        reused = False
+        dx = x_new - x
+        dr = r_new - r
+        v = H_transpose_dot(dx)
+        denominator = v @ dr
+        if abs(denominator) > 1e-12 * np.abs(v).sum() * np.abs(dr).sum():
+            U.append((dx - H_dot(dr)) / denominator)
+            V.append(v)
+            if len(U) > depth:
+                del U[0], V[0]
+        x = x_new
+        g = g_new
+        r = r_new
+        norm = norm_new
@@ -19,13 +19,21 @@ from .digraph import (digraph_from_units_and_streams,
                       surface_digraph,
                       finalize_digraph)
 from thermosteam import Stream, MultiStream, Chemical
+import thermosteam as tmo
 from . import HeatUtility, PowerUtility
 from thermosteam.utils import registered
 from scipy.optimize import root
 from .exceptions import try_method_with_object_stamp, Converged, UnitInheritanceError
 from ._network import Network, mark_disjunction, unmark_disjunction
+from ._recycle_solvers import (
+    conditional_aitken, conditional_wegstein,
+    conditional_anderson, conditional_broyden
+)
 from ._facility import Facility
-from ._unit import Unit, repr_ins_and_outs
+from ._unit import (
+    Unit, SummaryCacheInfo, repr_ins_and_outs, 
+    stream_state, unit_state, settings_state, changed,
+)
 from .utils import (
     repr_items, ignore_docking_warnings, SystemScope,
     piping, colors, list_available_names
@@ -110,7 +118,70 @@ def set_recycle_data(stream, arr):
     TP._T = (T + TP._T) * 0.5 if T == 0 else T
     TP._P = (P + TP._P) * 0.5 if P == 0. else P
     
-   
+class RecycleBuffer:
+    """
+    Preallocated recycle data of a system. The temperature, pressure, and 
+    molar flow rates of all recycle streams are packed into (and unpacked 
+    from) a contiguous array without rebuilding the list of recycles nor
+    allocating intermediate arrays.
+    
+    """
+    __slots__ = ('recycles', 'sizes', 'data', 'mol', 'mol_new')
+    
+    def __init__(self, recycles):
+        if not recycles: raise RuntimeError('no recycle available')
+        #: list[Stream] All recycle streams.
+        self.recycles = recycles
+        #: list[int] Number of molar flow rates of each recycle stream.
+        self.sizes = sizes = [i._imol._data.size for i in recycles]
+        N_mol = sum(sizes)
+        #: numpy.ndarray Recycle temperatures, pressures, and molar flow rates.
+        self.data = np.zeros(N_mol + 2 * len(recycles))
+        #: numpy.ndarray Recycle molar flow rates before running the system path.
+        self.mol = np.zeros(N_mol)
+        #: numpy.ndarray Recycle molar flow rates after running the system path.
+        self.mol_new = np.zeros(N_mol)
+    
+    def isvalid(self):
+        """Return whether the size of all recycle streams remain the same."""
+        for i, size in zip(self.recycles, self.sizes):
+            if i._imol._data.size != size: return False
+        return True
+    
+    def get_data(self):
+        """Return a copy of the recycle data."""
+        data = self.data
+        index = 0
+        for i, size in zip(self.recycles, self.sizes):
+            TP = i._thermal_condition
+            data[index] = TP.T
+            data[index + 1] = TP.P
+            index += 2
+            end = index + size
+            data[index:end] = i._imol._data.reshape(size)
+            index = end
+        return data.copy()
+    
+    def set_data(self, data):
+        """Set recycle temperatures, pressures, and molar flow rates."""
+        N = self.data.size
+        if data.size != N: raise IndexError(f'expected {N} elements; got {data.size} instead')
+        index = 0
+        for i, size in zip(self.recycles, self.sizes):
+            end = index + size + 2
+            set_recycle_data(i, data[index:end])
+            index = end
+    
+    def get_mol(self, mol):
+        """Fill and return given array with recycle molar flow rates."""
+        index = 0
+        for i, size in zip(self.recycles, self.sizes):
+            end = index + size
+            mol[index:end] = i._imol._data.reshape(size)
+            index = end
+        return mol
+    
+
 # %% System creation tools
 
 def facilities_from_units(units):
@@ -384,6 +455,14 @@ class System:
         'tracked_recycles',
         '_connections',
         '_method',
+        'method_options',
+        '_solver_state',
+        '_cache_solver_state',
+        '_recycle_buffer',
+        '_incremental',
+        '_incremental_state',
+        '_dirty_units',
+        'sequencing',
         '_TEA',
         '_LCA',
         '_subsystems',
@@ -433,14 +512,20 @@ class System:
     #: Default convergence method.
     default_method: str = 'Aitken'
 
+    #: Default algorithm for sequencing unit operations ('path' or 'scc'). 
+    default_sequencing: str = 'path'
+
     #: Whether to raise a RuntimeError when system doesn't converge
     strict_convergence: bool = True
 
     #: Method definitions for convergence
     available_methods: dict[str, tuple(Callable, bool, dict)] = {}
 
+    #: Names of convergence methods which save acceleration data (see :meth:`System.register_method`)
+    stateful_methods: set[str] = set()
+
     @classmethod
-    def register_method(cls, name, solver, conditional=False, **kwargs):
+    def register_method(cls, name, solver, conditional=False, stateful=False, **kwargs):
         """
         Register new convergence method (root solver). Two solver signatures
         are supported:
@@ -452,9 +537,18 @@ class System:
           where f(x, converged) = x is the solution and the solver stops when
           converged is True. This method is prefered in BioSTEAM.
         
+        If stateful is True, the solver is also passed a `state` keyword 
+        argument to save its acceleration data (e.g., secant slopes or 
+        Jacobian approximations). The state persists between calls only if
+        :attr:`System.cache_solver_state` is True; otherwise, the state is None.
+        
         """
         name = name.lower().replace('-', '').replace('_', '').replace(' ', '')
         cls.available_methods[name] = (solver, conditional, kwargs)
+        if stateful: 
+            cls.stateful_methods.add(name)
+        else:
+            cls.stateful_methods.discard(name)
 
     @classmethod
     def from_feedstock(cls,
@@ -508,7 +602,8 @@ class System:
                    ends: Optional[Iterable[Stream]]=None,
                    facility_recycle: Optional[Stream]=None, 
                    operating_hours: Optional[float]=None,
-                   lang_factor: Optional[float]=None):
+                   lang_factor: Optional[float]=None,
+                   sequencing: Optional[str]=None):
         """
         Create a System object from all units given.
 
@@ -533,13 +628,21 @@ class System:
             Lang factor for getting fixed capital investment from
             total purchase cost. If no lang factor, installed equipment costs are
             estimated using bare module factors.
+        sequencing :
+            Algorithm for sequencing unit operations. If 'path', recycle 
+            loops are found by enumerating paths from feeds. If 'scc', 
+            strongly connected components are converged with the fewest tear 
+            variables. Defaults to :attr:`System.default_sequencing`.
 
         """
+        if sequencing is None: sequencing = cls.default_sequencing
         facilities = facilities_from_units(units)
-        network = Network.from_units(units, ends)
-        return cls._from_network(ID, network, facilities,
-                                facility_recycle, operating_hours,
-                                lang_factor)
+        network = Network.from_units(units, ends, sequencing)
+        system = cls._from_network(ID, network, facilities,
+                                   facility_recycle, operating_hours,
+                                   lang_factor)
+        system.sequencing = sequencing
+        return system
 
     @classmethod
     def from_segment(cls, ID: Optional[str]="", start: Optional[Unit]=None, 
@@ -633,6 +736,27 @@ class System:
         self.recycle = recycle
         self.method = self.default_method   
         
+        #: Keyword arguments passed to the solver of the convergence method 
+        #: (in addition to those given when the method was registered).
+        self.method_options: dict = {}
+        
+        #: Persistent data of stateful convergence methods.
+        self._solver_state = {}
+        
+        self._cache_solver_state = False
+        
+        #: Algorithm for sequencing unit operations when the system 
+        #: configuration is updated ('path' or 'scc').
+        self.sequencing: str = self.default_sequencing
+        
+        self._incremental = False
+        
+        #: Feed, unit, and settings states at the last simulation (only in incremental mode).
+        self._incremental_state = None
+        
+        #: Unit operations marked to rerun in the next incremental simulation.
+        self._dirty_units = set()
+        
         #: Maximum number of iterations.
         self.maxiter: int = self.default_maxiter
 
@@ -707,7 +831,7 @@ class System:
         Facility = bst.Facility
         facilities = Facility.ordered_facilities([i for i in units if isa(i, Facility)])
         ID_subsys = None if '.' in self.ID else ''
-        network = Network.from_units(units)
+        network = Network.from_units(units, sequencing=self.sequencing)
         path = [(type(self)._from_network(ID_subsys, i) if isa(i, Network) else i)
                 for i in network.path]
         self.recycle = network.recycle
@@ -715,6 +839,9 @@ class System:
         self._set_path(path)
         self._set_facilities(facilities)
         self._set_facility_recycle(facility_recycle or find_blowdown_recycle(facilities))
+        self._solver_state.clear()
+        self.cache_solver_state = self._cache_solver_state
+        self._incremental_state = None
 
     def __enter__(self):
         if self._path or self._recycle or self._facilities:
@@ -779,6 +906,7 @@ class System:
         for obj in path:
             if isa(obj, System): obj._interface_property_packages()
         self._path = tuple(new_path)
+        self._recycle_buffer = None
         self._save_configuration()
 
     def _reduced_thermo_data(self, required_chemicals, unit_thermo, mixer_thermo, thermo_cache):
@@ -862,11 +990,13 @@ class System:
         self._facility_recycle = other._facility_recycle
         self._recycle = other._recycle
         self._connections = other._connections
+        self._recycle_buffer = None
 
     def set_tolerance(self, mol: Optional[float]=None, rmol: Optional[float]=None,
                       T: Optional[float]=None, rT: Optional[float]=None, 
                       subsystems: bool=False, maxiter: Optional[int]=None, 
-                      subfactor: Optional[float]=None, method: Optional[str]=None):
+                      subfactor: Optional[float]=None, method: Optional[str]=None,
+                      method_options: Optional[dict]=None):
         """
         Set the convergence tolerance and convergence method of the system.
 
@@ -888,7 +1018,9 @@ class System:
             Factor to rescale tolerance in subsystems.
         method :
             Convergence method.
-            
+        method_options :
+            Keyword arguments passed to the solver of the convergence method 
+            (e.g., `depth` and `mixing` of 'anderson-acceleration').
         
         """
         if mol: self.molar_tolerance = float(mol)
@@ -897,12 +1029,13 @@ class System:
         if rT: self.temperature_tolerance = float(rT)
         if maxiter: self.maxiter = int(maxiter)
         if method: self.method = method
+        if method_options is not None: self.method_options = dict(method_options)
         if subsystems:
             if subfactor:
                 for i in self.subsystems: i.set_tolerance(*[(i * subfactor if i else i) for i in (mol, rmol, T, rT)],
-                                                          subsystems, maxiter, subfactor, method)
+                                                          subsystems, maxiter, subfactor, method, method_options)
             else:
-                for i in self.subsystems: i.set_tolerance(mol, rmol, T, rT, subsystems, maxiter, subfactor, method)
+                for i in self.subsystems: i.set_tolerance(mol, rmol, T, rT, subsystems, maxiter, subfactor, method, method_options)
 
     ins = MockSystem.ins
     outs = MockSystem.outs
@@ -1251,6 +1384,7 @@ class System:
         self._extend_flattend_path_and_recycles(path, recycles, stacklevel=2)
         self._path = tuple(path)
         self._recycle = tuple(recycles)
+        self._recycle_buffer = None
         N_recycles = len(recycles)
         self.molar_tolerance *= N_recycles
         self.temperature_tolerance *= N_recycles
@@ -1263,6 +1397,7 @@ class System:
         #: tuple[Unit, function and/or System] A path that is run element
         #: by element until the recycle converges.
         self._path = path = tuple(path)
+        self._recycle_buffer = None
 
     def _set_facilities(self, facilities):
         #: tuple[Unit, function, and/or System] Offsite facilities that are simulated only after completing the path simulation.
@@ -1425,6 +1560,7 @@ class System:
         return self._recycle
     @recycle.setter
     def recycle(self, recycle):
+        self._recycle_buffer = None
         isa = isinstance
         if recycle is None:
             self._recycle = recycle
@@ -1455,7 +1591,7 @@ class System:
 
     @property
     def method(self) -> str:
-        """Iterative convergence method ('wegstein', 'aitken', or 'fixedpoint')."""
+        """Iterative convergence method ('wegstein', 'aitken', 'fixedpoint', 'anderson-acceleration', or 'broyden')."""
         return self._method
     @method.setter
     def method(self, method):
@@ -1470,6 +1606,121 @@ class System:
 
     converge_method = method # For backwards compatibility
 
+    @property
+    def cache_solver_state(self) -> bool:
+        """
+        Whether to save the acceleration data of the convergence method 
+        (e.g., Aitken and Wegstein secant slopes or the Broyden Jacobian 
+        approximation) to start the next simulation. The cache is reset by
+        :meth:`System.reset_cache` and when the system configuration is 
+        updated. Setting this attribute also sets it for all subsystems.
+        """
+        return self._cache_solver_state
+    @cache_solver_state.setter
+    def cache_solver_state(self, cache):
+        self._cache_solver_state = cache = bool(cache)
+        if not cache: self._solver_state.clear()
+        for i in self.subsystems: i.cache_solver_state = cache
+
+    @property
+    def incremental(self) -> bool:
+        """
+        Whether to only rerun unit operations affected by changes since the
+        last simulation. Changes to feeds, to prices, and to unit operation 
+        attributes (numbers, strings, arrays, chemical indexers, and reaction
+        conversions) are detected automatically. Changes to class attributes,
+        to lists, dictionaries, or other objects held by unit operations, 
+        and to anything else must be marked with :meth:`System.mark_dirty`. 
+        Only units downstream of changes are rerun, designed, and costed; 
+        facilities are always simulated. Recycle loops are only reconverged
+        if they contain units downstream of changes.
+        """
+        return self._incremental
+    @incremental.setter
+    def incremental(self, incremental):
+        self._incremental = bool(incremental)
+        self._incremental_state = None
+        self._dirty_units.clear()
+
+    def mark_dirty(self, *elements: Unit|Stream):
+        """
+        Mark unit operations (or the sinks of streams) to rerun in the next
+        incremental simulation. If no elements are given, the whole system
+        is rerun.
+        
+        """
+        if not elements: self._incremental_state = None
+        isa = isinstance
+        dirty_units = self._dirty_units
+        for i in elements:
+            if isa(i, Unit): 
+                dirty_units.add(i)
+            elif isa(i, Stream):
+                if i._sink: dirty_units.add(i._sink)
+            else:
+                self._incremental_state = None
+
+    def _save_incremental_state(self):
+        self._incremental_state = (
+            settings_state(),
+            [(i, stream_state(i)) for i in self.feeds],
+            [(i, unit_state(i)) for i in self.units],
+        )
+        self._dirty_units.clear()
+
+    def _get_incremental_units(self):
+        """
+        Return all units downstream of changes since the last simulation or
+        None if the whole system must be simulated.
+        
+        """
+        state = self._incremental_state
+        if state is None: return None
+        settings, feeds, units = state
+        if (changed(settings, settings_state()) 
+            or self._connections != [i.get_connection() for i in self.streams]): 
+            return None
+        dirty = list(self._dirty_units)
+        for stream, old in feeds:
+            if stream._sink and changed(old, stream_state(stream)): dirty.append(stream._sink)
+        for unit, old in units:
+            if changed(old, unit_state(unit)): dirty.append(unit)
+        downstream_units = set()
+        while dirty:
+            unit = dirty.pop()
+            if unit in downstream_units: continue
+            downstream_units.add(unit)
+            for i in unit._outs:
+                if i._sink: dirty.append(i._sink)
+            for ps in unit._specifications:
+                if ps.impacted_units: dirty.extend(ps.impacted_units)
+        downstream_units.intersection_update(self.units)
+        return downstream_units
+
+    def _simulate_incremental(self, units):
+        """Rerun, design, and cost only the given units (and facilities)."""
+        isa = isinstance
+        if units:
+            for u in units: 
+                u._setup()
+                u._check_setup()
+            recycle = self._recycle
+            if isa(recycle, Stream): recycle = (recycle,)
+            if (self._N_runs 
+                or recycle and any([i._source in units for i in recycle])):
+                self.converge()
+            else:
+                # Recycle streams (if any) are not affected by changes
+                f = try_method_with_object_stamp
+                for i in self._path:
+                    if isa(i, Unit): 
+                        if i in units: f(i, i.run)
+                    elif isa(i, System):
+                        if not units.isdisjoint(i.units): f(i, i.converge)
+                    else: i() 
+        self._summary(units)
+        if self._facility_loop: self._facility_loop.converge()
+
     @property
     def isdynamic(self) -> bool:
         """Whether the system contains any dynamic Unit."""
@@ -1631,13 +1882,17 @@ class System:
         """
         data[data < 0.] = 0.
         self._set_recycle_data(data)
+        buffer = self._recycle_buffer
         T = self._get_recycle_temperatures()
-        mol = self._get_recycle_mol()
+        mol = buffer.get_mol(buffer.mol)
         self.run()
         recycle = self._recycle
         for i, j in self.tracked_recycles.items():
             if i is recycle: j.append(i.copy(None))
-        mol_new = self._get_recycle_mol()
+        buffer = self._get_recycle_buffer()
+        if mol.size != buffer.mol.size: 
+            raise IndexError('size of recycle data changed while running the system')
+        mol_new = buffer.get_mol(buffer.mol_new)
         T_new = self._get_recycle_temperatures()
         mol_errors = np.abs(mol - mol_new)
         positive_index = mol_errors > 1e-16
@@ -1686,42 +1941,21 @@ class System:
         if not_converged: return data_new - data
         else: raise Converged
 
+    def _get_recycle_buffer(self):
+        buffer = self._recycle_buffer
+        if buffer is None or not buffer.isvalid():
+            self._recycle_buffer = buffer = RecycleBuffer(self.get_all_recycles())
+        return buffer
+
     def _get_recycle_mol(self):
-        recycles = self.get_all_recycles()
-        N = len(recycles)
-        if N == 1:
-            return recycles[0]._imol._data.copy()
-        elif N > 1: 
-            return np.hstack([i._imol._data for i in recycles])
-        else:
-            raise RuntimeError('no recycle available')
+        buffer = self._get_recycle_buffer()
+        return buffer.get_mol(np.zeros(buffer.mol.size))
 
     def _get_recycle_data(self):
-        recycles = self.get_all_recycles()
-        N = len(recycles)
-        if N == 1:
-            return get_recycle_data(recycles[0])
-        elif N > 1: 
-            return np.hstack([get_recycle_data(i) for i in recycles])
-        else:
-            raise RuntimeError('no recycle available')
+        return self._get_recycle_buffer().get_data()
 
     def _set_recycle_data(self, data):
-        recycles = self.get_all_recycles()
-        N = len(recycles)
-        if N == 1:
-            set_recycle_data(recycles[0], data)
-        elif N > 1:
-            N = data.size
-            M = sum([i._imol._data.size + 2 for i in recycles])
-            if M != N: raise IndexError(f'expected {N} elements; got {M} instead')
-            index = 0
-            for i in recycles:
-                end = index + i._imol._data.size + 2
-                set_recycle_data(i, data[index:end])
-                index = end
-        else:
-            raise RuntimeError('no recycle available')
+        self._get_recycle_buffer().set_data(data)
 
     def _get_recycle_temperatures(self):
         recycle = self._recycle
@@ -1756,6 +1990,7 @@ class System:
                 
     def _setup(self, update_configuration=False):
         """Setup each element of the system."""
+        self._recycle_buffer = None
         units = self.units
         self._load_facilities()
         if update_configuration:
@@ -1807,7 +2042,22 @@ class System:
         """Solve the system recycle iteratively."""
         self._reset_iter()
         solver, conditional, kwargs = self.available_methods[self._method]
+        kwargs = {**kwargs, **self.method_options}
         data = self._get_recycle_data()
+        if self._method in self.stateful_methods: 
+            if self._cache_solver_state:
+                solver_state = self._solver_state
+                method = self._method
+                if method in solver_state:
+                    state = solver_state[method]
+                    if state['size'] != data.size: 
+                        state.clear()
+                        state['size'] = data.size
+                else:
+                    solver_state[method] = state = {'size': data.size}
+            else:
+                state = None
+            kwargs = {**kwargs, 'state': state}
         f = self._iter_run_conditional if conditional else self._iter_run
         try: solver(f, data, **kwargs)
         except IndexError as error:
@@ -1915,7 +2165,7 @@ class System:
                     for ID, value in zip(s.chemicals.IDs, s.mol):
                         material_flows[i, index[ID]] = value
 
-    def _summary(self):
+    def _summary(self, units=None):
         simulated_units = set()
         isa = isinstance
         Unit = bst.Unit
@@ -1924,7 +2174,14 @@ class System:
             if isa(i, Unit):
                 if i in simulated_units: continue
                 simulated_units.add(i)
-            f(i, i._summary)
+                if units is not None and i not in units: continue
+                f(i, i._summary)
+            elif units is None: 
+                f(i, i._summary)
+            elif isa(i, System):
+                if not units.isdisjoint(i.units): f(i, i._summary, (units,))
+            else:
+                f(i, i._summary)
         for i in self._facilities:
             if isa(i, Unit): f(i, i.simulate)
             elif isa(i, System):
@@ -1976,6 +2233,7 @@ class System:
     def empty_recycles(self):
         """Reset all recycle streams to zero flow."""
         self._reset_errors()
+        self._incremental_state = None
         recycle = self._recycle
         if recycle:
             if isinstance(recycle, Stream):
@@ -2004,7 +2262,27 @@ class System:
             self.scope.reset_cache()
         for unit in self.units:
             unit.reset_cache(self.isdynamic)
+            unit.clear_summary_cache()
         for i in self.streams: i.reset_cache()
+        self._reset_solver_state()
+        self._incremental_state = None
+    
+    def summary_cache_info(self) -> SummaryCacheInfo:
+        """
+        Return the number of design and cost calls of all unit operations 
+        that reused memoized results (hits) or not (misses).
+        
+        See Also
+        --------
+        :attr:`Unit.memoize_summary <biosteam.Unit.memoize_summary>`
+        
+        """
+        info = [i.summary_cache_info() for i in self.units]
+        return SummaryCacheInfo(sum([i.hits for i in info]), sum([i.misses for i in info]))
+    
+    def _reset_solver_state(self):
+        self._solver_state.clear()
+        for i in self.subsystems: i._reset_solver_state()
             
     def set_dynamic_tracker(self, *subjects, **kwargs):
         """
@@ -2173,6 +2451,16 @@ class System:
                 finally:
                     self._running_specifications = False
             else:
+                if self._incremental:
+                    if specifications or update_configuration or kwargs or self.isdynamic:
+                        units = None
+                    else:
+                        units = self._get_incremental_units()
+                    self._incremental_state = None
+                    if units is not None:
+                        self._simulate_incremental(units)
+                        self._save_incremental_state()
+                        return
                 self._setup(update_configuration)
                 if self.isdynamic: 
                     self.dynamic_run(**kwargs)
@@ -2196,6 +2484,7 @@ class System:
                             outputs = self.simulate(update_configuration=True, **kwargs)
                         elif self._facility_loop: 
                             self._facility_loop.converge()
+                    if self._incremental: self._save_incremental_state()
                     return outputs
 
     def dynamic_run(self, **dynsim_kwargs):
@@ -2972,9 +3261,11 @@ class FacilityLoop(System):
 
 del ignore_docking_warnings
 
-System.register_method('aitken', flx.conditional_aitken, conditional=True)
-System.register_method('wegstein', flx.conditional_wegstein, conditional=True)
+System.register_method('aitken', conditional_aitken, conditional=True, stateful=True)
+System.register_method('wegstein', conditional_wegstein, conditional=True, stateful=True)
 System.register_method('fixedpoint', flx.conditional_fixed_point, conditional=True)
+System.register_method('anderson-acceleration', conditional_anderson, conditional=True)
+System.register_method('broyden', conditional_broyden, conditional=True, stateful=True)
 options = dict(fatol=1e-24, xatol=1e-24, xtol=1e-24, ftol=1e-24, maxiter=int(1e6))
 for name in ('anderson', 'diagbroyden', 'excitingmixing', 'linearmixing', 'broyden1', 'broyden2'):
     System.register_method(name, root, method=name, options=options)
@@ -71,6 +71,25 @@ def NPV_at_IRR(IRR, cashflow_array, duration_array):
     """Return NPV at given IRR and cashflow data."""
     return (cashflow_array/(1.+IRR)**duration_array).sum()
 
+@njit(cache=True)
+def solve_IRR_by_newton(IRR, cashflow_array, duration_array, xtol, maxiter):
+    """
+    Return IRR at the break even point (NPV = 0) using Newton's method with
+    the analytic derivative of NPV, or nan if it does not converge.
+    
+    """
+    for iter in range(maxiter):
+        k = 1. + IRR
+        discounted_cashflow = cashflow_array / k ** duration_array
+        NPV = discounted_cashflow.sum()
+        dNPV = -(duration_array * discounted_cashflow).sum() / k
+        if dNPV == 0. or not np.isfinite(dNPV): return np.nan
+        IRR_new = IRR - NPV / dNPV
+        if IRR_new <= -0.99: IRR_new = 0.5 * (IRR - 0.99)
+        if abs(IRR_new - IRR) < xtol: return IRR_new
+        IRR = IRR_new
+    return np.nan
+
 @njit(cache=True)
 def initial_loan_principal(loan, interest):
     principal = 0
@@ -220,9 +239,174 @@ def NPV_with_sales(
     cashflow = nontaxable_cashflow + taxable_cashflow + incentives - tax
     return (cashflow/discount_factors).sum()
 
+@njit(cache=True)
+def solve_sales_with_income_tax(
+        taxable_cashflow, 
+        nontaxable_cashflow,
+        sales_coefficients,
+        discount_factors,
+        income_tax,
+    ):
+    """
+    Return additional sales of each scenario at the break even point 
+    (NPV = 0) when the tax is the income tax of positive taxable cash flows
+    (and there are no incentives). Cash flows, sales coefficients, and 
+    discount factors are 2d arrays (scenarios x years); income tax is a 1d 
+    array. Scenarios without a single break even point are nan.
+    
+    Notes
+    -----
+    NPV is piecewise linear and nondecreasing in sales, with breakpoints 
+    where taxable cash flows change sign. Breakpoints are visited in 
+    ascending order and the root is solved exactly within the segment 
+    where NPV changes sign.
+    
+    """
+    N, M = taxable_cashflow.shape
+    sales = np.full(N, np.nan)
+    breakpoints = np.empty(M)
+    for i in range(N):
+        tax = income_tax[i]
+        if tax > 1.: continue
+        intercept = 0.
+        slope = 0.
+        valid = True
+        for j in range(M):
+            weight = 1. / discount_factors[i, j]
+            taxable = taxable_cashflow[i, j]
+            coefficient = sales_coefficients[i, j]
+            if coefficient < 0.: valid = False
+            intercept += (nontaxable_cashflow[i, j] + taxable) * weight
+            slope += coefficient * weight
+            if coefficient > 0.:
+                breakpoints[j] = -taxable / coefficient
+            else:
+                breakpoints[j] = np.inf
+                if taxable > 0.: intercept -= tax * taxable * weight
+        if not valid: continue
+        for j in np.argsort(breakpoints):
+            breakpoint = breakpoints[j]
+            if breakpoint == np.inf or intercept + slope * breakpoint >= 0.: break
+            # Taxable cash flow of this year is positive past the breakpoint
+            weight = tax / discount_factors[i, j]
+            intercept -= taxable_cashflow[i, j] * weight
+            slope -= sales_coefficients[i, j] * weight
+        if slope > 0.: sales[i] = -intercept / slope
+    return sales
+
+# %% Utilities for batch TEA calculations (scenarios x years)
+
+def batch_loan_payments(loan, interest, years, start, length):
+    """
+    Return loan payments by scenario and year. Payments are constant,
+    starting from the start year and such that the loan principal is paid
+    after the given years.
+
+    """
+    N = interest.size
+    k = 1. + interest
+    exponents = np.arange(start, 0, -1, dtype=float)
+    principal = (loan * k[:, None] ** exponents).sum(1)
+    kn = k ** years
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = np.where(interest == 0., principal / years, principal * interest * kn / (kn - 1.))
+    payment[years == 0] = 0.
+    index = np.arange(length)
+    active = (index >= start) & (index < start + years[:, None])
+    LP = np.zeros((N, length))
+    LP[active] = np.broadcast_to(payment[:, None], (N, length))[active]
+    return LP
+
+def batch_discount_factors(IRR, duration_array):
+    """Return discount factors, 1 / (1 + IRR) ** duration, by scenario and year."""
+    return np.exp(np.multiply.outer(-np.log1p(IRR), duration_array))
+
+def batch_NPV_at_IRR(IRR, cashflows, duration_array):
+    """Return NPV of each scenario at given IRR and cashflow data."""
+    return (cashflows * batch_discount_factors(IRR, duration_array)).sum(1)
+
+def batch_solve_IRR(IRR, cashflows, duration_array, xtol=1e-9, maxiter=100):
+    """
+    Return IRR of each scenario at the break even point (NPV = 0) using
+    vectorized Newton iterations. IRRs of scenarios which do not converge
+    are found by bisection if NPV changes sign within -99% to 1000% IRR
+    or are nan otherwise.
+
+    """
+    IRR = IRR.astype(float)
+    t = duration_array
+    active = np.ones(IRR.size, bool)
+    for _ in range(maxiter):
+        r = IRR[active]
+        CF = cashflows[active]
+        discount_factors = batch_discount_factors(r, t)
+        NPV = (CF * discount_factors).sum(1)
+        dNPV = -(t * CF * discount_factors).sum(1) / (1. + r)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = NPV / dNPV
+        r_new = r - step
+        invalid = ~np.isfinite(r_new) | (r_new <= -0.99)
+        r_new[invalid] = 0.5 * (r[invalid] - 0.99)
+        IRR[active] = r_new
+        converged = (np.abs(r_new - r) < xtol) & ~invalid
+        index = np.flatnonzero(active)
+        active[index[converged]] = False
+        if not active.any(): return IRR
+    index = np.flatnonzero(active)
+    CF = cashflows[index]
+    lb = np.full(index.size, -0.99)
+    ub = np.full(index.size, 10.)
+    f_lb = batch_NPV_at_IRR(lb, CF, t)
+    f_ub = batch_NPV_at_IRR(ub, CF, t)
+    bracketed = np.sign(f_lb) != np.sign(f_ub)
+    for _ in range(200):
+        mid = 0.5 * (lb + ub)
+        f_mid = batch_NPV_at_IRR(mid, CF, t)
+        left = np.sign(f_mid) == np.sign(f_lb)
+        lb = np.where(left, mid, lb)
+        f_lb = np.where(left, f_mid, f_lb)
+        ub = np.where(left, ub, mid)
+        if (ub - lb).max() < xtol: break
+    IRR[index] = np.where(bracketed, 0.5 * (lb + ub), np.nan)
+    return IRR
+
+def batch_solve_sales(f, x0, x1, xtol=10., ytol=1000., maxiter=100):
+    """
+    Return additional sales of each scenario at the break even point
+    (NPV = 0) using vectorized secant iterations, where f(x, index)
+    returns the NPV of the indexed scenarios at additional sales x.
+
+    """
+    N = x0.size
+    index = np.arange(N)
+    y0 = f(x0, index)
+    sales = x1.copy()
+    active = np.ones(N, bool)
+    for _ in range(maxiter):
+        index = np.flatnonzero(active)
+        x1 = sales[index]
+        y1 = f(x1, index)
+        dy = y1 - y0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x2 = np.where(dy == 0., x1, x1 - y1 * (x1 - x0) / dy)
+        sales[index] = x2
+        converged = ((np.abs(x2 - x1) < xtol) & (np.abs(y1) < ytol)) | (dy == 0.)
+        active[index[converged]] = False
+        if not active.any(): break
+        not_converged = ~converged
+        x0 = x1[not_converged]
+        y0 = y1[not_converged]
+    else:
+        sales[active] = np.nan
+    return sales
+
 # %% Techno-Economic Analysis
 
 _duration_array_cache = {}
+_discount_factor_cache = {}
+
+#: TEA attributes that do not affect cash flows (before discounting).
+cashflow_independent_attributes = frozenset(['IRR', '_IRR', '_sales', '_cashflow_cache'])
 
 class TEA:
     """
@@ -300,6 +484,15 @@ class TEA:
     factor is in use. In actuality, the installed equipment cost should be 
     less than the fixed capital investment. 
     
+    Notes
+    -----
+    Cash flows are cached and reused (e.g., by NPV, IRR, and price 
+    calculations) until unit costs are recomputed (i.e., after simulation),
+    material costs, sales, or operating hours change, or any TEA attribute
+    (other than the IRR) is set. Call :meth:`~TEA.reset_cache` after making
+    in-place changes that are otherwise not detected (e.g., editing unit 
+    purchase costs or the construction schedule array directly).
+    
     Examples
     --------
     :doc:`../tutorial/Techno-economic_analysis` 
@@ -312,7 +505,7 @@ class TEA:
                  '_startup_schedule', '_operating_days',
                  '_duration', '_depreciation_key', '_depreciation',
                  '_years', '_duration', '_start',  'IRR', '_IRR', '_sales',
-                 '_duration_array_cache')
+                 '_duration_array_cache', '_cashflow_cache')
     
     #: Available depreciation schedules. Defaults include modified 
     #: accelerated cost recovery system from U.S. IRS publication 946 (MACRS),
@@ -365,6 +558,14 @@ class TEA:
         'India': 0.85,
     }
 
+    #: Economic parameters that can be varied across scenarios in batch cash
+    #: flow analyses (e.g., :meth:`~TEA.batch_NPV`).
+    batch_parameters: tuple[str, ...] = (
+        'IRR', 'income_tax', 'WC_over_FCI', 'finance_interest', 'finance_years',
+        'finance_fraction', 'construction_schedule', 'startup_months',
+        'startup_FOCfrac', 'startup_VOCfrac', 'startup_salesfrac',
+    )
+
     def __init_subclass__(cls, isabstract=False):
         if isabstract: return
         for method in ('_DPI', '_TDC', '_FCI', '_FOC'):
@@ -375,6 +576,15 @@ class TEA:
                      "'isabstract' keyword argument is True"
                 )
 
+    def __setattr__(self, name, value):
+        if name not in cashflow_independent_attributes: 
+            object.__setattr__(self, '_cashflow_cache', None)
+        object.__setattr__(self, name, value)
+
+    def reset_cache(self):
+        """Clear cached cash flows."""
+        self._cashflow_cache = None
+
     def copy(self, system=None):
         """Create a copy."""
         new = copy_(self)
@@ -677,6 +887,16 @@ class TEA:
             _duration_array_cache[key] = duration_array = np.arange(-start+1, years+1, dtype=float)
         return duration_array
 
+    def _get_discount_factors(self, IRR):
+        """Return (1 + IRR) ** duration by year."""
+        key = (float(IRR), self._start, self._years)
+        if key in _discount_factor_cache:
+            discount_factors = _discount_factor_cache[key]
+        else:
+            if len(_discount_factor_cache) > 100: _discount_factor_cache.clear()
+            _discount_factor_cache[key] = discount_factors = (1. + IRR) ** self._get_duration_array()
+        return discount_factors
+
     def _get_depreciation_array(self):
         key = self._depreciation_key
         if key is None: 
@@ -774,12 +994,7 @@ class TEA:
     @property
     def NPV(self) -> float:
         """Net present value."""
-        taxable_cashflow, nontaxable_cashflow, depreciation = self._taxable_nontaxable_depreciation_cashflows()
-        tax = np.zeros_like(taxable_cashflow)
-        incentives = tax.copy()
-        self._fill_tax_and_incentives(incentives, taxable_cashflow, nontaxable_cashflow, tax, depreciation)
-        cashflow = nontaxable_cashflow + taxable_cashflow + incentives - tax
-        return NPV_at_IRR(self.IRR, cashflow, self._get_duration_array())
+        return (self._cashflows()[-1] / self._get_discount_factors(self.IRR)).sum()
     
     def _AOC(self, FCI):
         """Return AOC at given FCI"""
@@ -830,24 +1045,44 @@ class TEA:
         index = taxable_cashflow > 0.
         tax[index] = self.income_tax * taxable_cashflow[index]
     
-    def _net_earnings_and_nontaxable_cashflow_arrays(self):
+    def _cashflow_key(self):
+        system = self.system
+        return (Unit._summary_count, system.material_cost, system.sales, 
+                system.operating_hours, system.lang_factor)
+    
+    def _cashflows(self):
+        """
+        Return taxable, nontaxable, depreciation, net earnings, and total 
+        cash flows by year as a tuple of 1d arrays (cached until costs or 
+        TEA attributes change; arrays must not be modified).
+        
+        """
+        key = self._cashflow_key()
+        cache = self._cashflow_cache
+        if cache is not None and cache[0] == key: return cache[1]
         taxable_cashflow, nontaxable_cashflow, depreciation = self._taxable_nontaxable_depreciation_cashflows()
-        size = taxable_cashflow.size
-        tax = np.zeros(size)
+        tax = np.zeros_like(taxable_cashflow)
         incentives = tax.copy()
         self._fill_tax_and_incentives(incentives, taxable_cashflow, nontaxable_cashflow, tax, depreciation)
         net_earnings = taxable_cashflow + incentives - tax
-        return net_earnings, nontaxable_cashflow
+        cashflows = (taxable_cashflow, nontaxable_cashflow, depreciation, 
+                     net_earnings, net_earnings + nontaxable_cashflow)
+        self._cashflow_cache = (key, cashflows)
+        return cashflows
+    
+    def _net_earnings_and_nontaxable_cashflow_arrays(self):
+        cashflows = self._cashflows()
+        return cashflows[3].copy(), cashflows[1].copy()
     
     @property
     def cashflow_array(self) -> NDArray[float]:
         """Cash flows by year."""
-        return sum(self._net_earnings_and_nontaxable_cashflow_arrays())
+        return self._cashflows()[-1].copy()
     
     @property
     def net_earnings_array(self) -> NDArray[float]:
         """Net earnings by year."""
-        return self._net_earnings_and_nontaxable_cashflow_arrays()[0]
+        return self._cashflows()[3].copy()
     
     def production_costs(self, products: Sequence[bst.Stream], with_annual_depreciation: Optional[bool]=True):
         """
@@ -901,10 +1136,14 @@ class TEA:
         IRR = self._IRR
         if not IRR or np.isnan(IRR) or IRR < 0.: IRR = self.IRR
         if not IRR or np.isnan(IRR) or IRR < 0.: IRR = 0.10
-        args = (self.cashflow_array, self._get_duration_array())
-        IRR = flx.aitken_secant(NPV_at_IRR,
-                                IRR, 1.0001 * IRR + 1e-3, xtol=1e-6, ytol=10.,
-                                maxiter=200, args=args, checkiter=False)
+        args = (self._cashflows()[-1], self._get_duration_array())
+        IRR_newton = solve_IRR_by_newton(IRR, *args, 1e-9, 50)
+        if np.isnan(IRR_newton):
+            IRR = flx.aitken_secant(NPV_at_IRR,
+                                    IRR, 1.0001 * IRR + 1e-3, xtol=1e-6, ytol=10.,
+                                    maxiter=200, args=args, checkiter=False)
+        else:
+            IRR = IRR_newton
         self._IRR = IRR
         return IRR
         
@@ -941,20 +1180,30 @@ class TEA:
         point (NPV = 0) through cash flow analysis. 
         
         """
-        discount_factors = (1 + self.IRR)**self._get_duration_array()
+        discount_factors = self._get_discount_factors(self.IRR)
         sales_coefficients = np.ones_like(discount_factors)
         start = self._start
         sales_coefficients[:start] = 0
         w0 = self._startup_time
         sales_coefficients[self._start] =  w0*self.startup_VOCfrac + (1-w0)
         sales = self._sales
-        taxable_cashflow, nontaxable_cashflow, depreciation = self._taxable_nontaxable_depreciation_cashflows()
+        taxable_cashflow, nontaxable_cashflow, depreciation, *_ = self._cashflows()
         if np.isnan(taxable_cashflow).any():
             warn('nan encountered in cashflow array; resimulating system', category=RuntimeWarning)
             self.system.simulate()
-            taxable_cashflow, nontaxable_cashflow, depreciation = self._taxable_nontaxable_depreciation_cashflows()
+            self.reset_cache()
+            taxable_cashflow, nontaxable_cashflow, depreciation, *_ = self._cashflows()
             if np.isnan(taxable_cashflow).any():
                 raise RuntimeError('nan encountered in cashflow array')
+        if type(self)._fill_tax_and_incentives is TEA._fill_tax_and_incentives:
+            sales = solve_sales_with_income_tax(
+                taxable_cashflow[None], nontaxable_cashflow[None], sales_coefficients[None],
+                discount_factors[None], np.array([self.income_tax], dtype=float)
+            )[0]
+            if np.isfinite(sales): 
+                self._sales = sales
+                return sales
+            sales = self._sales
         args = (taxable_cashflow, 
                 nontaxable_cashflow, 
                 depreciation,
@@ -974,7 +1223,297 @@ class TEA:
             sales = flx.IQ_interpolation(f, *bracket, args=args, xtol=10, ytol=1000, maxiter=1000, checkiter=False)
         self._sales = sales
         return sales
-    
+
+    def _batch_parameters(self, prices, parameters):
+        valid_parameters = self.batch_parameters
+        arrays = {}
+        N = 1
+        for name, value in parameters.items():
+            if name not in valid_parameters:
+                raise TypeError(
+                    f"'{name}' is not a batch parameter; valid parameters "
+                    f"include {', '.join(valid_parameters)}"
+                )
+            arrays[name] = value = np.asarray(value, dtype=float)
+            if name == 'construction_schedule':
+                if value.shape[-1] != self._start:
+                    raise ValueError(
+                        'construction schedule must have the same number of '
+                        'years as the current construction schedule'
+                    )
+                if value.ndim == 2: N = max(N, value.shape[0])
+            elif value.ndim == 1:
+                N = max(N, value.size)
+        prices = {i: np.asarray(j, dtype=float) for i, j in prices.items()} if prices else {}
+        for value in prices.values():
+            if value.ndim == 1: N = max(N, value.size)
+        for name in valid_parameters:
+            if name in arrays:
+                value = arrays[name]
+            elif name == 'construction_schedule':
+                value = np.asarray(self._construction_schedule, dtype=float)
+            else:
+                value = np.asarray(getattr(self, name), dtype=float)
+            shape = (N, self._start) if name == 'construction_schedule' else (N,)
+            try:
+                arrays[name] = np.broadcast_to(value, shape)
+            except ValueError:
+                raise ValueError(f"'{name}' must have one value for each of the {N} scenarios")
+        try:
+            prices = {i: np.broadcast_to(j, (N,)) for i, j in prices.items()}
+        except ValueError:
+            raise ValueError(f"prices must have one value for each of the {N} scenarios")
+        return N, arrays, prices
+
+    def _batch_cashflows(self, prices, parameters):
+        """
+        Return the number of scenarios, parameter arrays, and taxable, nontaxable
+        and depreciation cash flows by scenario and year as a tuple[int, dict,
+        2d array, 2d array, 1d array]. Subclasses which implement 
+        `_taxable_nontaxable_depreciation_cashflows` are evaluated one scenario
+        at a time.
+
+        """
+        N, p, prices = self._batch_parameters(prices, parameters)
+        if type(self)._taxable_nontaxable_depreciation_cashflows is not TEA._taxable_nontaxable_depreciation_cashflows:
+            return (N, p, *self._serial_batch_cashflows(N, p, prices))
+        system = self.system
+        TDC = self.TDC
+        FCI = self._FCI(TDC)
+        start = self._start
+        years = self._years
+        length = start + years
+        FOC = self._FOC(FCI)
+        VOC = self.VOC
+        sales = self.sales
+        if prices:
+            feeds = set(system.feeds)
+            products = set(system.products)
+            VOC = np.full(N, VOC)
+            sales = np.full(N, sales)
+            for stream, price in prices.items():
+                market_value = (price - stream.price) * system.get_mass_flow(stream)
+                if stream in feeds: VOC += market_value
+                elif stream in products: sales += market_value
+                else: raise ValueError(f'{stream} must be either a feed or a product of {system}')
+        D = np.zeros(length)
+        self._fill_depreciation_array(D, start, years, TDC)
+        C_FC = np.zeros(length)
+        for i in system.unit_capital_costs.values() if isinstance(system, bst.AgileSystem) else system.cost_units:
+            add_all_replacement_costs_to_cashflow_array(i, C_FC, years, start, self.lang_factor)
+        C_FC = np.tile(C_FC, (N, 1))
+        C_FC[:, :start] = FCI * p['construction_schedule']
+        WC = p['WC_over_FCI'] * FCI
+        C_WC = np.zeros((N, length))
+        C_WC[:, start - 1] = WC
+        C_WC[:, -1] = -WC
+        w0 = p['startup_months'] / 12.
+        w1 = 1. - w0
+        C = np.zeros((N, length))
+        C[:, start] = (w0 * p['startup_VOCfrac'] * VOC + w1 * VOC
+                       + w0 * p['startup_FOCfrac'] * FOC + w1 * FOC)
+        C[:, start + 1:] = np.reshape(VOC + FOC, (-1, 1))
+        S = np.zeros((N, length))
+        S[:, start] = w0 * p['startup_salesfrac'] * sales + w1 * sales
+        S[:, start + 1:] = np.reshape(sales, (-1, 1))
+        interest = p['finance_interest']
+        financed = interest != 0.
+        if financed.any():
+            Loan = np.zeros((N, length))
+            Loan[:, :start] = (financed * p['finance_fraction'])[:, None] * (C_FC[:, :start] + C_WC[:, :start])
+            finance_years = financed * p['finance_years'].astype(int)
+            LP = batch_loan_payments(Loan[:, :start], interest, finance_years, start, length)
+            taxable_cashflow = S - C - D - LP
+            nontaxable_cashflow = D + Loan - C_FC - C_WC
+        else:
+            taxable_cashflow = S - C - D
+            nontaxable_cashflow = D - C_FC - C_WC
+        return N, p, taxable_cashflow, nontaxable_cashflow, D
+
+    def _serial_batch_cashflows(self, N, p, prices):
+        original_parameters = {i: getattr(self, i) for i in p}
+        original_prices = {i: i.price for i in prices}
+        taxable_cashflow = nontaxable_cashflow = depreciation = None
+        try:
+            for i in range(N):
+                for name, value in p.items(): 
+                    setattr(self, name, int(value[i]) if name == 'finance_years' else value[i])
+                for stream, price in prices.items(): stream.price = price[i]
+                taxable, nontaxable, depreciation = self._taxable_nontaxable_depreciation_cashflows()
+                if taxable_cashflow is None:
+                    taxable_cashflow = np.zeros((N, taxable.size))
+                    nontaxable_cashflow = taxable_cashflow.copy()
+                taxable_cashflow[i] = taxable
+                nontaxable_cashflow[i] = nontaxable
+        finally:
+            for name, value in original_parameters.items(): setattr(self, name, value)
+            for stream, price in original_prices.items(): stream.price = price
+        return taxable_cashflow, nontaxable_cashflow, depreciation
+
+    def _fill_batch_tax_and_incentives(self, incentives, taxable_cashflow, nontaxable_cashflow, tax, depreciation, income_tax):
+        """
+        Fill tax and incentive cash flows by scenario and year (2d arrays)
+        given the income tax of each scenario. Subclasses which implement
+        `_fill_tax_and_incentives` are evaluated one scenario at a time unless
+        this method is also implemented.
+
+        """
+        if type(self)._fill_tax_and_incentives is TEA._fill_tax_and_incentives:
+            index = taxable_cashflow > 0.
+            tax[index] = (income_tax[:, None] * taxable_cashflow)[index]
+        else:
+            original_income_tax = self.income_tax
+            try:
+                for i in range(income_tax.size):
+                    self.income_tax = income_tax[i]
+                    self._fill_tax_and_incentives(
+                        incentives[i], taxable_cashflow[i], nontaxable_cashflow[i], tax[i], depreciation
+                    )
+            finally:
+                self.income_tax = original_income_tax
+
+    def _batch_cashflow_arrays(self, prices, parameters):
+        N, p, taxable_cashflow, nontaxable_cashflow, depreciation = self._batch_cashflows(prices, parameters)
+        tax = np.zeros_like(taxable_cashflow)
+        incentives = tax.copy()
+        self._fill_batch_tax_and_incentives(
+            incentives, taxable_cashflow, nontaxable_cashflow, tax, depreciation, p['income_tax']
+        )
+        return p, nontaxable_cashflow + taxable_cashflow + incentives - tax
+
+    def batch_cashflow_arrays(self, prices: Optional[dict[bst.Stream, NDArray[float]]]=None, **parameters) -> NDArray[float]:
+        """
+        Return cash flows by scenario and year (a 2d array) at given economic
+        parameters. Each parameter may be a scalar or an array with a value
+        for each scenario. Parameters not given default to current values.
+
+        Parameters
+        ----------
+        prices :
+            Stream prices [USD/kg] by feed or product stream.
+        **parameters :
+            Economic parameters by name (see :attr:`~TEA.batch_parameters`).
+            Construction schedules may be a 2d array (scenarios x construction years).
+
+        """
+        return self._batch_cashflow_arrays(prices, parameters)[1]
+
+    def batch_NPV(self, prices: Optional[dict[bst.Stream, NDArray[float]]]=None, **parameters) -> NDArray[float]:
+        """
+        Return the net present value of each scenario at given economic
+        parameters. Each parameter may be a scalar or an array with a value
+        for each scenario. Parameters not given default to current values.
+
+        Parameters
+        ----------
+        prices :
+            Stream prices [USD/kg] by feed or product stream.
+        **parameters :
+            Economic parameters by name (see :attr:`~TEA.batch_parameters`).
+            Construction schedules may be a 2d array (scenarios x construction years).
+
+        """
+        p, cashflows = self._batch_cashflow_arrays(prices, parameters)
+        return batch_NPV_at_IRR(p['IRR'], cashflows, self._get_duration_array())
+
+    def batch_solve_IRR(self, prices: Optional[dict[bst.Stream, NDArray[float]]]=None, **parameters) -> NDArray[float]:
+        """
+        Return the IRR at the break even point (NPV = 0) of each scenario at
+        given economic parameters. Each parameter may be a scalar or an array
+        with a value for each scenario. Parameters not given default to current
+        values. The IRR parameter is used as the initial guess.
+
+        Parameters
+        ----------
+        prices :
+            Stream prices [USD/kg] by feed or product stream.
+        **parameters :
+            Economic parameters by name (see :attr:`~TEA.batch_parameters`).
+            Construction schedules may be a 2d array (scenarios x construction years).
+
+        """
+        p, cashflows = self._batch_cashflow_arrays(prices, parameters)
+        IRR = p['IRR'].copy()
+        IRR[~(IRR > 0.)] = 0.10
+        return batch_solve_IRR(IRR, cashflows, self._get_duration_array())
+
+    def batch_solve_sales(self, prices: Optional[dict[bst.Stream, NDArray[float]]]=None, **parameters) -> NDArray[float]:
+        """
+        Return the required additional sales [USD] to reach the breakeven
+        point (NPV = 0) of each scenario at given economic parameters. Each
+        parameter may be a scalar or an array with a value for each scenario.
+        Parameters not given default to current values.
+
+        Parameters
+        ----------
+        prices :
+            Stream prices [USD/kg] by feed or product stream.
+        **parameters :
+            Economic parameters by name (see :attr:`~TEA.batch_parameters`).
+            Construction schedules may be a 2d array (scenarios x construction years).
+
+        """
+        N, p, taxable_cashflow, nontaxable_cashflow, depreciation = self._batch_cashflows(prices, parameters)
+        if np.isnan(taxable_cashflow).any():
+            raise RuntimeError('nan encountered in cashflow array')
+        start = self._start
+        discount_factors = 1. / batch_discount_factors(p['IRR'], self._get_duration_array())
+        sales_coefficients = np.ones_like(taxable_cashflow)
+        sales_coefficients[:, :start] = 0.
+        w0 = p['startup_months'] / 12.
+        sales_coefficients[:, start] = w0 * p['startup_VOCfrac'] + (1. - w0)
+        income_tax = p['income_tax']
+        if type(self)._fill_tax_and_incentives is TEA._fill_tax_and_incentives:
+            sales = solve_sales_with_income_tax(
+                taxable_cashflow, nontaxable_cashflow, sales_coefficients, 
+                discount_factors, income_tax
+            )
+            if np.isfinite(sales).all(): return sales
+        fill_tax_and_incentives = self._fill_batch_tax_and_incentives
+
+        def NPV_with_sales(sales, index):
+            taxable = taxable_cashflow[index] + sales[:, None] * sales_coefficients[index]
+            nontaxable = nontaxable_cashflow[index]
+            tax = np.zeros_like(taxable)
+            incentives = tax.copy()
+            fill_tax_and_incentives(incentives, taxable, nontaxable, tax, depreciation, income_tax[index])
+            return ((nontaxable + taxable + incentives - tax) / discount_factors[index]).sum(1)
+
+        slope = (sales_coefficients / discount_factors).sum(1)
+        return batch_solve_sales(NPV_with_sales, np.zeros(N), slope)
+
+    def batch_solve_price(self, streams: bst.Stream|Collection[bst.Stream],
+                          prices: Optional[dict[bst.Stream, NDArray[float]]]=None,
+                          **parameters) -> NDArray[float]:
+        """
+        Return the price [USD/kg] of a stream(s) at the break even point
+        (NPV = 0) of each scenario at given economic parameters. Each
+        parameter may be a scalar or an array with a value for each scenario.
+        Parameters not given default to current values.
+
+        Parameters
+        ----------
+        streams :
+            Streams with variable selling price.
+        prices :
+            Stream prices [USD/kg] by feed or product stream.
+        **parameters :
+            Economic parameters by name (see :attr:`~TEA.batch_parameters`).
+            Construction schedules may be a 2d array (scenarios x construction years).
+
+        """
+        if isinstance(streams, bst.Stream): streams = [streams]
+        system = self.system
+        price2cost = sum([system._price2cost(i) for i in streams])
+        if price2cost == 0.: raise ValueError('cannot solve price of empty streams')
+        sales = self.batch_solve_sales(prices, **parameters)
+        market_value = 0.
+        for i in streams:
+            price = prices[i] if prices and i in prices else i.price
+            market_value += np.asarray(price, dtype=float) * system.get_mass_flow(i)
+        current_price = market_value / abs(price2cost)
+        return current_price + sales / price2cost
+
     def __repr__(self):
         return f'{type(self).__name__}({self.system.ID}, ...)'
     
@@ -19,6 +19,7 @@ from .exceptions import UnitInheritanceError
 from thermosteam.utils import thermo_user, registered
 from thermosteam.units_of_measure import convert
 from copy import copy
+from collections import namedtuple
 import biosteam as bst
 from thermosteam import Stream
 from thermosteam.base import display_asfunctor
@@ -77,6 +78,176 @@ class ProcessSpecification:
     def __repr__(self):
         return f"{type(self).__name__}(f={display_asfunctor(self.f)}, args={self.args}, impacted_units={self.impacted_units})"
 
+# %% Unit state
+
+def same_value(old, new):
+    if isinstance(old, np.ndarray):
+        if old.shape != new.shape: return False
+        try:
+            return np.array_equal(old, new, equal_nan=True)
+        except TypeError:
+            return np.array_equal(old, new)
+    else:
+        return old is new or old == new or (old != old and new != new)
+
+def reaction_conversions(reaction):
+    if isinstance(reaction, tmo.reaction.ReactionSystem):
+        return np.hstack([reaction_conversions(i) for i in reaction._reactions])
+    else:
+        return np.array(reaction.X, dtype=float, ndmin=1)
+
+def stream_state(stream):
+    """Return the temperature, pressure, phase, and molar flow rates of a stream."""
+    TP = stream._thermal_condition
+    return (TP.T, TP.P, stream.phase, stream._imol._data.copy())
+
+def unit_state(unit):
+    """
+    Return copies of the numbers, strings, arrays, chemical indexer data, 
+    and reaction conversions that are attributes of a unit operation.
+    
+    """
+    state = {}
+    isa = isinstance
+    for name, value in unit.__dict__.items():
+        if value is None or isa(value, (bool, int, float, str)):
+            state[name] = value
+        elif isa(value, np.ndarray):
+            state[name] = value.copy()
+        elif isa(value, tmo.indexer.Indexer):
+            state[name] = value._data.copy()
+        elif isa(value, reaction_types):
+            state[name] = reaction_conversions(value)
+    return state
+
+def settings_state():
+    """Return prices and utility agent specifications used to cost units."""
+    agents = HeatUtility.heating_agents + HeatUtility.cooling_agents
+    return (bst.CE, PowerUtility.price, tuple(bst.stream_utility_prices.items()),
+            tuple([(i.ID, i.T, i.P, i.heat_transfer_price, i.regeneration_price)
+                   for i in agents]))
+
+def changed(old_state, new_state):
+    if len(old_state) != len(new_state): return True
+    if isinstance(old_state, dict):
+        for name, value in old_state.items():
+            if name not in new_state or not same_value(value, new_state[name]): return True
+    else:
+        for old, new in zip(old_state, new_state):
+            if not same_value(old, new): return True
+    return False
+
+reaction_types = (tmo.reaction.Reaction, tmo.reaction.ReactionSet,
+                  tmo.reaction.ReactionSystem)
+
+#: Relative tolerance of floating point numbers in summary keys (i.e., 
+#: numerical noise from converging recycle loops and phase equilibrium
+#: does not rerun design and cost algorithms).
+summary_rtol = 1e-6
+
+#: Absolute tolerance of floating point numbers in summary keys.
+summary_atol = 1e-12
+
+#: Unit attributes ignored in summary keys.
+ignored_attributes = frozenset(['memoize_summary', '_costs_loaded'])
+
+def state_key(unit, values, streams=True):
+    isa = isinstance
+    key = []
+    if streams:
+        for i in unit._ins._streams + unit._outs._streams:
+            if isa(i, Stream):
+                TP = i._thermal_condition
+                data = i._imol._data
+                key.append((i.phase, data.shape))
+                values.append((TP.T, TP.P))
+                values.append(data.ravel())
+            else:
+                key.append(None)
+    for name, value in unit.__dict__.items():
+        if name in ignored_attributes: 
+            continue
+        elif isa(value, float):
+            key.append(name)
+            values.append((value,))
+        elif value is None or isa(value, (bool, int, str)):
+            key.append((name, value))
+        elif isa(value, np.ndarray):
+            if value.dtype.kind == 'f':
+                key.append((name, value.shape))
+                values.append(value.ravel())
+            else:
+                key.append((name, value.shape, value.tobytes()))
+        elif isa(value, tmo.indexer.Indexer):
+            key.append((name, value._data.shape))
+            values.append(value._data.ravel())
+        elif isa(value, reaction_types):
+            X = reaction_conversions(value)
+            key.append((name, X.size))
+            values.append(X)
+    for factors in (unit.F_BM, unit.F_D, unit.F_P, unit.F_M):
+        key.append(tuple(factors.items()))
+    for i in unit.auxiliary_units:
+        # Streams of auxiliary units are set by the unit that owns them
+        if isa(i, Unit): key.append(state_key(i, values, False))
+    return tuple(key)
+
+def summary_key(unit):
+    """
+    Return a key of the inlet and outlet streams (temperature, pressure,
+    phase, and molar flow rates), the numbers, strings, arrays, chemical
+    indexer data, reaction conversions, and cost factors of a unit operation
+    (and its auxiliary units), as well as the operating hours and prices 
+    used to cost units. Keys are a tuple of hashable items and an array of 
+    all floating point values, which are compared with a tolerance
+    (see :func:`same_summary_key`).
+
+    """
+    system = unit._system
+    values = []
+    key = (settings_state(),
+           None if system is None else system.operating_hours,
+           state_key(unit, values))
+    return key, np.concatenate(values) if values else np.zeros(0)
+
+def same_summary_key(key, other):
+    """Return whether two summary keys are the same within tolerance."""
+    items, values = key
+    other_items, other_values = other
+    return (values.size == other_values.size 
+            and items == other_items
+            and np.allclose(values, other_values, summary_rtol, summary_atol, True))
+
+class SummaryCacheInfo(namedtuple('SummaryCacheInfo', ('hits', 'misses'))):
+    """Number of design and cost calls that reused memoized results (hits) or not (misses)."""
+    __slots__ = ()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of design and cost calls that reused memoized results."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.
+
+class SummaryMemo:
+    """Memoized design and cost results of a unit operation."""
+    __slots__ = ('keys', 'attributes', 'results', 'hits', 'misses')
+
+    def __init__(self):
+        #: Keys of unit state before and after the last design and cost calls.
+        self.keys: tuple = ()
+
+        #: Attributes set by the last design and cost calls.
+        self.attributes: dict[str, object] = {}
+
+        #: Design and cost results of the last call.
+        self.results: tuple|None = None
+
+        #: Number of calls that reused memoized results.
+        self.hits: int = 0
+
+        #: Number of calls that ran design and cost algorithms.
+        self.misses: int = 0
+
 # %% Typing
 
 # from typing import Collection, Union, Annotated
@@ -339,6 +510,22 @@ class Unit:
     #: and :attr:`~Unit._N_outs`.
     _graphics: UnitGraphics = box_graphics
 
+    #: Whether to reuse design and cost results when the unit and its inlet and
+    #: outlet streams did not change since the last simulation. Only inlet and
+    #: outlet streams, cost factors, and instance attributes that are numbers,
+    #: strings, arrays, chemical indexers, or reactions are compared. Changes
+    #: to class attributes, to lists, dictionaries, or other objects held by 
+    #: the unit, and to other units (e.g., a heat exchanger network or 
+    #: facility using the results of other units) are not detected. Unit 
+    #: classes may opt in only if their design and cost algorithms depend on
+    #: nothing else.
+    memoize_summary: bool = False
+
+    #: **class-attribute** Number of design and cost summaries of all units.
+    #: Changes whenever any unit's capital or utility costs may have changed
+    #: (e.g., for invalidating cached cash flows of TEA objects).
+    _summary_count: int = 0
+
     ### Abstract methods ###
     
     #: Create auxiliary components.
@@ -1311,9 +1498,84 @@ class Unit:
                 )
     
     def _summary(self, design_kwargs=None, cost_kwargs=None):
-        """Run design and cost algorithms and compile capital and utility costs."""
+        """
+        Run design and cost algorithms and compile capital and utility costs.
+        Results are reused if the unit and its inlet and outlet streams did not 
+        change since the last call (see :attr:`~Unit.memoize_summary`).
+        
+        """
         self._check_run()
         if not (self._design or self._cost): return
+        Unit._summary_count += 1
+        if self.memoize_summary and not (design_kwargs or cost_kwargs):
+            memo = getattr(self, '_summary_memo', None)
+            if memo is None: self._summary_memo = memo = SummaryMemo()
+            key = summary_key(self)
+            if (memo.results is not None
+                and any([same_summary_key(key, i) for i in memo.keys])):
+                memo.hits += 1
+                self.__dict__.update(memo.attributes)
+                self._load_summary_results(memo.results)
+                return
+            memo.misses += 1
+            attributes = self.__dict__.copy()
+            self._run_summary()
+            memo.attributes = {i: j for i, j in self.__dict__.items()
+                               if i not in attributes or attributes[i] is not j}
+            memo.results = self._get_summary_results()
+            memo.keys = (key, summary_key(self))
+        else:
+            self._run_summary(design_kwargs, cost_kwargs)
+
+    def _get_summary_results(self):
+        return (
+            self.design_results.copy(), self.baseline_purchase_costs.copy(),
+            self.purchase_costs.copy(), self.installed_costs.copy(),
+            self.parallel.copy(), list(self.heat_utilities),
+            [(i, i.copy()) for i in dict.fromkeys(self.heat_utilities)],
+            self.power_utility.copy(), self._utility_cost,
+            [(i, i._get_summary_results()) for i in self.auxiliary_units if isinstance(i, Unit)],
+        )
+
+    def _load_summary_results(self, results):
+        (design_results, baseline_purchase_costs, purchase_costs, installed_costs,
+         parallel, heat_utilities, heat_utility_data, power_utility, utility_cost,
+         auxiliary_results) = results
+        for i, j in auxiliary_results: i._load_summary_results(j)
+        for dct, items in ((self.design_results, design_results),
+                           (self.baseline_purchase_costs, baseline_purchase_costs),
+                           (self.purchase_costs, purchase_costs),
+                           (self.installed_costs, installed_costs),
+                           (self.parallel, parallel)):
+            dct.clear()
+            dct.update(items)
+        # Heat utility objects are reused as other units (e.g., facilities) may
+        # rely on their identity
+        self.heat_utilities[:] = heat_utilities
+        for i, j in heat_utility_data: i.copy_like(j)
+        self.power_utility.copy_like(power_utility)
+        self._utility_cost = utility_cost
+        self._costs_loaded = True
+
+    def summary_cache_info(self) -> SummaryCacheInfo:
+        """
+        Return the number of design and cost calls that reused memoized
+        results (hits) or not (misses).
+
+        See Also
+        --------
+        memoize_summary
+
+        """
+        memo = getattr(self, '_summary_memo', None)
+        if memo is None: return SummaryCacheInfo(0, 0)
+        return SummaryCacheInfo(memo.hits, memo.misses)
+
+    def clear_summary_cache(self):
+        """Clear memoized design and cost results and statistics."""
+        self._summary_memo = None
+
+    def _run_summary(self, design_kwargs=None, cost_kwargs=None):
         self._design(**design_kwargs) if design_kwargs else self._design()
         self._cost(**cost_kwargs) if cost_kwargs else self._cost()
         self._check_utilities()
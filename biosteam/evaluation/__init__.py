@@ -13,9 +13,12 @@ from ._parameter import *
 from ._state import *
 from ._model import *
 from ._metric import *
+from ._result_store import *
+from ._surrogate import *
+from ._streaming import *
 from . import (_parameter, _state, _model,
               _metric, evaluation_tools, _feature,
-              _utils)
+              _utils, _result_store, _surrogate, _streaming)
 
 __all__ = ('evaluation_tools',
            *_feature.__all__,
@@ -23,4 +26,7 @@ __all__ = ('evaluation_tools',
            *_metric.__all__,
            *_state.__all__,
            *_model.__all__,
-           *_utils.__all__)
\ No newline at end of file
+           *_utils.__all__,
+           *_result_store.__all__,
+           *_surrogate.__all__,
+           *_streaming.__all__)
\ No newline at end of file
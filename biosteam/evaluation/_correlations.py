@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+Vectorized correlation engine. All functions correlate every column of `x`
+(samples by parameters) with every column of `y` (samples by metrics) and
+return two arrays (parameters by metrics) of statistics and p-values.
+
+"""
+import numpy as np
+from scipy import stats
+
+__all__ = ()
+
+filters = ('omit nan', 'propagate nan', 'raise nan', 'none')
+
+def t_test_p_values(r, n):
+    """Return two-sided p-values of correlation coefficients by Student's t-test."""
+    if n <= 2: return np.full(r.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = r * np.sqrt((n - 2) / ((1. - r) * (1. + r)))
+    return 2. * stats.t.sf(np.abs(t), n - 2)
+
+def standardized_columns(x):
+    deviations = x - x.mean(axis=0)
+    norm = np.sqrt((deviations * deviations).sum(axis=0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return deviations / norm
+
+def pearson_r(x, y):
+    """Return Pearson's correlation coefficients and p-values."""
+    if not (np.isfinite(x).all() and np.isfinite(y).all()):
+        raise ValueError('array must not contain infs or NaNs')
+    with np.errstate(invalid='ignore'):
+        r = np.clip(standardized_columns(x).transpose() @ standardized_columns(y), -1., 1.)
+    return r, t_test_p_values(r, x.shape[0])
+
+def spearman_r(x, y):
+    """Return Spearman's correlation coefficients and p-values."""
+    if np.isnan(x).any() or np.isnan(y).any():
+        return correlation_matrix(spearman_r, x, y, 'propagate nan')
+    return pearson_r(stats.rankdata(x, axis=0), stats.rankdata(y, axis=0))
+
+def kendall_tau(x, y, threads=None):
+    """
+    Return Kendall's tau-b and p-values. Columns are correlated with
+    :func:`scipy.stats.kendalltau` (optionally in multiple threads).
+
+    """
+    N_x = x.shape[1]
+    N_y = y.shape[1]
+    x = np.ascontiguousarray(x.transpose())
+    y = np.ascontiguousarray(y.transpose())
+    tau = np.zeros([N_x, N_y])
+    p = tau.copy()
+    def correlate(i):
+        xi = x[i]
+        for j in range(N_y): tau[i, j], p[i, j] = stats.kendalltau(xi, y[j])
+    if threads and threads > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(threads) as executor:
+            for i in executor.map(correlate, range(N_x)): pass
+    else:
+        for i in range(N_x): correlate(i)
+    return tau, p
+
+def correlation_matrix(f, x, y, filter, **kwargs):
+    """
+    Return statistics and p-values of a vectorized correlation function,
+    `f`, applying a NaN filter by groups of samples with equal NaN entries.
+
+    Parameters
+    ----------
+    f : Callable(x, y, **kwargs) -> stat, p
+        Vectorized correlation function.
+    x : 2d array
+        Samples by parameters.
+    y : 2d array
+        Samples by metrics.
+    filter : str
+        One of 'omit nan', 'propagate nan', 'raise nan', or 'none'.
+
+    """
+    if filter not in filters:
+        raise ValueError(
+            f"invalid filter '{filter}'; valid filter names are: "
+            "'omit nan', 'propagate nan', 'raise nan', and 'none'"
+        )
+    N_x = x.shape[1]
+    N_y = y.shape[1]
+    x_nan = np.isnan(x)
+    y_nan = np.isnan(y)
+    if filter == 'none' or not (x_nan.any() or y_nan.any()):
+        return f(x, y, **kwargs)
+    elif filter == 'raise nan':
+        raise ValueError('table entries contain NaN values')
+    stat = np.full([N_x, N_y], np.nan)
+    p = stat.copy()
+    if filter == 'propagate nan':
+        ix, = np.where(~x_nan.any(axis=0))
+        iy, = np.where(~y_nan.any(axis=0))
+        if ix.size and iy.size:
+            stat[np.ix_(ix, iy)], p[np.ix_(ix, iy)] = f(x[:, ix], y[:, iy], **kwargs)
+    else:
+        # Correlate columns by groups with the same NaN entries
+        x_groups = column_groups(x_nan)
+        y_groups = column_groups(y_nan)
+        for x_mask, ix in x_groups:
+            for y_mask, iy in y_groups:
+                rows = ~(x_mask | y_mask)
+                stat[np.ix_(ix, iy)], p[np.ix_(ix, iy)] = f(x[rows][:, ix], y[rows][:, iy], **kwargs)
+    return stat, p
+
+def column_groups(mask):
+    """Return pairs of row masks and indices of columns with the same row masks."""
+    groups = {}
+    packed = np.packbits(mask, axis=0).transpose()
+    for i, key in enumerate(packed):
+        key = key.tobytes()
+        if key in groups: groups[key][1].append(i)
+        else: groups[key] = (mask[:, i], [i])
+    return [(pattern, np.array(index)) for pattern, index in groups.values()]
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+"""
+import multiprocessing as mp
+import biosteam as bst
+import numpy as np
+import pickle
+from queue import Empty
+
+__all__ = ()
+
+#: Data shared with forked worker processes (model, samples, and keyword
+#: arguments). Workers inherit this dictionary on fork, so nothing is pickled
+#: except for the sample indices and the metric values.
+_worker_data = {}
+
+def get_fork_context():
+    try:
+        return mp.get_context('fork')
+    except ValueError: # pragma: no cover
+        raise RuntimeError(
+            "parallel evaluation requires the 'fork' start method, which "
+            "is not available in this platform"
+        ) from None
+
+def split_index(index, chunksize):
+    """Return a list of contiguous chunks of the sample index."""
+    if chunksize < 1: raise ValueError('chunksize must be a positive integer')
+    return [index[i:i + chunksize] for i in range(0, len(index), chunksize)]
+
+def split_path(index, samples, N):
+    """
+    Return N contiguous sections of the sample path. Each section boundary
+    is placed at the largest jump between consecutive (normalized) samples
+    within a window around the balanced position, so that every section
+    remains a compact region of the sample space.
+
+    """
+    length = len(index)
+    N = min(N, length)
+    if N <= 1: return [list(index)]
+    path = samples[index]
+    samples_min = path.min(axis=0)
+    samples_diff = path.max(axis=0) - samples_min
+    samples_diff[samples_diff == 0] = 1.
+    path = (path - samples_min) / samples_diff
+    jumps = np.abs(np.diff(path, axis=0)).sum(axis=1) # jumps[i] is between i and i + 1
+    window = length // (4 * N)
+    cuts = []
+    last = 0
+    for k in range(1, N):
+        target = round(k * length / N)
+        lower = max(target - window, last + 1)
+        upper = max(min(target + window, length - N + k), lower)
+        last = lower + int(np.argmax(jumps[lower - 1:upper]))
+        cuts.append(last)
+    return [list(index[i:j]) for i, j in zip([0, *cuts], [*cuts, length])]
+
+def worker_evaluation_kwargs(model, kwargs):
+    """
+    Return keyword arguments for evaluating samples in a worker. The converged
+    recycle material data is carried from sample to sample, so that each
+    simulation (even after a failed evaluation) starts from the last
+    converged state of the worker.
+
+    """
+    system = model._system
+    if (model._specification 
+        or not isinstance(system, bst.System)
+        or system.isdynamic 
+        or not system.get_all_recycles()):
+        return kwargs
+    else:
+        return {**kwargs,
+                'material_data': system.get_material_data(),
+                'update_material_data': True}
+
+def evaluate_index(index, kwargs):
+    model, samples, _ = _worker_data['args']
+    evaluate_sample = model._evaluate_sample
+    export = 'export_state_to' in kwargs
+    values = []
+    for i in index:
+        if export: kwargs['sample_id'] = i
+        values.append(evaluate_sample(samples[i], **kwargs))
+    return values
+
+def evaluate_chunk(chunk):
+    """Return metric values for all samples in chunk (evaluated in order)."""
+    model, samples, kwargs = _worker_data['args']
+    return evaluate_index(chunk, worker_evaluation_kwargs(model, kwargs))
+
+def evaluate_chunks(model, samples, chunks, processes, kwargs):
+    """
+    Yield chunk-metric value pairs in the same order as the chunks given.
+
+    Each chunk is evaluated in a freshly forked process (one task per child),
+    so every chunk starts from the exact state of the model at the time of
+    calling. Results are therefore independent of the number of processes.
+
+    """
+    context = get_fork_context()
+    _worker_data['args'] = (model, samples, kwargs)
+    try:
+        with context.Pool(processes, maxtasksperchild=1) as pool:
+            yield from zip(chunks, pool.imap(evaluate_chunk, chunks))
+    finally:
+        _worker_data.clear()
+
+def picklable_exception(exception):
+    try:
+        pickle.dumps(exception)
+    except:
+        return RuntimeError(f"[{type(exception).__name__}] {exception}")
+    else:
+        return exception
+
+def evaluate_region(region, chunksize, queue):
+    model, samples, kwargs = _worker_data['args']
+    kwargs = worker_evaluation_kwargs(model, kwargs)
+    try:
+        for chunk in split_index(region, chunksize):
+            queue.put((chunk, evaluate_index(chunk, kwargs)))
+    except BaseException as exception:
+        queue.put((None, picklable_exception(exception)))
+    else:
+        queue.put((None, None))
+
+def evaluate_regions(model, samples, regions, chunksize, kwargs):
+    """
+    Yield chunk-metric value pairs as they are evaluated.
+
+    Each region is evaluated by one worker process which carries its own
+    converged recycle material data from sample to sample. Results are sent
+    back every `chunksize` samples.
+
+    """
+    context = get_fork_context()
+    queue = context.Queue()
+    _worker_data['args'] = (model, samples, kwargs)
+    try:
+        workers = [context.Process(target=evaluate_region, args=(i, chunksize, queue), daemon=True)
+                   for i in regions]
+        for i in workers: i.start()
+    finally:
+        _worker_data.clear()
+    try:
+        running = len(workers)
+        while running:
+            try:
+                chunk, values = queue.get(timeout=1.)
+            except Empty:
+                if any([i.exitcode for i in workers]):
+                    raise RuntimeError('worker process terminated unexpectedly')
+                continue
+            if chunk is not None:
+                yield chunk, values
+            elif values is None:
+                running -= 1
+            else:
+                raise values
+    finally:
+        for i in workers:
+            if i.is_alive(): i.terminate()
+            i.join()
+        queue.close()
+
+def evaluate_task_chunk(chunk):
+    """
+    Return results of all tasks in chunk (evaluated in order). Exceptions 
+    are caught per task and returned in place of the result.
+    
+    """
+    f, tasks = _worker_data['args']
+    results = []
+    for i in chunk:
+        try:
+            results.append((f(tasks[i]), None))
+        except Exception as exception:
+            results.append((None, picklable_exception(exception)))
+    return results
+
+def map_tasks(f, tasks, processes, chunksize=1):
+    """
+    Yield result-exception pairs of f(task) for all tasks in the same order 
+    as given. Each chunk of tasks is evaluated in a freshly forked process 
+    (one task per child), so every chunk starts from the exact state of the
+    model (or any other object referenced by `f`) at the time of calling. 
+    An exception raised by a task is returned in place of its result (the 
+    rest of the tasks are still evaluated).
+
+    """
+    context = get_fork_context()
+    chunks = split_index(list(range(len(tasks))), chunksize)
+    _worker_data['args'] = (f, tasks)
+    try:
+        with context.Pool(min(processes, len(chunks) or 1), maxtasksperchild=1) as pool:
+            for results in pool.imap(evaluate_task_chunk, chunks): yield from results
+    finally:
+        _worker_data.clear()
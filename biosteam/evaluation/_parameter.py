@@ -37,10 +37,11 @@ class Parameter(Feature):
         Baseline value of parameter.
     bounds : tuple[float, float]
         Lower and upper bounds of parameter.
-    kind : str
+    kind : str|None
         * 'design': Parameter only affects unit operation design.
         * 'coupled': Parameter affects mass and energy balances.
         * 'isolated': Parameter does not affect the system in any way.
+        * None: Kind not declared (treated as 'isolated' when simulated).
     hook : Callable
         Should return the new parameter value given the sample.
     scale : float, optional
@@ -113,7 +114,7 @@ class Parameter(Feature):
             subsystem = self.subsystem
             if not subsystem: raise RuntimeError(f'no system to run {kind} algorithm')
             self.subsystem.simulate(**dyn_sim_kwargs)
-        elif kind == 'isolated':
+        elif kind == 'isolated' or kind is None:
             pass
         else:
             raise RuntimeError(f"invalid parameter kind '{kind}'")
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+"""
+import os
+import pickle
+import numpy as np
+
+__all__ = ('ResultStore',)
+
+class ResultStore:
+    """
+    Create a ResultStore object that saves metric values of evaluated samples
+    in an append-only, columnar directory of .npy chunks. Each chunk is
+    written once (to a temporary file which is then renamed), so saving is
+    proportional to the number of new evaluations and an interrupted save
+    cannot corrupt previous results. Chunks are memory-mapped when read.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the result store.
+
+    Notes
+    -----
+    Pass a ResultStore object as the `file` of :meth:`Model.evaluate <biosteam.evaluation.Model.evaluate>`
+    to checkpoint evaluations (with `autosave`) and resume them (with `autoload`).
+
+    """
+    __slots__ = ('path',)
+
+    #: Name of file with the table index and columns.
+    layout_file = 'layout.pkl'
+
+    #: Prefix of chunk files.
+    chunk_prefix = 'chunk_'
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _write(self, name, write):
+        file = self._file(name)
+        tmp = file + '.tmp'
+        with open(tmp, 'wb') as f: write(f)
+        os.replace(tmp, file)
+
+    def chunk_files(self):
+        """Return names of all chunk files in order of writing."""
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        prefix = self.chunk_prefix
+        return sorted([i for i in names if i.startswith(prefix) and i.endswith('.npy')])
+
+    def layout(self):
+        """Return table index and columns of stored results."""
+        with open(self._file(self.layout_file), 'rb') as f: return pickle.load(f)
+
+    def reset(self, table):
+        """Remove all stored results and save the layout of the table."""
+        os.makedirs(self.path, exist_ok=True)
+        for i in self.chunk_files(): os.remove(self._file(i))
+        self._write(self.layout_file, lambda f: pickle.dump((table.index, table.columns), f))
+
+    def matches(self, table):
+        """Return whether the table layout matches the stored layout."""
+        try:
+            table_index, table_columns = self.layout()
+        except FileNotFoundError:
+            return False
+        return (len(table_index) == len(table.index)
+                and len(table_columns) == len(table.columns)
+                and (table_index == table.index).all()
+                and (table_columns == table.columns).all())
+
+    def append(self, ids, values):
+        """
+        Save metric values of samples as a new chunk.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            Sample indices.
+        values : Iterable[Iterable[float]]
+            Metric values of each sample.
+
+        """
+        ids = np.asarray(ids, dtype=float)
+        if not ids.size: return
+        data = np.asfortranarray(np.column_stack([ids, np.asarray(values, dtype=float)]))
+        chunks = self.chunk_files()
+        number = int(chunks[-1][len(self.chunk_prefix):-4]) + 1 if chunks else 0
+        self._write(f'{self.chunk_prefix}{number:08d}.npy', lambda f: np.save(f, data))
+
+    def chunks(self):
+        """
+        Yield sample indices and a memory-mapped array of metric values
+        for each stored chunk.
+
+        """
+        for i in self.chunk_files():
+            data = np.load(self._file(i), mmap_mode='r')
+            yield data[:, 0].astype(int), data[:, 1:]
+
+    def evaluated(self, N):
+        """Return a boolean array of whether each of the N samples has been stored."""
+        mask = np.zeros(N, dtype=bool)
+        for ids, _ in self.chunks(): mask[ids] = True
+        return mask
+
+    def load(self, table, columns):
+        """
+        Load stored metric values into the given table columns chunk by chunk.
+        Values of samples not stored are left as is.
+
+        """
+        locations = [table.columns.get_loc(i) for i in columns]
+        for ids, data in self.chunks():
+            table.iloc[ids, locations] = data
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.path!r})"
+
@@ -9,7 +9,8 @@
 """
 from typing import Callable
 from ._parameter import Parameter
-from .. import System
+from .. import System, Unit
+from thermosteam import Stream
 import numpy as np
 import pandas as pd
 from .evaluation_tools import load_default_parameters
@@ -46,6 +47,18 @@ if CP4:
 del version_components, CP_MAJOR, CP_MINOR, CP4
 
 
+# %% Sampling
+
+joint_sample_rules = ('C', 'NC', 'K', 'R', 'RG', 'NG', 'L', 'S', 'H', 'M')
+
+def joint_samples(parameters, N, rule):
+    """Return N samples (rows) from the joint distribution of parameters."""
+    rule = rule.upper()
+    if rule not in joint_sample_rules:
+        raise ValueError(f"invalid rule '{rule}'; only rules of joint distributions are valid")
+    distribution = cp.distributions.J(*[i.distribution for i in parameters])
+    return distribution.sample(N, rule).reshape([len(parameters), N]).transpose()
+
 # %%
     
 class State:
@@ -66,6 +79,8 @@ class State:
         '_system', # [System]
         '_parameters', # list[Parameter] All parameters.
         '_specification', # [function] Loads specifications once all parameters are set.
+        '_last_sample', # [array] Last sample evaluated; used to re-evaluate only what changed.
+        '_last_simulated_sample', # [array] Last sample simulated; used to mark only changed elements as dirty.
     ) 
     
     load_default_parameters = load_default_parameters
@@ -78,6 +93,8 @@ class State:
             self._parameters = []
         self._system = system
         self._specification = specification
+        self._last_sample = None
+        self._last_simulated_sample = None
     
     @property
     def specification(self) -> Callable:
@@ -109,6 +126,8 @@ class State:
         copy._parameters = list(self._parameters)
         copy._system = self._system
         copy._specification = self._specification
+        copy._last_sample = None
+        copy._last_simulated_sample = None
         return copy
     
     def get_baseline_sample(self, parameters=None, array=False):
@@ -184,7 +203,7 @@ class State:
                     df.to_excel(writer, sheet_name=shape)
         return tables_by_shape    
     
-    def parameter(self, setter=None, element=None, kind='isolated', name=None, 
+    def parameter(self, setter=None, element=None, kind=None, name=None, 
                   distribution=None, units=None, baseline=None, bounds=None, 
                   hook=None, description=None, scale=None):
         """
@@ -200,6 +219,10 @@ class State:
             * 'coupled': parameter is coupled to the system.
             * 'isolated': parameter does not affect the system but does affect the element (if any).
             * 'design': parameter only affects design and/or cost of the element.
+            
+            If not given, the parameter is treated as 'isolated', except that
+            changes always re-simulate the system when minimizing re-evaluation
+            (see :class:`~biosteam.evaluation.Model`).
         name : str, optional
                Name of parameter. If None, default to argument name of setter.
         distribution : chaospy.Dist
@@ -219,7 +242,8 @@ class State:
         -----
         If kind is 'coupled', account for downstream operations. Otherwise,
         only account for given element. If kind is 'design' or 'cost', 
-        element must be a Unit object.
+        element must be a Unit object and the parameter must not change mass
+        or energy balances (units are redesigned and recosted, but not rerun).
         
         """
         if not setter:
@@ -316,7 +340,7 @@ class State:
         
         """
         rule = rule.upper()
-        if rule in ('C', 'NC', 'K', 'R', 'RG', 'NG', 'L', 'S', 'H', 'M'):
+        if rule in joint_sample_rules:
             samples = self.get_joint_distribution().sample(N, rule).transpose()
         else:
             if rule == 'MORRIS':
@@ -333,10 +357,134 @@ class State:
             samples = sampler.sample(problem, N=N, **kwargs)
         return samples
     
+    def sample_nested(self, N_outer, N_inner, rule='L', inner_rule=None):
+        """
+        Return two-level (nested) samples from parameter distributions. 
+        Each sample of 'coupled' parameters and parameters without a 
+        declared kind (outer level) is repeated for `N_inner` samples of 
+        'isolated', 'design', and 'cost' parameters (inner level). When 
+        evaluated by a :class:`~biosteam.evaluation.Model` that minimizes 
+        re-evaluation, samples sharing values of outer parameters are 
+        evaluated consecutively and the system is only simulated `N_outer` 
+        times. Inner samples are still evaluated one at a time (i.e., 
+        'design' and 'cost' parameters redesign and recost their units and
+        metrics are computed for each sample).
+        
+        Parameters
+        ----------
+        N_outer : int
+            Number of samples of coupled parameters.
+        N_inner : int
+            Number of samples of all other parameters for each outer sample.
+        rule : str, optional
+            Sampling rule of outer samples. Defaults to 'L' (Latin hypercube).
+        inner_rule : str, optional
+            Sampling rule of inner samples. Defaults to `rule`. 
+        
+        Notes
+        -----
+        All inner samples (N_outer x N_inner) are drawn together so that 
+        the distributions of inner parameters are covered as in a 
+        single-level sample of the same size. Only sampling rules of joint 
+        distributions are supported (see :meth:`sample`).
+        
+        """
+        parameters = self._parameters
+        outer = [i for i, p in enumerate(parameters) if p.kind in ('coupled', None)]
+        inner = [i for i, p in enumerate(parameters) if p.kind not in ('coupled', None)]
+        N = N_outer * N_inner
+        samples = np.zeros([N, len(parameters)])
+        if outer:
+            samples[:, outer] = np.repeat(
+                joint_samples([parameters[i] for i in outer], N_outer, rule),
+                N_inner, axis=0
+            )
+        if inner:
+            samples[:, inner] = joint_samples(
+                [parameters[i] for i in inner], N, inner_rule or rule
+            )
+        return samples
+    
     def _update_state(self, sample, **kwargs):
+        sample = np.asarray(sample, dtype=float)
+        last = self._last_simulated_sample
+        self._last_sample = self._last_simulated_sample = None
         for f, s in zip(self._parameters, sample): 
             f.setter(s if f.scale is None else f.scale * s)
-        return self._specification() if self._specification else self._system.simulate(**kwargs)
+        system = self._system
+        if system and system._incremental: self._mark_dirty(system, sample, last)
+        outputs = self._specification() if self._specification else self._system.simulate(**kwargs)
+        self._last_simulated_sample = sample.copy()
+        return outputs
+    
+    def _reevaluated_units(self, sample):
+        # Return units to redesign and recost given the parameters that 
+        # changed since the last sample, None to rerun the whole system 
+        # design and costs, or False if the system must be simulated.
+        last = self._last_sample
+        system = self._system
+        if (last is None or self._specification or not system
+            or system.isdynamic or last.shape != sample.shape): return False
+        units = set()
+        for p, new, old in zip(self._parameters, sample, last):
+            if new == old: continue
+            kind = p.kind
+            if kind == 'isolated': continue # Only if explicitly declared
+            elif kind in ('design', 'cost'):
+                unit = p.unit
+                if unit is None: 
+                    units = None
+                elif units is not None:
+                    units.add(unit)
+            else:
+                return False
+        return units
+    
+    def _reevaluate_state(self, sample, **kwargs):
+        """
+        Update state given sample of parameters, re-evaluating only what 
+        is affected by parameters that changed since the last sample. If 
+        only 'design' or 'cost' parameters changed, the recycle loops are not 
+        converged and only the associated units (and facilities) are 
+        redesigned and recosted (without rerunning mass and energy balances). 
+        If only 'isolated' parameters changed, the system is not re-evaluated 
+        at all. Parameters without a declared kind always re-simulate the 
+        system.
+        
+        """
+        sample = np.asarray(sample, dtype=float)
+        units = self._reevaluated_units(sample)
+        if units is False: 
+            outputs = self._update_state(sample, **kwargs)
+        else:
+            self._last_sample = None
+            for f, s in zip(self._parameters, sample): 
+                f.setter(s if f.scale is None else f.scale * s)
+            if units is None or units:
+                system = self._system
+                if units is None: units = system.units
+                for i in units: i._setup()
+                system._summary(set(units))
+                if system._facility_loop: system._facility_loop.converge()
+            outputs = None
+        self._last_sample = sample.copy()
+        return outputs
+    
+    def _mark_dirty(self, system, sample, last):
+        # Setters may change attributes that are not tracked by the system;
+        # only elements of parameters that changed since the last sample are dirty
+        if last is None or last.shape != sample.shape:
+            parameters = self._parameters
+        else:
+            parameters = [p for p, new, old in zip(self._parameters, sample, last) if new != old]
+        for i in parameters:
+            if i.kind == 'isolated': continue
+            element = i.element
+            if isinstance(element, (Unit, Stream)):
+                system.mark_dirty(element)
+            else:
+                system.mark_dirty()
+                break
     
     def __call__(self, sample, **kwargs):
         """Update state given sample of parameters."""
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+from ._utils import var_columns
+
+__all__ = ('StreamingStatistics',)
+
+class StreamingStatistics:
+    """
+    Create a StreamingStatistics object that summarizes parameter samples
+    and metric values as they are evaluated (one sample or one chunk of
+    samples at a time) without storing all of them. Statistics are
+    available at any point of the evaluation:
+
+    * Count, mean, standard deviation, minimum and maximum of metrics
+      (exact, updated with Chan's parallel algorithm).
+    * Pearson's correlation between parameters and metrics (exact, from
+      running co-moments).
+    * Quantiles and rank (Spearman's and Kendall's) correlations estimated
+      from a uniform random sample (reservoir) of all evaluations.
+    * Histograms of metrics with a fixed number of bins that widen as
+      needed and kernel density estimates based on these bins.
+
+    Parameters
+    ----------
+    parameters : Iterable[Parameter]
+        Parameters of samples.
+    metrics : Iterable[Metric]
+        Metrics evaluated.
+    reservoir_size : int, optional
+        Number of evaluations kept to estimate quantiles and rank
+        correlations. Defaults to 10000.
+    bins : int, optional
+        Number of histogram bins of each metric. Must be even. Defaults to 100.
+    seed : int, optional
+        Seed of random number generator for reservoir sampling.
+
+    Notes
+    -----
+    Evaluations with nonfinite metric values (e.g., failed evaluations) are
+    only counted in `failed` and are not included in statistics.
+
+    Pass a StreamingStatistics object as the `statistics` of
+    :meth:`Model.evaluate <biosteam.evaluation.Model.evaluate>` to
+    update statistics as samples are evaluated (and `store_values=False` to
+    discard metric values after updating statistics).
+
+    """
+    __slots__ = (
+        'parameters', # tuple[Parameter] Parameters of samples.
+        'metrics', # tuple[Metric] Metrics evaluated.
+        'reservoir_size', # [int] Maximum number of evaluations in reservoir.
+        'bins', # [int] Number of histogram bins by metric.
+        'count', # [int] Number of evaluations with finite metric values.
+        'failed', # [int] Number of evaluations with nonfinite metric values.
+        '_mean', # [1d array] Mean of parameters and metrics.
+        '_comoment', # [2d array] Sum of products of deviations from the mean.
+        '_min', # [1d array] Minimum metric values.
+        '_max', # [1d array] Maximum metric values.
+        '_reservoir', # [2d array] Random sample of parameters and metric values.
+        '_rng', # [Generator] Random number generator for reservoir sampling.
+        '_lower', # [1d array] Lower edge of histograms.
+        '_width', # [1d array] Bin width of histograms.
+        '_counts', # [2d array] Histogram counts (one row per metric).
+    )
+
+    def __init__(self, parameters, metrics, reservoir_size=10000, bins=100, seed=None):
+        self.parameters = tuple(parameters)
+        self.metrics = tuple(metrics)
+        if bins % 2: raise ValueError('number of bins must be even')
+        self.reservoir_size = reservoir_size
+        self.bins = bins
+        self._rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self):
+        """Clear all statistics."""
+        N_parameters = len(self.parameters)
+        N_metrics = len(self.metrics)
+        N = N_parameters + N_metrics
+        self.count = 0
+        self.failed = 0
+        self._mean = np.zeros(N)
+        self._comoment = np.zeros([N, N])
+        self._min = np.full(N_metrics, np.inf)
+        self._max = np.full(N_metrics, -np.inf)
+        self._reservoir = np.zeros([0, N])
+        self._lower = np.full(N_metrics, np.nan)
+        self._width = np.zeros(N_metrics)
+        self._counts = np.zeros([N_metrics, self.bins])
+
+    def update(self, samples, values):
+        """
+        Update statistics with parameter samples and metric values (either
+        a single evaluation or 2d arrays with one row per evaluation).
+
+        """
+        samples = np.array(samples, dtype=float, ndmin=2)
+        values = np.array(values, dtype=float, ndmin=2)
+        finite = np.isfinite(values).all(axis=1)
+        self.failed += int((~finite).sum())
+        if not finite.any(): return
+        values = values[finite]
+        data = np.hstack([samples[finite], values])
+        self._update_moments(data)
+        self._update_reservoir(data)
+        self._update_histograms(values)
+        self.count += data.shape[0]
+
+    def _update_moments(self, data):
+        n = data.shape[0]
+        mean = data.mean(axis=0)
+        deviations = data - mean
+        comoment = deviations.transpose() @ deviations
+        count = self.count
+        total = count + n
+        delta = mean - self._mean
+        self._mean += delta * (n / total)
+        self._comoment += comoment + np.outer(delta, delta) * (count * n / total)
+        self._min = np.minimum(self._min, data[:, len(self.parameters):].min(axis=0))
+        self._max = np.maximum(self._max, data[:, len(self.parameters):].max(axis=0))
+
+    def _update_reservoir(self, data):
+        # Vectorized reservoir sampling (algorithm R)
+        reservoir = self._reservoir
+        size = self.reservoir_size
+        free = min(size - reservoir.shape[0], data.shape[0])
+        if free > 0:
+            self._reservoir = reservoir = np.vstack([reservoir, data[:free]])
+            data = data[free:]
+        if not data.size: return
+        seen = self.count + free + np.arange(data.shape[0])
+        index = (self._rng.random(data.shape[0]) * (seen + 1)).astype(int)
+        replaced = index < size
+        reservoir[index[replaced]] = data[replaced] # Later evaluations take precedence
+
+    def _update_histograms(self, values):
+        bins = self.bins
+        lower = self._lower
+        width = self._width
+        counts = self._counts
+        for j, x in enumerate(values.transpose()):
+            xmin = x.min()
+            xmax = x.max()
+            if np.isnan(lower[j]):
+                lower[j] = xmin
+                width[j] = (xmax - xmin) / (bins - 1) or max(abs(xmin) * 1e-9, 1e-12)
+            while xmin < lower[j] or xmax >= lower[j] + bins * width[j]:
+                # Double bin width by merging neighboring bins
+                if xmin < lower[j]:
+                    lower[j] -= bins * width[j]
+                    merged = np.concatenate([np.zeros(bins), counts[j]])
+                else:
+                    merged = np.concatenate([counts[j], np.zeros(bins)])
+                counts[j] = merged.reshape([bins, 2]).sum(axis=1)
+                width[j] *= 2.
+            index = np.minimum(((x - lower[j]) / width[j]).astype(int), bins - 1)
+            counts[j] += np.bincount(index, minlength=bins)
+
+    def _metric_data(self, data):
+        return data[len(self.parameters):]
+
+    def mean(self):
+        """Return a pandas Series of mean metric values."""
+        return pd.Series(self._metric_data(self._mean), index=var_columns(self.metrics))
+
+    def std(self, ddof=1):
+        """Return a pandas Series of the standard deviation of metric values."""
+        variance = self._metric_data(self._comoment.diagonal()) / max(self.count - ddof, 1)
+        return pd.Series(np.sqrt(variance), index=var_columns(self.metrics))
+
+    def quantiles(self, q=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """
+        Return a DataFrame of metric quantiles (estimated from the reservoir).
+
+        """
+        q = np.asarray(q, dtype=float)
+        values = self._reservoir[:, len(self.parameters):]
+        if values.size:
+            data = np.quantile(values, q, axis=0).transpose()
+        else:
+            data = np.full([len(self.metrics), q.size], np.nan)
+        return pd.DataFrame(data, index=var_columns(self.metrics),
+                            columns=[f'{i:.0%}' for i in q])
+
+    def summary(self):
+        """
+        Return a DataFrame of the count, mean, standard deviation,
+        minimum, quartiles, and maximum of metric values.
+
+        """
+        index = var_columns(self.metrics)
+        quantiles = self.quantiles((0.25, 0.5, 0.75))
+        return pd.DataFrame({
+            'count': np.full(len(self.metrics), self.count),
+            'mean': self.mean().values,
+            'std': self.std().values,
+            'min': self._min,
+            **{i: quantiles[i].values for i in quantiles},
+            'max': self._max,
+        }, index=index)
+
+    def _correlation_frames(self, r, p):
+        N_parameters = len(self.parameters)
+        index = var_columns(self.parameters)
+        columns = var_columns(self.metrics)
+        return [pd.DataFrame(i[:N_parameters, N_parameters:], index=index, columns=columns)
+                for i in (r, p)]
+
+    def _r_and_p(self, comoment, n):
+        std = np.sqrt(comoment.diagonal())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.clip(comoment / np.outer(std, std), -1., 1.)
+            t = r * np.sqrt((n - 2) / (1. - r * r))
+        p = 2. * stats.t.sf(np.abs(t), n - 2) if n > 2 else np.full(r.shape, np.nan)
+        return r, p
+
+    def pearson_r(self):
+        """
+        Return two DataFrame objects of Pearson's rho and p-values between
+        metrics and parameters (computed exactly over all evaluations).
+
+        """
+        return self._correlation_frames(*self._r_and_p(self._comoment, self.count))
+
+    def spearman_r(self):
+        """
+        Return two DataFrame objects of Spearman's rho and p-values between
+        metrics and parameters (estimated from the reservoir).
+
+        """
+        ranks = stats.rankdata(self._reservoir, axis=0)
+        deviations = ranks - ranks.mean(axis=0)
+        comoment = deviations.transpose() @ deviations
+        return self._correlation_frames(*self._r_and_p(comoment, ranks.shape[0]))
+
+    def kendall_tau(self):
+        """
+        Return two DataFrame objects of Kendall's tau and p-values between
+        metrics and parameters (estimated from the reservoir).
+
+        """
+        N_parameters = len(self.parameters)
+        N_metrics = len(self.metrics)
+        reservoir = self._reservoir
+        tau = np.zeros([N_parameters + N_metrics] * 2)
+        p = tau.copy()
+        for i in range(N_parameters):
+            x = reservoir[:, i]
+            for j in range(N_parameters, N_parameters + N_metrics):
+                tau[i, j], p[i, j] = stats.kendalltau(x, reservoir[:, j])
+        return self._correlation_frames(tau, p)
+
+    def histogram(self, metric):
+        """Return histogram counts and bin edges of a metric."""
+        j = self.metrics.index(metric)
+        bins = self.bins
+        edges = self._lower[j] + self._width[j] * np.arange(bins + 1)
+        return self._counts[j].copy(), edges
+
+    def kde(self, metric, points=None, bandwidth=None):
+        """
+        Return points and the kernel density estimate of a metric at these
+        points. The estimate is computed with a Gaussian kernel over
+        histogram bins.
+
+        Parameters
+        ----------
+        metric : Metric
+            Metric to estimate density.
+        points : 1d array, optional
+            Points to evaluate density. Defaults to histogram bin centers.
+        bandwidth : float, optional
+            Kernel bandwidth. Defaults to Scott's rule (but no less than
+            the bin width).
+
+        """
+        counts, edges = self.histogram(metric)
+        centers = 0.5 * (edges[1:] + edges[:-1])
+        if points is None: points = centers
+        points = np.asarray(points, dtype=float)
+        count = counts.sum()
+        if bandwidth is None:
+            std = self.std().values[self.metrics.index(metric)]
+            bandwidth = max(1.06 * std * count ** -0.2, edges[1] - edges[0])
+        z = (points[:, None] - centers) / bandwidth
+        density = np.exp(-0.5 * z * z) @ counts / (count * bandwidth * np.sqrt(2 * np.pi))
+        return points, density
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+"""
+import numpy as np
+import pandas as pd
+from numpy.polynomial.legendre import legvander
+from scipy.linalg import svd
+from ._utils import var_indices, var_columns
+from ._state import joint_samples
+
+__all__ = ('Surrogate',)
+
+# %% Polynomial chaos expansions
+
+def total_degree_exponents(N_parameters, degree):
+    """
+    Return exponents (rows) of all multivariate polynomials with total
+    degree lower or equal to the given degree (sorted by degree).
+
+    """
+    exponents = [()]
+    for n in range(N_parameters):
+        exponents = [(*i, j) for i in exponents for j in range(degree + 1 - sum(i))]
+    exponents = np.array(exponents, dtype=int).reshape([-1, N_parameters])
+    return exponents[np.argsort(exponents.sum(axis=1), kind='stable')]
+
+def legendre_design_matrix(x, exponents):
+    """
+    Return design matrix of orthonormal Legendre polynomials (with respect
+    to a uniform distribution) evaluated at normalized samples, `x`,
+    within [-1, 1].
+
+    """
+    degree = exponents.max(initial=0)
+    V = legvander(x, degree) * np.sqrt(2. * np.arange(degree + 1) + 1.)
+    X = np.ones([x.shape[0], exponents.shape[0]])
+    for j, i in enumerate(exponents.transpose()): X *= V[:, j, i]
+    return X
+
+def least_squares_fit(X, y):
+    """
+    Return coefficients, leave-one-out residuals, residual variance, and
+    the factor W of the (pseudo-inverse) covariance matrix, (X'X)^+ = WW',
+    of the linear least squares fit of y = Xb.
+
+    """
+    U, s, Vt = svd(X, full_matrices=False)
+    rank = (s > s[0] * max(X.shape) * np.finfo(float).eps).sum() if s.size else 0
+    U = U[:, :rank]; s = s[:rank]; Vt = Vt[:rank]
+    W = Vt.transpose() / s
+    coefficients = W @ (U.transpose() @ y)
+    residuals = y - X @ coefficients
+    leverage = (U * U).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        loo_residuals = residuals / (1. - leverage)[:, None]
+    loo_residuals[leverage > 1. - 1e-9] = np.inf
+    residual_variance = (residuals * residuals).sum(axis=0) / max(X.shape[0] - rank, 1)
+    return coefficients, loo_residuals, residual_variance, W
+
+def relative_loo_error(y, loo_residuals):
+    variance = ((y - y.mean(axis=0)) ** 2).sum(axis=0)
+    variance[variance == 0.] = 1.
+    return ((loo_residuals * loo_residuals).sum(axis=0) / variance).mean()
+
+# %% Surrogate model
+
+class Surrogate:
+    """
+    Create a Surrogate object that emulates metrics of a model with a
+    polynomial chaos expansion fitted to evaluated samples. Polynomials
+    are orthonormal Legendre polynomials of parameters normalized by
+    their bounds and coefficients are fitted by least squares. Once
+    fitted, millions of samples can be evaluated in seconds.
+
+    Parameters
+    ----------
+    model : Model
+        Model with evaluated samples (see :meth:`Model.evaluate <biosteam.evaluation.Model.evaluate>`).
+        Samples with nonfinite values are ignored.
+    parameters : Iterable[Parameter], optional
+        Parameters of surrogate. Defaults to all parameters of the model.
+    metrics : Iterable[Metric], optional
+        Metrics emulated. Defaults to all metrics of the model.
+    degree : int, optional
+        Total degree of polynomials. If not given, the degree with the
+        lowest leave-one-out cross-validation error is selected.
+    max_degree : int, optional
+        Maximum total degree of polynomials when selecting the degree.
+        Defaults to 4.
+
+    Notes
+    -----
+    Training data is copied from the model table. Samples evaluated to
+    refine the surrogate (see :meth:`refine`) are added to the training
+    data of the surrogate, but not to the model table.
+
+    """
+    __slots__ = (
+        'model', # [Model] Model emulated.
+        'parameters', # tuple[Parameter] Parameters of surrogate.
+        'metrics', # tuple[Metric] Metrics emulated.
+        'max_degree', # [int] Maximum total degree of polynomials when selecting the degree.
+        'degree', # [int] Total degree of polynomials.
+        'samples', # [array] Samples of parameters used to fit surrogate.
+        'values', # [array] Metric values used to fit surrogate.
+        '_fixed_degree', # [int|None] Degree given by the user.
+        '_lower', # [array] Lower bounds of parameters.
+        '_upper', # [array] Upper bounds of parameters.
+        '_exponents', # [array] Exponents of polynomials.
+        '_coefficients', # [array] Coefficients of polynomials (one column per metric).
+        '_loo_residuals', # [array] Leave-one-out cross-validation residuals.
+        '_residual_variance', # [array] Variance of residuals by metric.
+        '_covariance_factor', # [array] Factor W of the covariance matrix, (X'X)^+ = WW'.
+    )
+
+    #: Maximum number of samples evaluated at once (limits memory usage).
+    chunksize = 100_000
+
+    def __init__(self, model, parameters=None, metrics=None, degree=None, max_degree=4):
+        self.model = model
+        self.parameters = parameters = tuple(parameters or model.parameters)
+        self.metrics = metrics = tuple(metrics or model.metrics)
+        self.max_degree = max_degree
+        table = model.table
+        if table is None: raise RuntimeError('model must be evaluated before fitting surrogate')
+        samples = table[var_indices(parameters)].values.astype(float)
+        values = table[var_indices(metrics)].values.astype(float)
+        finite = np.isfinite(samples).all(axis=1) & np.isfinite(values).all(axis=1)
+        self.samples = samples = samples[finite]
+        self.values = values[finite]
+        if not samples.size: raise RuntimeError('no evaluated samples to fit surrogate')
+        lower = samples.min(axis=0)
+        upper = samples.max(axis=0)
+        for i, p in enumerate(parameters):
+            if p.bounds and p.hook is None:
+                lb, ub = p.bounds
+                lower[i] = min(lb, lower[i])
+                upper[i] = max(ub, upper[i])
+        self._lower = lower
+        self._upper = upper
+        self._fixed_degree = degree
+        self.fit()
+
+    def _normalize(self, samples):
+        lower = self._lower
+        scale = self._upper - lower
+        scale[scale == 0.] = 1.
+        return 2. * (samples - lower) / scale - 1.
+
+    def _design_matrix(self, samples):
+        return legendre_design_matrix(self._normalize(samples), self._exponents)
+
+    def fit(self):
+        """Fit polynomial chaos expansion to training data."""
+        samples = self.samples
+        values = self.values
+        N_samples, N_parameters = samples.shape
+        x = self._normalize(samples)
+        if self._fixed_degree is None:
+            degrees = range(1, self.max_degree + 1)
+        else:
+            degrees = [self._fixed_degree]
+        best = None
+        for degree in degrees:
+            exponents = total_degree_exponents(N_parameters, degree)
+            if best is not None and exponents.shape[0] >= N_samples: break
+            results = least_squares_fit(legendre_design_matrix(x, exponents), values)
+            error = relative_loo_error(values, results[1])
+            if best is None or error < best[0]: best = (error, degree, exponents, results)
+        (_, self.degree, self._exponents,
+         (self._coefficients, self._loo_residuals,
+          self._residual_variance, self._covariance_factor)) = best
+
+    def predict(self, samples, std=False):
+        """
+        Return metric values (one column per metric) predicted by the
+        surrogate at the given samples (one row per sample). Optionally,
+        also return the standard error of predicted values.
+
+        """
+        samples = np.asarray(samples, dtype=float)
+        if samples.ndim == 1: samples = samples[None, :]
+        N_samples = samples.shape[0]
+        values = np.zeros([N_samples, len(self.metrics)])
+        if std: errors = values.copy()
+        chunksize = self.chunksize
+        for i in range(0, N_samples, chunksize):
+            index = slice(i, i + chunksize)
+            X = self._design_matrix(samples[index])
+            values[index] = X @ self._coefficients
+            if std:
+                Z = X @ self._covariance_factor
+                errors[index] = np.sqrt(np.outer((Z * Z).sum(axis=1), self._residual_variance))
+        return (values, errors) if std else values
+
+    def __call__(self, sample):
+        """Return pandas Series of metric values predicted at given sample."""
+        return pd.Series(self.predict(sample)[0], index=var_indices(self.metrics))
+
+    def cross_validation_error(self):
+        """
+        Return a DataFrame of the root mean squared error (RMSE) and the
+        coefficient of determination (R2) of leave-one-out cross-validation
+        predictions by metric.
+
+        """
+        values = self.values
+        residuals = self._loo_residuals
+        sse = (residuals * residuals).sum(axis=0)
+        sst = ((values - values.mean(axis=0)) ** 2).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            R2 = 1. - sse / sst
+        return pd.DataFrame(
+            {'RMSE': np.sqrt(sse / values.shape[0]), 'R2': R2},
+            index=var_columns(self.metrics),
+        )
+
+    def sample(self, N, rule='R'):
+        """Return N samples from the distributions of surrogate parameters."""
+        samples = joint_samples(self.parameters, N, rule)
+        return self.model._sample_hook(samples, self.parameters)
+
+    def sobol_indices(self, N=8192):
+        """
+        Return two DataFrame objects of first and total order Sobol indices
+        of metrics (columns) with respect to parameters (rows) estimated by
+        Monte Carlo integration over the surrogate.
+
+        Parameters
+        ----------
+        N : int, optional
+            Number of base samples. Metrics are predicted at N x (2 +
+            number of parameters) samples. Defaults to 8192.
+
+        Notes
+        -----
+        Indices are estimated with Saltelli's (first order) and Jansen's
+        (total order) estimators over independent samples of the
+        distributions of parameters.
+
+        """
+        A = self.sample(N)
+        B = self.sample(N)
+        fA = self.predict(A)
+        fB = self.predict(B)
+        variance = np.concatenate([fA, fB]).var(axis=0)
+        variance[variance == 0.] = np.nan
+        N_parameters = len(self.parameters)
+        first = np.zeros([N_parameters, len(self.metrics)])
+        total = first.copy()
+        for i in range(N_parameters):
+            ABi = A.copy()
+            ABi[:, i] = B[:, i]
+            fABi = self.predict(ABi)
+            first[i] = (fB * (fABi - fA)).mean(axis=0) / variance
+            total[i] = 0.5 * ((fA - fABi) ** 2).mean(axis=0) / variance
+        index = var_columns(self.parameters)
+        columns = var_columns(self.metrics)
+        return (pd.DataFrame(first, index=index, columns=columns),
+                pd.DataFrame(total, index=index, columns=columns))
+
+    def optimize(self, metric, maximize=False, N=10000):
+        """
+        Return the sample (as a pandas Series) and the value of the
+        surrogate metric at its minimum (or maximum) within parameter
+        bounds. The best of N random samples is refined with a bounded
+        quasi-Newton method.
+
+        """
+        from scipy.optimize import minimize
+        index = self.metrics.index(metric)
+        sign = -1. if maximize else 1.
+        samples = self.sample(N)
+        values = self.predict(samples)[:, index]
+        x0 = samples[np.argmin(sign * values)]
+        objective = lambda x: sign * self.predict(x)[0, index]
+        result = minimize(objective, x0, method='L-BFGS-B',
+                          bounds=list(zip(self._lower, self._upper)))
+        x = result.x if result.fun <= objective(x0) else x0
+        return pd.Series(x, index=var_indices(self.parameters)), sign * objective(x)
+
+    def _select(self, candidates, N):
+        # Greedily select candidates with the highest prediction variance
+        # (D-optimal design); the variance is updated after each selection
+        Phi = self._design_matrix(candidates)
+        W = self._covariance_factor
+        C = W @ W.transpose()
+        Z = Phi @ C
+        leverage = (Z * Phi).sum(axis=1)
+        selected = []
+        for n in range(min(N, len(candidates))):
+            i = int(np.argmax(leverage))
+            selected.append(i)
+            u = Z[i].copy()
+            d = 1. + leverage[i]
+            Phi_u = Phi @ u
+            leverage -= Phi_u * Phi_u / d
+            Z -= np.outer(Phi_u, u / d)
+            leverage[selected] = -np.inf
+        return candidates[selected]
+
+    def refine(self, N_iterations=1, N_samples=10, N_candidates=1000):
+        """
+        Adaptively refine the surrogate by simulating the model at samples
+        where the surrogate is most uncertain. At each iteration, N
+        samples with the highest prediction variance are selected among
+        random candidate samples, evaluated by the model, and added to
+        the training data before refitting.
+
+        Parameters
+        ----------
+        N_iterations : int, optional
+            Number of refinement iterations. Defaults to 1.
+        N_samples : int, optional
+            Number of samples simulated by iteration. Defaults to 10.
+        N_candidates : int, optional
+            Number of candidate samples by iteration. Defaults to 1000.
+
+        Notes
+        -----
+        Parameters of the model which are not parameters of the surrogate
+        are simulated at their baseline values.
+
+        """
+        model = self.model
+        all_parameters = list(model.parameters)
+        columns = [all_parameters.index(i) for i in self.parameters]
+        all_metrics = list(model.metrics)
+        metric_columns = [all_metrics.index(i) for i in self.metrics]
+        baseline = model.get_baseline_sample(array=True).astype(float)
+        model._last_sample = None
+        try:
+            for n in range(N_iterations):
+                samples = self._select(self.sample(N_candidates), N_samples)
+                full_samples = np.tile(baseline, [len(samples), 1])
+                full_samples[:, columns] = samples
+                values = np.array(
+                    [model._evaluate_sample(i) for i in full_samples], dtype=float
+                )[:, metric_columns]
+                finite = np.isfinite(values).all(axis=1)
+                self.samples = np.vstack([self.samples, samples[finite]])
+                self.values = np.vstack([self.values, values[finite]])
+                self._lower = np.minimum(self._lower, self.samples.min(axis=0))
+                self._upper = np.maximum(self._upper, self.samples.max(axis=0))
+                self.fit()
+        finally:
+            model._last_sample = None
+
+    def __repr__(self):
+        return (f'<{type(self).__name__}: {len(self.parameters)} parameters, '
+                f'{len(self.metrics)} metrics, degree {self.degree}>')
@@ -10,17 +10,23 @@
 import numpy as np
 import multiprocessing as mp
 import pandas as pd
+from .._parallel import map_tasks
 
 __all__ = ('evaluate_coordinate_in_parallel',)
 
 def evaluate_coordinate_in_parallel(f_evaluate_at_coordinate, coordinate,
                                     metrics, multi_coordinate=False,
-                                    name=None, names=None, xlfile=None): # pragma: no cover
-    # In parallel
-    pool = mp.Pool(mp.cpu_count())
-    map = pool.starmap if multi_coordinate else pool.map
-    tables = map(f_evaluate_at_coordinate, coordinate)
-    pool.close()
+                                    name=None, names=None, xlfile=None,
+                                    processes=None):
+    # In parallel (each coordinate point in a freshly forked process)
+    if multi_coordinate:
+        f = lambda x: f_evaluate_at_coordinate(*x)
+    else:
+        f = f_evaluate_at_coordinate
+    tables = []
+    for table, exception in map_tasks(f, coordinate, processes or mp.cpu_count()):
+        if exception is not None: raise exception
+        tables.append(table)
     
     # Initialize data containers
     table = tables[0]
@@ -911,7 +911,132 @@ def compute_stages_McCabeThiele(P, operating_line,
         if xi > x_limit:
             xi = x_limit
         x_stages.append(xi)
+
+@njit(cache=True)
+def compute_stages_McCabeThiele_tabulated(x_stages, y_stages, T_stages, N,
+                                          m, b, x_limit, x_eq, alpha_eq, T_eq):
+    """
+    Use the McCabe-Thiele method to find the specifications at every stage of
+    a linear operating line, x = (y - b) / m, before the maximum liquid molar 
+    fraction, `x_limit`. Equilibrium is interpolated from a tabulated 
+    relative volatility and bubble point curve. Stages are written to 
+    preallocated arrays starting after the `N`-th element and the new number 
+    of elements is returned.
+    
+    """
+    i = 0
+    xi = x_stages[N]
+    while xi < x_limit:
+        if i > 100:
+            raise RuntimeError('cannot meet specifications! stages > 100')
+        i += 1
+        # Go Up
+        alpha = np.interp(xi, x_eq, alpha_eq)
+        yi = alpha * xi / (1. + (alpha - 1.) * xi)
+        T_stages[N] = np.interp(xi, x_eq, T_eq)
+        N += 1
+        y_stages[N] = yi
+        # Go Right
+        xi = (yi - b) / m
+        if xi > x_limit:
+            xi = x_limit
+        x_stages[N] = xi
+    return N
+
+
+class EquilibriumCurve:
+    """
+    Create an EquilibriumCurve object that tabulates the light key relative 
+    volatility and bubble point temperature of a binary mixture over the whole
+    composition range at constant pressure. Composition nodes are bisected 
+    until relative volatilities and temperatures are linear between nodes 
+    (within a tolerance), so that the vapor composition and bubble point at 
+    any liquid composition can be interpolated without solving VLE.
     
+    Parameters
+    ----------
+    solve_Ty : function
+        Should return T and y given x and P.
+    P : float
+        Pressure [Pa].
+    rtol : float, optional
+        Relative tolerance of interpolated relative volatilities. Defaults
+        to 1e-4.
+    T_tol : float, optional
+        Tolerance of interpolated bubble point temperatures [K]. Defaults 
+        to 1e-2.
+    dx_min : float, optional
+        Minimum composition interval between nodes. Defaults to 1e-4.
+    N_initial : int, optional
+        Number of evenly spaced nodes before bisection. Defaults to 11.
+        
+    Notes
+    -----
+    Relative volatilities are tabulated instead of vapor compositions because
+    they vary smoothly up to infinite dilution, so that interpolated vapor
+    compositions remain accurate near pure components. Relative volatilities
+    are computed from the vapor molar fractions of both keys (not from one 
+    minus the light key vapor fraction, which may round to zero) and are 
+    limited to `alpha_max` (e.g., for nonvolatile heavy keys).
+    
+    """
+    __slots__ = (
+        'x', # [1d array] Light key liquid molar fraction nodes in ascending order.
+        'alpha', # [1d array] Light key relative volatilities at nodes.
+        'T', # [1d array] Bubble point temperatures at nodes [K].
+    )
+    
+    #: [float] Liquid molar fraction of end nodes (and their distance to pure components).
+    x_end = 1e-6
+    
+    #: [float] Maximum relative volatility.
+    alpha_max = 1e16
+    
+    def __init__(self, solve_Ty, P, rtol=1e-4, T_tol=1e-2, dx_min=1e-4, N_initial=11):
+        x_end = self.x_end
+        alpha_max = self.alpha_max
+        def node(x):
+            T, y = solve_Ty(np.array([x, 1. - x]), P)
+            y_LK, y_HK = y
+            LK_volatility = y_LK * (1. - x)
+            HK_volatility = x * y_HK
+            if LK_volatility < alpha_max * HK_volatility:
+                alpha = LK_volatility / HK_volatility
+            else:
+                alpha = alpha_max
+            return T, alpha
+        xs = np.linspace(0., 1., N_initial)
+        xs[0] = x_end
+        xs[-1] = 1. - x_end
+        nodes = {x: node(x) for x in xs}
+        intervals = list(zip(xs[:-1], xs[1:]))
+        while intervals:
+            x1, x2 = intervals.pop()
+            if x2 - x1 < 2. * dx_min: continue
+            x = 0.5 * (x1 + x2)
+            nodes[x] = T, alpha = node(x)
+            T1, alpha1 = nodes[x1]
+            T2, alpha2 = nodes[x2]
+            if (abs(alpha - 0.5 * (alpha1 + alpha2)) > rtol * alpha
+                or abs(T - 0.5 * (T1 + T2)) > T_tol):
+                intervals.append((x1, x))
+                intervals.append((x, x2))
+        self.x = x = np.array(sorted(nodes))
+        self.T = np.array([nodes[i][0] for i in x])
+        self.alpha = np.array([nodes[i][1] for i in x])
+    
+    def y(self, x):
+        """Return light key vapor molar fraction(s) at given liquid molar fraction(s)."""
+        alpha = np.interp(x, self.x, self.alpha)
+        return alpha * x / (1. + (alpha - 1.) * x)
+    
+    def bubble_point(self, x):
+        """Return bubble point temperature(s) [K] at given liquid molar fraction(s)."""
+        return np.interp(x, self.x, self.T)
+    
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.x.size} nodes>"
+
 
 # %% McCabe-Thiele distillation column unit operation
 
@@ -1060,10 +1185,32 @@ class BinaryDistillation(Distillation, new_graphics=False):
     """
     _cache_tolerance = np.array([50., 1e-5, 1e-6, 1e-6, 1e-2, 1e-6], float)
     
+    #: dict[tuple, EquilibriumCurve] Equilibrium curves by light and heavy 
+    #: keys, thermodynamic property packages, and pressure (shared by all 
+    #: binary distillation columns).
+    _equilibrium_curves = {}
+    
     def _run(self):
         self._run_binary_distillation_mass_balance()
         self._update_distillate_and_bottoms_temperature()
 
+    def get_equilibrium_curve(self):
+        """
+        Return the tabulated equilibrium curve of the light and heavy keys at 
+        the operating pressure. Curves are built once and reused across 
+        simulations (and columns) with the same keys, thermodynamic property 
+        package, and pressure.
+        
+        """
+        bp = self.outs[1].get_bubble_point(self._LHK)
+        P = self.P
+        key = (bp.chemicals, bp.gamma, bp.phi, bp.pcf, P)
+        curves = self._equilibrium_curves
+        if key in curves: return curves[key]
+        curves[key] = curve = EquilibriumCurve(bp.solve_Ty, P)
+        if len(curves) > 100: curves.pop(curves.__iter__().__next__())
+        return curve
+
     def reset_cache(self, isdynamic=None):
         if not hasattr(self, '_McCabeThiele_args'):
             self._McCabeThiele_args = np.zeros(6)
@@ -1103,8 +1250,8 @@ class BinaryDistillation(Distillation, new_graphics=False):
         q_line = lambda x: q*x/(q-1) - zf/(q-1)
         self._q_line_args = dict(q=q, zf=zf)
         
-        solve_Ty = bottoms.get_bubble_point(LHK).solve_Ty
-        Rmin_intersection = lambda x: q_line(x) - solve_Ty(np.array((x, 1-x)), P)[1][0]
+        curve = self.get_equilibrium_curve()
+        Rmin_intersection = lambda x: q_line(x) - curve.y(x)
         x_Rmin = brentq(Rmin_intersection, 0, 1)
         y_Rmin = q_line(x_Rmin)
         m = (y_Rmin-y_top)/(x_Rmin-y_top)
@@ -1125,24 +1272,30 @@ class BinaryDistillation(Distillation, new_graphics=False):
         # Stripping section: Intersects Rectifying section and q_line and beggins at bottoms liquid composition
         m2 = (x_bot-y_m)/(x_bot-x_m)
         b2 = y_m-m2*x_m
-        ss = lambda y: (y-b2)/m2 # -> x        
         
         # Data for staircase
-        self._x_stages = x_stages = [x_bot]
-        self._y_stages = y_stages = [x_bot]
-        self._T_stages = T_stages = []
-        compute_stages_McCabeThiele(P, ss, x_stages, y_stages, T_stages, x_m, solve_Ty)
-        yi = y_stages[-1]
-        xi = rs(yi)
-        x_stages[-1] = xi if xi < 1 else 0.99999
-        compute_stages_McCabeThiele(P, rs, x_stages, y_stages, T_stages, y_top, solve_Ty)
+        size = 204 # Enough for 101 stages in each section
+        x_stages = np.zeros(size)
+        y_stages = np.zeros(size)
+        T_stages = np.zeros(size)
+        x_stages[0] = y_stages[0] = x_bot
+        args = (curve.x, curve.alpha, curve.T)
+        N = compute_stages_McCabeThiele_tabulated(
+            x_stages, y_stages, T_stages, 0, m2, b2, x_m, *args
+        )
+        xi = rs(y_stages[N])
+        x_stages[N] = xi if xi < 1 else 0.99999
+        N = compute_stages_McCabeThiele_tabulated(
+            x_stages, y_stages, T_stages, N, m1, b1, y_top, *args
+        )
+        self._x_stages = x_stages = x_stages[:N+1]
+        self._y_stages = y_stages = y_stages[:N+1]
+        self._T_stages = T_stages[:N]
         
         # Find feed stage
-        N_stages = len(x_stages)
-        feed_stage = ceil(N_stages/2)
-        for i in range(len(y_stages)-1):
-            if y_stages[i] < y_m < y_stages[i+1]:
-                feed_stage = i+1
+        N_stages = N + 1
+        feed_stages, = np.where((y_stages[:-1] < y_m) & (y_m < y_stages[1:]))
+        feed_stage = int(feed_stages[-1]) + 1 if feed_stages.size else ceil(N_stages/2)
         
         # Results
         Design = self.design_results
@@ -1177,22 +1330,11 @@ class BinaryDistillation(Distillation, new_graphics=False):
             raise RuntimeError('cannot plot stages without running McCabe Thiele binary distillation')
         x_stages = self._x_stages
         y_stages = self._y_stages
-        LHK = self.LHK
         LK = self.LHK[0]
-        P = self.P
         
         # Equilibrium data
         x_eq = np.linspace(0, 1, 100)
-        y_eq = np.zeros(100)
-        T = np.zeros(100)
-        n = 0
-        
-        bp = vap.get_bubble_point(IDs=LHK)
-        solve_Ty = bp.solve_Ty
-        for xi in x_eq:
-            T[n], y = solve_Ty(np.array([xi, 1-xi]), P)
-            y_eq[n] = y[0]
-            n += 1
+        y_eq = self.get_equilibrium_curve().y(x_eq)
             
         # Set-up graph
         plt.figure()
@@ -1301,6 +1443,70 @@ def compute_minimum_theoretical_stages_Fenske(LHK_distillate, LHK_bottoms, alpha
 def objective_function_Underwood_constant(theta, q, z_f, alpha_mean):
     return (alpha_mean * z_f / (alpha_mean - theta)).sum() - 1.0 + q
 
+@njit(cache=True)
+def solve_Underwood_roots(q, z_f, alpha_mean, guess):
+    """
+    Return all roots of the Underwood equation that lie between the relative
+    volatilities of volatile components in the feed (in ascending order and 
+    padded with NaN up to one less than the number of components). Roots are bracketed 
+    by consecutive relative volatilities (the equation is strictly increasing 
+    between them) and solved by Newton's method safeguarded by bisection.
+    
+    Parameters
+    ----------
+    q : float
+        Feed quality.
+    z_f : 1d array
+        Feed molar composition.
+    alpha_mean : 1d array
+        Mean relative volatilities.
+    guess : 1d array
+        Initial guesses of roots (e.g., roots of a previous solution). Guesses
+        that are NaN or outside brackets are ignored.
+    
+    """
+    mask = (z_f > 0.) & (alpha_mean > 0.)
+    alpha = alpha_mean[mask]
+    z = z_f[mask]
+    poles = np.unique(alpha)
+    roots = np.full(alpha_mean.size - 1, np.nan)
+    for i in range(poles.size - 1):
+        lb = poles[i]
+        ub = poles[i + 1]
+        xtol = 1e-12 * (ub - lb)
+        theta = guess[i] if i < guess.size and lb < guess[i] < ub else 0.5 * (lb + ub)
+        for iter in range(100):
+            dummy = alpha * z / (alpha - theta)
+            f = dummy.sum() - 1.0 + q
+            if f > 0.: 
+                ub = theta
+            elif f < 0.:
+                lb = theta
+            else:
+                break
+            new = theta - f / (dummy / (alpha - theta)).sum()
+            if not lb < new < ub: new = 0.5 * (lb + ub)
+            if abs(new - theta) <= xtol: 
+                theta = new
+                break
+            theta = new
+        roots[i] = theta
+    return roots
+
+@njit(cache=True)
+def solve_Underwood_roots_batch(q, z_f, alpha_mean, guess):
+    """
+    Return all roots of the Underwood equation for many feeds (one row of 
+    roots for each feed quality in `q` and row of feed molar compositions in
+    `z_f`). Each feed is warm started with the roots of the previous one.
+    
+    """
+    N, M = z_f.shape
+    roots = np.zeros((N, M - 1))
+    for i in range(N):
+        roots[i] = guess = solve_Underwood_roots(q[i], z_f[i], alpha_mean, guess)
+    return roots
+
 @njit(cache=True)
 def compute_minimum_reflux_ratio_Underwood(alpha_mean, z_d, theta):
     Rm = (alpha_mean * z_d / (alpha_mean - theta)).sum() - 1.0
@@ -1520,6 +1726,7 @@ class ShortcutColumn(Distillation, new_graphics=False):
         
     def reset_cache(self, isdynamic=None):
         self._vle_chemicals = None
+        self._Underwood_roots = None
 
     def plot_stages(self):
         raise TypeError('cannot plot stages for shortcut column')
@@ -1564,6 +1771,96 @@ class ShortcutColumn(Distillation, new_graphics=False):
         design['Theoretical stages'] = N
         design['Minimum reflux'] = Rm
         design['Reflux'] = R
+    
+    def batch_evaluate(self, z_f, q=None):
+        """
+        Return theoretical design results (as in `design_results`) at many 
+        feed compositions. The Fenske-Underwood-Gilliland method is evaluated
+        for all feeds at once at the current distillate recoveries and mean 
+        relative volatilities of the column (i.e., without solving 
+        vapor-liquid equilibrium for each feed), so the column must be 
+        simulated beforehand.
+        
+        Parameters
+        ----------
+        z_f : 2d array
+            Feed molar compositions (one row per feed) of chemicals in
+            vapor-liquid equilibrium (in the order of `mixed_feed.vle_chemicals`).
+        q : float|1d array, optional
+            Feed qualities. Defaults to the feed quality of the column.
+        
+        Returns
+        -------
+        dict[str, 1d array]
+            Theoretical feed stage, theoretical stages, minimum reflux, and 
+            reflux by feed.
+        
+        Examples
+        --------
+        >>> from biosteam.units import ShortcutColumn
+        >>> from biosteam import Stream, settings
+        >>> settings.set_thermo(['Water', 'Methanol', 'Glycerol'], cache=True)
+        >>> feed = Stream('feed', flow=(80, 100, 25))
+        >>> feed.T = feed.bubble_point_at_P().T
+        >>> D1 = ShortcutColumn('D1', ins=feed,
+        ...                     LHK=('Methanol', 'Water'),
+        ...                     y_top=0.99, x_bot=0.01, k=2)
+        >>> D1.simulate()
+        >>> results = D1.batch_evaluate([[80, 100, 25], [80, 80, 25], [80, 60, 25]])
+        >>> results['Theoretical stages']
+        array([16., 15., 15.])
+        
+        """
+        z_f = np.array(z_f, dtype=float, ndmin=2)
+        z_f /= z_f.sum(axis=1, keepdims=True)
+        N_feeds = z_f.shape[0]
+        if q is None: q = self.get_feed_quality()
+        q = np.ones(N_feeds) * q
+        distillate, bottoms = self.outs
+        IDs = self._IDs_vle
+        LK_index, HK_index = self._LHK_vle_index
+        alpha_mean = self._estimate_mean_volatilities_relative_to_heavy_key()
+        alpha_LK = alpha_mean[LK_index]
+        
+        # Distillate and bottoms product flows by unit flow of feed
+        distillate_mol = distillate.imol[IDs]
+        feed_mol = distillate_mol + bottoms.imol[IDs]
+        distillate_recoveries = np.divide(distillate_mol, feed_mol, 
+                                          out=np.zeros_like(feed_mol), 
+                                          where=feed_mol > 0.)
+        Ds = z_f * distillate_recoveries
+        Bs = z_f - Ds
+        D = Ds.sum(axis=1)
+        B = Bs.sum(axis=1)
+        
+        # Fenske-Underwood-Gilliland
+        LHK_index = [LK_index, HK_index]
+        Nm = compute_minimum_theoretical_stages_Fenske(Ds[:, LHK_index].transpose(),
+                                                       Bs[:, LHK_index].transpose(),
+                                                       alpha_LK)
+        guess = self._Underwood_roots
+        if guess is None or guess.size != alpha_mean.size - 1: 
+            guess = np.zeros(0)
+        roots = solve_Underwood_roots_batch(q, z_f, alpha_mean, guess)
+        between_keys = (roots > 1.) & (roots < alpha_LK)
+        theta = np.where(between_keys, roots, 0.).sum(axis=1)
+        for i in np.where(between_keys.sum(axis=1) != 1)[0]:
+            theta[i] = self._select_Underwood_constant(roots[i], q[i], z_f[i], alpha_mean, alpha_LK)
+        z_d = Ds / D[:, None]
+        Rm = (alpha_mean * z_d / (alpha_mean - theta[:, None])).sum(axis=1) - 1.0
+        Rm[Rm < self.Rmin] = self.Rmin
+        R = self.k * Rm
+        N = compute_theoretical_stages_Gilliland(Nm, Rm, R)
+        feed_stage = compute_feed_stage_Kirkbride(N, B, D, 
+                                                  z_f[:, LK_index] / z_f[:, HK_index],
+                                                  Bs[:, LK_index] / B,
+                                                  Ds[:, HK_index] / D)
+        return {
+            'Theoretical feed stage': N - feed_stage,
+            'Theoretical stages': N,
+            'Minimum reflux': Rm,
+            'Reflux': R,
+        }
         
     def _get_relative_volatilities_LHK(self):
         distillate, bottoms = self.outs
@@ -1582,6 +1879,16 @@ class ShortcutColumn(Distillation, new_graphics=False):
     def _solve_Underwood_constant(self, alpha_mean, alpha_LK):
         q = self.get_feed_quality()
         z_f = self.ins[0].get_normalized_mol(self._IDs_vle)
+        guess = self._Underwood_roots
+        if guess is None or guess.size != alpha_mean.size - 1: 
+            guess = np.zeros(0)
+        self._Underwood_roots = roots = solve_Underwood_roots(q, z_f, alpha_mean, guess)
+        return self._select_Underwood_constant(roots, q, z_f, alpha_mean, alpha_LK)
+    
+    def _select_Underwood_constant(self, roots, q, z_f, alpha_mean, alpha_LK):
+        roots = roots[(roots > 1.) & (roots < alpha_LK)]
+        if roots.size == 1: return roots[0]
+        # Non-keys with volatilities between keys; search for a root as before
         args = (q, z_f, alpha_mean)
         ub = np.inf
         lb = -np.inf
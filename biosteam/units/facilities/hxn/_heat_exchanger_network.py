@@ -13,7 +13,7 @@ from .. import Facility
 from ....utils import piping
 import biosteam as bst
 import numpy as np
-from .hxn_synthesis import synthesize_network, StreamLifeCycle
+from .hxn_synthesis import synthesize_network, StreamLifeCycle, LifeStage
 from warnings import warn
 
 __all__ = ('HeatExchangerNetwork',)
@@ -35,6 +35,21 @@ class HeatExchangerNetwork(Facility):
     units : Iterable[Unit], optional
         All unit operations available to the heat exchanger network. Defaults
         to all unit operations in the system.
+    cache_network : bool, optional
+        Whether to reuse the network from the last simulation when the same
+        heat exchangers require heating or cooling. Defaults to False.
+    incremental : bool, optional
+        Whether to update the cached network when heat utilities appear or
+        disappear (instead of synthesizing a new network). Only applies if
+        `cache_network` is True. Defaults to False.
+    T_tolerance : float, optional
+        Maximum change in inlet and outlet temperatures [K] of utility 
+        streams (since the network was synthesized) to reuse a cached network.
+        Defaults to no limit.
+    duty_tolerance : float, optional
+        Maximum relative change in duty of utility streams (since the
+        network was synthesized) to reuse a cached network. Defaults to
+        no limit.
     
     Notes
     -----
@@ -43,6 +58,15 @@ class HeatExchangerNetwork(Facility):
     '<sys>_HXN' where <sys> is the name of the system associated to the 
     HeatExchangerNetwork object.
     
+    When updating a cached network incrementally, process heat exchangers 
+    matched to streams that no longer require heating or cooling are 
+    removed (their partners' utility heat exchangers take up their duty) and 
+    new streams are heated or cooled by utility heat exchangers only. The 
+    match topology of all other streams is preserved. A new network is 
+    synthesized when a stream switches between heating and cooling, 
+    when temperatures or duties drift beyond the tolerances, or when the 
+    cached network fails to converge.
+    
     References
     ----------
     .. [1] Seider, W. D., Lewin,  D. R., Seader, J. D., Widagdo, S., Gani, R.,
@@ -121,7 +145,8 @@ class HeatExchangerNetwork(Facility):
     
     def __init__(self, ID='', T_min_app=5., units=None, ignored=None, Qmin=1e-3,
                  force_ideal_thermo=False, cache_network=False, avoid_recycle=False,
-                 acceptable_energy_balance_error=None):
+                 acceptable_energy_balance_error=None, incremental=False,
+                 T_tolerance=None, duty_tolerance=None):
         Facility.__init__(self, ID, None, None)
         self.T_min_app = T_min_app
         self.units = units
@@ -130,6 +155,9 @@ class HeatExchangerNetwork(Facility):
         self.force_ideal_thermo = force_ideal_thermo
         self.cache_network = cache_network
         self.avoid_recycle = avoid_recycle
+        self.incremental = incremental
+        self.T_tolerance = T_tolerance
+        self.duty_tolerance = duty_tolerance
         if acceptable_energy_balance_error is not None:
             self.acceptable_energy_balance_error = acceptable_energy_balance_error
         
@@ -156,15 +184,24 @@ class HeatExchangerNetwork(Facility):
     def _cost(self):
         sys = self.system
         hx_utils = self._get_original_heat_utilties()
-        flowsheet = bst.Flowsheet(sys.ID + '_HXN')
         use_cached_network = False
         if self.cache_network and hasattr(self, 'original_heat_utils'):
+            flowsheet = self.HXN_flowsheet
             hxs_cache = self.original_heat_exchangers
             hxs = [hu.unit for hu in hx_utils]
             hxs_dct = {(i.owner, i._ID): i for i in hxs}
-            try: hxs = [hxs_dct[i.owner, i._ID] for i in hxs_cache]
-            except: pass
-            else: use_cached_network = len(hxs) == len(hx_utils)
+            if self.incremental:
+                with flowsheet.temporary(), piping.IgnoreDockingWarnings():
+                    hxs = self._update_network(hxs_dct)
+                use_cached_network = hxs is not None
+            else:
+                try: hxs = [hxs_dct[i.owner, i._ID] for i in hxs_cache]
+                except: pass
+                else: use_cached_network = len(hxs) == len(hx_utils)
+            if use_cached_network:
+                use_cached_network = self._network_within_tolerance(hxs)
+        if not use_cached_network:
+            flowsheet = bst.Flowsheet(sys.ID + '_HXN')
         with flowsheet.temporary(), piping.IgnoreDockingWarnings():
             if use_cached_network:
                 hx_utils_rearranged = [i.heat_utilities[0] for i in hxs]
@@ -196,8 +233,8 @@ class HeatExchangerNetwork(Facility):
                             s_out.mol[:] = s_in.mol
             else:
                 hx_utils.sort(key = lambda x: x.duty)
-                self.HXN_flowsheet = HXN_F = bst.main_flowsheet
-                for i in HXN_F.registries: i.clear()
+                self.HXN_flowsheet = flowsheet
+                for i in flowsheet.registries: i.clear()
                 HXs_hot_side, HXs_cold_side, new_HX_utils, hxs, T_in_arr,\
                 T_out_arr, pinch_T_arr, C_flow_vector, hx_utils_rearranged, streams_inlet, stream_HXs_dict,\
                 hot_indices, cold_indices = \
@@ -214,6 +251,7 @@ class HeatExchangerNetwork(Facility):
                 self.pinch_Ts = pinch_T_arr
                 self.inlet_Ts = T_in_arr
                 self.outlet_Ts = T_out_arr
+                self.duties = np.array([hu.duty for hu in hx_utils_rearranged])
                 all_units = new_HXs + new_HX_utils
                 IDs = set([i.ID for i in all_units])
                 assert len(all_units) == len(IDs)
@@ -336,6 +374,105 @@ class HeatExchangerNetwork(Facility):
                 else:
                     warn(msg, RuntimeWarning, stacklevel=2)
     
+    def _network_within_tolerance(self, hxs):
+        T_tolerance = self.T_tolerance
+        duty_tolerance = self.duty_tolerance
+        for hx, life_cycle in zip(hxs, self.stream_life_cycles):
+            index = life_cycle.index
+            duty = hx.heat_utilities[0].duty
+            if (duty > 0) != life_cycle.cold: return False
+            if T_tolerance is not None and (
+                    abs(hx.ins[0].T - self.inlet_Ts[index]) > T_tolerance
+                    or abs(hx.outs[0].T - self.outlet_Ts[index]) > T_tolerance
+                ):
+                return False
+            if (duty_tolerance is not None 
+                and abs(duty - self.duties[index]) > duty_tolerance * abs(self.duties[index])):
+                return False
+        return True
+    
+    def _update_network(self, hxs_dct):
+        """
+        Update cached network by removing streams that no longer require
+        heating or cooling (along with their matches) and adding utility 
+        heat exchangers for new streams. Return original heat exchangers
+        (in the order of stream life cycles) or None if the network cannot 
+        be updated.
+        
+        """
+        stream_life_cycles = []
+        hxs = []
+        removed_units = set()
+        for hx, life_cycle in zip(self.original_heat_exchangers, self.stream_life_cycles):
+            key = (hx.owner, hx._ID)
+            if key in hxs_dct:
+                hxs.append(hxs_dct.pop(key))
+                stream_life_cycles.append(life_cycle)
+            else:
+                removed_units.update([i.unit for i in life_cycle.life_cycle])
+        if not stream_life_cycles: return None
+        if not (removed_units or hxs_dct): return hxs
+        stream_HXs_dict = self.stream_HXs_dict
+        for life_cycle in self.stream_life_cycles:
+            if life_cycle not in stream_life_cycles: 
+                del stream_HXs_dict[life_cycle.index]
+        for life_cycle in stream_life_cycles:
+            # Skip stages of removed units
+            stages = []
+            s_in = None
+            for stage in life_cycle.life_cycle:
+                if stage.unit in removed_units:
+                    if s_in is None: s_in = stage.s_in
+                    continue
+                if s_in is not None:
+                    stage.unit.ins[stage.index] = s_in
+                    s_in = None
+                stages.append(stage)
+            life_cycle.life_cycle = stages
+            index = life_cycle.index
+            stream_HXs_dict[index] = [i for i in stream_HXs_dict[index] if i not in removed_units]
+        new_HXs = [i for i in self.new_HXs if i not in removed_units]
+        new_HX_utils = [i for i in self.new_HX_utils if i not in removed_units]
+        inlet_Ts = [*self.inlet_Ts]
+        outlet_Ts = [*self.outlet_Ts]
+        pinch_Ts = [*self.pinch_Ts]
+        duties = [*self.duties]
+        for hx in hxs_dct.values():
+            index = len(inlet_Ts)
+            duty = hx.heat_utilities[0].duty
+            cold = duty > 0
+            ID = 'Util_%s_%s' % (index, 'hs' if cold else 'cs')
+            s_util = hx.ins[0]
+            thermo = s_util.thermo.ideal() if self.force_ideal_thermo else s_util.thermo
+            s_in = s_util.copy('s_%s__%s' % (index, ID), thermo=thermo)
+            s_out = s_in.copy('%s__s_%s' % (ID, index))
+            new_HX_util = bst.units.HXutility(
+                ID=ID, ins=s_in, outs=s_out, H=hx.outs[0].H, rigorous=True, thermo=thermo,
+            )
+            life_cycle = StreamLifeCycle(index, cold)
+            life_cycle.life_cycle = [LifeStage(new_HX_util, 0)]
+            stream_life_cycles.append(life_cycle)
+            hxs.append(hx)
+            new_HX_utils.append(new_HX_util)
+            stream_HXs_dict[index] = [new_HX_util]
+            self.streams_inlet.append(s_in)
+            if cold: self.cold_indices.append(index)
+            inlet_Ts.append(s_util.T)
+            outlet_Ts.append(hx.outs[0].T)
+            pinch_Ts.append(s_util.T)
+            duties.append(duty)
+        self.inlet_Ts = np.array(inlet_Ts)
+        self.outlet_Ts = np.array(outlet_Ts)
+        self.pinch_Ts = np.array(pinch_Ts)
+        self.duties = np.array(duties)
+        self.stream_life_cycles = stream_life_cycles
+        self.original_heat_exchangers = hxs
+        self.new_HXs = new_HXs
+        self.new_HX_utils = new_HX_utils
+        self.HXN_sys = sys = bst.System.from_units(None, new_HXs + new_HX_utils)
+        sys.set_tolerance(method='fixedpoint', subsystems=True)
+        return hxs
+    
     def _energy_balance_error_contributions(self):
         original_ignored = ignored = self.ignored
         if ignored and callable(ignored): ignored = ignored()
@@ -126,6 +126,72 @@ class Working_Life_Cycle:
         return self.life_cycle
     
 
+class EnthalpyCurve:
+    """
+    Create an EnthalpyCurve object that tabulates the enthalpy of a stream
+    at vapor-liquid equilibrium (at constant pressure) over a temperature
+    range. Temperature nodes are bisected until enthalpies are linear
+    between nodes (within a tolerance), so that the enthalpy at any
+    temperature within the range can be interpolated without solving VLE.
+    
+    Parameters
+    ----------
+    stream : Stream
+        Stream to tabulate. The stream is not modified; all enthalpies are
+        solved starting from its thermal condition.
+    Ts : Iterable[float]
+        Temperatures that must be nodes [K]. The curve spans from the
+        lowest to the highest temperature.
+    rtol : float, optional
+        Tolerance of interpolated enthalpies relative to the enthalpy
+        change over the whole range. Defaults to 3e-3.
+    dT_min : float, optional
+        Minimum temperature interval between nodes [K]. Defaults to 0.1.
+    N_initial : int, optional
+        Number of evenly spaced nodes before bisection. Defaults to 5.
+    
+    """
+    __slots__ = (
+        'T', # [1d array] Temperature nodes in ascending order.
+        'H', # [1d array] Enthalpies at temperature nodes.
+    )
+    
+    def __init__(self, stream, Ts, rtol=3e-3, dT_min=0.1, N_initial=5):
+        P = stream.P
+        def enthalpy(T):
+            # Always start from the original stream; at saturation, the
+            # phase split of pure components depends on the initial state
+            s = stream.copy()
+            try:
+                s.vle(T=T, P=P)
+            except:
+                warn(f"could not solve VLE for {repr(stream)} at {T:.5g} K", RuntimeWarning)
+            return s.H
+        Ts = np.unique(Ts)
+        Ts = np.union1d(Ts, np.linspace(Ts[0], Ts[-1], N_initial))
+        nodes = {T: enthalpy(T) for T in Ts}
+        Hs = nodes.values()
+        tol = rtol * (max(Hs) - min(Hs))
+        intervals = list(zip(Ts[:-1], Ts[1:]))
+        while intervals:
+            T1, T2 = intervals.pop()
+            if T2 - T1 < 2. * dT_min: continue
+            T = 0.5 * (T1 + T2)
+            nodes[T] = H = enthalpy(T)
+            if abs(H - 0.5 * (nodes[T1] + nodes[T2])) > tol:
+                intervals.append((T1, T))
+                intervals.append((T, T2))
+        self.T = T = np.array(sorted(nodes))
+        self.H = np.array([nodes[i] for i in T])
+    
+    def __call__(self, T):
+        """Return interpolated enthalpy [kJ/hr] at given temperature(s) [K]."""
+        return np.interp(T, self.T, self.H)
+    
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.T[0]:.5g} K to {self.T[-1]:.5g} K, {self.T.size} nodes>"
+
+
 def temperature_interval_pinch_analysis(hus, T_min_app = 10, force_ideal_thermo=False):
     hx_utils = hus
     hus_heating = [hu for hu in hx_utils if hu.duty > 0]
@@ -158,30 +224,30 @@ def temperature_interval_pinch_analysis(hus, T_min_app = 10, force_ideal_thermo=
     T_changes_tuples = list(zip(adj_T_in_arr, adj_T_out_arr))
     all_Ts_descending = [*adj_T_in_arr, *adj_T_out_arr]
     all_Ts_descending.sort(reverse=True)
-    stream_indices_for_T_intervals =\
-        {(all_Ts_descending[i], all_Ts_descending[i+1]):[]\
-            for i in range(len(all_Ts_descending)-1)}
-    H_for_T_intervals = dict.fromkeys(stream_indices_for_T_intervals, 0)
+    T_intervals = list(zip(all_Ts_descending[:-1], all_Ts_descending[1:]))
+    T_starts = np.array(all_Ts_descending[:-1])
+    T_ends = np.array(all_Ts_descending[1:])
     cold_indices = list(range(N_heating))
     hot_indices = list(range(N_heating, len(hxs)))
     indices = cold_indices + hot_indices
-    for i in range(len(all_Ts_descending)-1):
-        T_start = all_Ts_descending[i]
-        T_end = all_Ts_descending[i+1]
-        for stream_index in indices:
-            T1, T2 = T_changes_tuples[stream_index]
-            if (T1 >= T_start and T2 <= T_end) or (T2 >= T_start and T1 <= T_end):
-                multiplier = -1 if is_cold_stream_index(stream_index) else 1
-                stream = streams_inlet[stream_index].copy()
-                if stream.T != T_start: stream.vle(T = T_start, P = stream.P)
-                H1 = stream.H
-                try:
-                    stream.vle(T = T_end, P = stream.P)
-                except:
-                    warn(f"could not solve VLE for {repr(stream)} at {repr(hxs[stream_index].owner)}", RuntimeWarning)
-                H2 = stream.H
-                H = multiplier*(H1 - H2)
-                H_for_T_intervals[(T_start, T_end)] += H
+    curves = [EnthalpyCurve(streams_inlet[i], [T_in_arr[i], T_out_arr[i], adj_T_in_arr[i], adj_T_out_arr[i]])
+              for i in indices]
+    H_intervals = np.zeros(T_starts.size)
+    for stream_index in indices:
+        T1, T2 = T_changes_tuples[stream_index]
+        in_interval = ((T1 >= T_starts) & (T2 <= T_ends)) | ((T2 >= T_starts) & (T1 <= T_ends))
+        if not in_interval.any(): continue
+        multiplier = -1 if is_cold_stream_index(stream_index) else 1
+        stream = streams_inlet[stream_index]
+        curve = curves[stream_index]
+        T_start = T_starts[in_interval]
+        H1 = curve(T_start)
+        H1[T_start == stream.T] = stream.H
+        H2 = curve(T_ends[in_interval])
+        H_intervals[in_interval] += multiplier*(H1 - H2)
+    H_for_T_intervals = dict.fromkeys(T_intervals, 0)
+    for interval, H in zip(T_intervals, H_intervals):
+        H_for_T_intervals[interval] += H
         
     res_H_vector = []
     prev_res_H = 0
@@ -219,15 +285,13 @@ def temperature_interval_pinch_analysis(hus, T_min_app = 10, force_ideal_thermo=
     # print(pinch_T_arr, hot_util_load, cold_util_load,)
     return pinch_T_arr, hot_util_load, cold_util_load, T_in_arr, T_out_arr,\
            hxs, hot_indices, cold_indices, indices, streams_inlet, hx_utils_rearranged, \
-           streams_quenched
+           streams_quenched, curves
             
         
-def load_duties(streams, streams_quenched, pinch_T_arr, T_out_arr, indices, is_cold, Q_hot_side, Q_cold_side):
+def load_duties(streams, streams_quenched, curves, pinch_T_arr, T_out_arr, indices, is_cold, Q_hot_side, Q_cold_side):
     for index in indices:
-        stream = streams[index].copy()
-        H_in = stream.H
-        stream.vle(T = pinch_T_arr[index], P = stream.P)
-        H_pinch = stream.H
+        H_in = streams[index].H
+        H_pinch = curves[index](pinch_T_arr[index])
         H_out = streams_quenched[index].H
         if not is_cold(index):
             dH1 = abs(H_pinch - H_in)
@@ -254,7 +318,7 @@ def synthesize_network(hus, T_min_app=5., Qmin=1e-3, force_ideal_thermo=False,
                        avoid_recycle=False):  
     pinch_T_arr, hot_util_load, cold_util_load, T_in_arr, T_out_arr,\
         hxs, hot_indices, cold_indices, indices, streams_inlet, hx_utils_rearranged, \
-        streams_quenched = temperature_interval_pinch_analysis(hus, T_min_app, force_ideal_thermo)        
+        streams_quenched, curves = temperature_interval_pinch_analysis(hus, T_min_app, force_ideal_thermo)        
     H_out_arr = [i.H for i in streams_quenched]
     duties = np.array([abs(hx.Q)  for hx in hxs])
     dTs = np.abs(T_in_arr - T_out_arr)
@@ -264,7 +328,7 @@ def synthesize_network(hus, T_min_app=5., Qmin=1e-3, force_ideal_thermo=False,
     Q_cold_side = {}
     stream_HXs_dict = {i:[] for i in indices}
     is_cold = lambda x: x in cold_indices
-    load_duties(streams_inlet, streams_quenched, pinch_T_arr, T_out_arr, indices, is_cold, Q_hot_side, Q_cold_side)
+    load_duties(streams_inlet, streams_quenched, curves, pinch_T_arr, T_out_arr, indices, is_cold, Q_hot_side, Q_cold_side)
     matches_hs = {i: [] for i in cold_indices}
     matches_cs = {i: [] for i in hot_indices}
     HXs_hot_side = []
@@ -534,7 +534,7 @@ def test_separate_recycle_loops():
     assert recycle_loop_sys.path == (P1_a, P2_a, M1_a, S1_a, P1_b, P2_b, M1_b, S1_b)
     f.clear()
     
-def test_nested_recycle_loops():
+def create_nested_recycle_loops():
     f.set_flowsheet('nested_recycle_loops')
     settings.set_thermo(['Water'], cache=True)
     feedstock = Stream('feedstock', Water=1000)
@@ -573,6 +573,15 @@ def test_nested_recycle_loops():
     S4 = Splitter('S4', M7-0, ['', recycle_5], split=0.5)
     S5 = Splitter('S5', S4-0, ['', recycle_1], split=0.5)
     M8 = Mixer('M8', [S3-1, S1-1, S5-0], product)
+    return recycles
+
+def test_nested_recycle_loops():
+    recycles = create_nested_recycle_loops()
+    u = f.unit
+    P1, M1, P2, H1, P3, M3, P4, M4, P5, P6, M5, H2, P7, M6, S1, S2, P8, S3, H3, M7, S4, S5, M8 = (
+        u.P1, u.M1, u.P2, u.H1, u.P3, u.M3, u.P4, u.M4, u.P5, u.P6, u.M5, u.H2, 
+        u.P7, u.M6, u.S1, u.S2, u.P8, u.S3, u.H3, u.M7, u.S4, u.S5, u.M8
+    )
     recycle_loop_sys = f.create_system('recycle_loop_sys')
     recycle_loop_sys.simulate()
     network = recycle_loop_sys._to_network()
@@ -697,6 +706,74 @@ def test_corn_ethanol_biorefinery_system_creation():
     bst.process_tools.default()
     f.clear()
     
+def test_strongly_connected_component_sequencing(monkeypatch):
+    create_nested_recycle_loops()
+    units = list(f.unit)
+    N_runs = [0]
+    run = bst.Unit.run
+    def counted_run(self):
+        N_runs[0] += 1
+        return run(self)
+    monkeypatch.setattr(bst.Unit, 'run', counted_run)
+    benchmark = {}
+    results = []
+    for sequencing in ('path', 'scc'):
+        sys = System.from_units(None, units, sequencing=sequencing)
+        assert sys.sequencing == sequencing
+        sys.set_tolerance(mol=1e-3, rmol=1e-4, subsystems=True)
+        sys.empty_recycles()
+        N_runs[0] = 0
+        sys.simulate()
+        benchmark[sequencing] = N_runs[0]
+        results.append(np.array([i.mol for i in sys.products]))
+    assert_allclose(*results, rtol=1e-2, atol=1e-3)
+    assert benchmark['scc'] < 0.5 * benchmark['path']
+    f.clear()
+
+def test_tear_stream_search_limit():
+    from biosteam._network import unit_graph, select_tear_streams, sequence_graph
+    create_nested_recycle_loops()
+    units = list(f.unit)
+    order = {j: i for i, j in enumerate(units)}
+    graph = unit_graph(units)
+    tears = select_tear_streams(graph, order)
+    # Tear streams break all cycles even if no cycles are found within the
+    # search limit
+    for limit in (0, 1, 10):
+        limited_tears = select_tear_streams(graph, order, limit)
+        assert limited_tears
+        residual = {i: [s for s in graph[i] if s not in limited_tears] for i in graph}
+        assert len(sequence_graph(residual, order)) == len(units)
+    assert select_tear_streams(graph, order, 0) != tears
+    f.clear()
+
+def test_minimum_tear_set():
+    f.set_flowsheet('minimum_tear_set')
+    settings.set_thermo(['Water'], cache=True)
+    feedstock = Stream('feedstock', Water=1000)
+    recycle = Stream('recycle')
+    inner_recycle = Stream('inner_recycle')
+    M1 = Mixer('M1', [feedstock, recycle])
+    M2 = Mixer('M2', [M1-0, inner_recycle])
+    S2 = Splitter('S2', M2-0, ['', inner_recycle], split=0.5)
+    S1 = Splitter('S1', S2-0, ['product', recycle], split=0.5)
+    sys = f.create_system('sys', sequencing='scc')
+    network = sys._to_network()
+    actual_network = Network(
+        [S2,
+         S1,
+         M1,
+         M2],
+        recycle=M2-0)
+    assert network == actual_network
+    sys.simulate()
+    assert_allclose(S1.outs[0].F_mol, 1000, rtol=1e-2)
+    sys.update_configuration()
+    assert sys._to_network() == actual_network
+    with pytest.raises(ValueError):
+        f.create_system('sys', sequencing='invalid')
+    f.clear()
+    
 if __name__ == '__main__':
     test_trivial_case()
     test_linear_case()
@@ -713,4 +790,7 @@ if __name__ == '__main__':
     test_separate_recycle_loops()
     test_nested_recycle_loops()
     test_sugarcane_ethanol_biorefinery_network()
-    test_corn_ethanol_biorefinery_system_creation()
\ No newline at end of file
+    test_corn_ethanol_biorefinery_system_creation()
+    test_tear_stream_search_limit()
+    test_minimum_tear_set()
+    test_strongly_connected_component_sequencing(pytest.MonkeyPatch())
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+"""
+import numpy as np
+import biosteam as bst
+from biosteam.units import distillation
+from numpy.testing import assert_allclose
+
+def test_equilibrium_curve():
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    feed = bst.Stream(Water=1, Ethanol=1)
+    bp = feed.get_bubble_point(['Ethanol', 'Water'])
+    P = 101325
+    curve = distillation.EquilibriumCurve(bp.solve_Ty, P)
+    xs = np.linspace(0.0005, 0.9995, 37)
+    solutions = [bp.solve_Ty(np.array([x, 1 - x]), P) for x in xs]
+    assert_allclose(curve.y(xs), [y[0] for T, y in solutions], rtol=1e-3)
+    assert_allclose(curve.bubble_point(xs), [T for T, y in solutions], atol=0.05)
+    
+    # Nearly and fully nonvolatile heavy keys (vapor fraction of the light 
+    # key rounds to 1 at the end nodes)
+    def solve_Ty(x, P, K=np.array([10., 1e-14])):
+        y = K * x
+        return 373., y / y.sum()
+    curve = distillation.EquilibriumCurve(solve_Ty, P)
+    assert_allclose(curve.alpha, 1e15)
+    K = np.array([10., 0.])
+    curve = distillation.EquilibriumCurve(lambda x, P: solve_Ty(x, P, K), P)
+    assert (curve.alpha == curve.alpha_max).all()
+    assert_allclose(curve.y(xs), 1.)
+
+def test_McCabeThiele_equilibrium_curve_cache():
+    bst.settings.set_thermo(['Water', 'Methanol', 'Glycerol'], cache=True)
+    feed = bst.Stream('feed', flow=(80, 100, 25))
+    feed.T = feed.bubble_point_at_P().T
+    D1 = bst.BinaryDistillation(
+        ins=feed, LHK=('Methanol', 'Water'),
+        y_top=0.999, x_bot=0.001, k=1.2,
+    )
+    D1.simulate()
+    curve = D1.get_equilibrium_curve()
+
+    # Stages match the rigorous staircase (bubble point at each stage)
+    solve_Ty = D1.outs[1].get_bubble_point(D1.LHK).solve_Ty
+    y_top, x_bot = D1._get_y_top_and_x_bot()
+    m1 = D1.design_results['Reflux'] / (D1.design_results['Reflux'] + 1)
+    b1 = y_top - m1 * y_top
+    rs = lambda y: (y - b1) / m1
+    m2 = (x_bot - D1._y_m) / (x_bot - D1._x_m)
+    b2 = D1._y_m - m2 * D1._x_m
+    ss = lambda y: (y - b2) / m2
+    x_stages = [x_bot]
+    y_stages = [x_bot]
+    T_stages = []
+    distillation.compute_stages_McCabeThiele(
+        D1.P, ss, x_stages, y_stages, T_stages, D1._x_m, solve_Ty
+    )
+    xi = rs(y_stages[-1])
+    x_stages[-1] = xi if xi < 1 else 0.99999
+    distillation.compute_stages_McCabeThiele(
+        D1.P, rs, x_stages, y_stages, T_stages, y_top, solve_Ty
+    )
+    assert len(x_stages) == D1.design_results['Theoretical stages']
+    assert_allclose(D1._x_stages, x_stages, rtol=1e-3, atol=1e-6)
+    assert_allclose(D1._y_stages, y_stages, rtol=1e-3, atol=1e-6)
+    assert_allclose(D1._T_stages, T_stages, atol=0.05)
+
+    # Curves are reused across simulations and columns at the same pressure
+    D1.k = 1.3
+    D1.simulate()
+    assert D1.get_equilibrium_curve() is curve
+    D2 = bst.BinaryDistillation(
+        ins=feed.copy(), LHK=('Methanol', 'Water'),
+        y_top=0.99, x_bot=0.01, k=2,
+    )
+    D2.simulate()
+    assert D2.get_equilibrium_curve() is curve
+    D2.P = 2 * 101325
+    D2.simulate()
+    assert D2.get_equilibrium_curve() is not curve
+
+def test_Underwood_roots():
+    q = 0.8
+    z_f = np.array([0.2, 0.1, 0.3, 0.25, 0.15])
+    alpha = np.array([1., 4., 0., 2.5, 0.6])
+    roots = distillation.solve_Underwood_roots(q, z_f, alpha, np.zeros(0))
+    # One root between each pair of consecutive volatilities (excluding 
+    # nonvolatile components)
+    assert np.isnan(roots[-1])
+    roots = roots[:-1]
+    poles = np.array([0.6, 1., 2.5, 4.])
+    assert ((poles[:-1] < roots) & (roots < poles[1:])).all()
+    for theta in roots:
+        assert abs(distillation.objective_function_Underwood_constant(theta, q, z_f, alpha)) < 1e-9
+    
+    # Warm starts converge to the same roots
+    assert_allclose(distillation.solve_Underwood_roots(q, z_f, alpha, roots * 1.001)[:-1], roots)
+    
+    # Batch solution is the same as solving each feed
+    z_fs = np.random.default_rng(0).dirichlet(np.ones(5), 20)
+    qs = np.linspace(0.5, 1.5, 20)
+    batch = distillation.solve_Underwood_roots_batch(qs, z_fs, alpha, np.zeros(0))
+    for q, z_f, roots in zip(qs, z_fs, batch):
+        assert_allclose(roots, distillation.solve_Underwood_roots(q, z_f, alpha, np.zeros(0)))
+
+def test_shortcut_column_batch_evaluate():
+    bst.settings.set_thermo(['Water', 'Methanol', 'Glycerol', 'Ethanol'], cache=True)
+    feed = bst.Stream('feed', flow=(80, 100, 25, 10))
+    feed.T = feed.bubble_point_at_P().T
+    D1 = bst.ShortcutColumn(
+        ins=feed, LHK=('Methanol', 'Water'),
+        y_top=0.99, x_bot=0.01, k=1.5,
+    )
+    D1.simulate()
+    design_results = D1.design_results
+    roots = D1._Underwood_roots
+    assert roots is not None
+    
+    # Converged roots are kept as warm starts
+    D1.k = 1.6
+    D1.simulate()
+    assert_allclose(D1._Underwood_roots, roots)
+    
+    # Results at the feed composition match the design results
+    z_f = feed.get_normalized_mol(D1._IDs_vle)
+    results = D1.batch_evaluate([z_f, 0.5 * z_f, [1, 1, 0.2, 0.1]])
+    for name, values in results.items():
+        assert values.shape == (3,)
+        assert_allclose(values[:2], design_results[name])
+    assert results['Minimum reflux'][2] != design_results['Minimum reflux']
+
+
+if __name__ == '__main__':
+    test_equilibrium_curve()
+    test_McCabeThiele_equilibrium_curve_cache()
+    test_Underwood_roots()
+    test_shortcut_column_batch_evaluate()
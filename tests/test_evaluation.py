@@ -123,7 +123,37 @@ def test_kendall_tau(model):
     expected = np.array([[1., 1., 0.],
                          [0,  0., 0.]])
     assert_allclose(np.round(tau), expected, atol=0.15)
-    
+
+def test_vectorized_correlation(model):
+    # Callable filters correlate one pair of parameter and metric at a time
+    def omit_nan(x, y):
+        index = ~(np.isnan(x) | np.isnan(y))
+        return x[index], y[index]
+
+    def propagate_nan(x, y):
+        if np.isnan(x).any() or np.isnan(y).any(): return x, np.full_like(y, np.nan)
+        return x, y
+
+    model.table.iloc[::7, 0] = np.nan # Parameters with NaN values too
+    for name in ('spearman_r', 'pearson_r', 'kendall_tau'):
+        f = getattr(model, name)
+        for filter in ('omit nan', 'propagate nan'):
+            stat, p = f(filter=filter)
+            if filter == 'omit nan':
+                expected_stat, expected_p = f(filter=omit_nan)
+            elif name == 'pearson_r':
+                expected_stat = stat.copy()
+                expected_stat.iloc[:, :] = np.nan
+                expected_stat.iloc[1, [0, 2]], expected_p = f(filter=omit_nan)[0].iloc[1, [0, 2]], None
+            else:
+                expected_stat, expected_p = f(filter=propagate_nan)
+            assert_allclose(stat.values, expected_stat.values, atol=1e-12)
+            if expected_p is not None: assert_allclose(p.values, expected_p.values, atol=1e-12)
+        with pytest.raises(ValueError): f(filter='raise nan')
+        with pytest.raises(ValueError): f(filter='invalid')
+    tau, p = model.kendall_tau(filter='omit nan', threads=2)
+    assert_allclose(tau.values, model.kendall_tau(filter=omit_nan)[0].values)
+
 def test_model_index():
     from biorefineries.sugarcane import sugarcane_sys, flowsheet as f
     import biosteam as bst
@@ -277,4 +307,505 @@ def test_kolmogorov_smirnov_d(model):
     model.evaluate()
     
     D, p = model.kolmogorov_smirnov_d(thresholds=[1, 1.5]) # Just make sure it works for now
-    # TODO: Add tests that make sense for comparing statistics
\ No newline at end of file
+    # TODO: Add tests that make sense for comparing statistics
+
+def test_locality_scheduler():
+    import biosteam as bst
+    from biosteam.evaluation._parallel import split_path
+    index = list(range(12))
+    samples = np.array([0, 1, 2, 3, 10, 11, 12, 13, 20, 21, 22, 23], float)[:, None]
+    regions = split_path(index, samples, 3)
+    assert regions == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+    assert split_path(index, samples, 20) == [[i] for i in index]
+    
+    model = create_evaluation_model()
+    good_metric = model.metrics[0].index
+    serial_values = model.table[good_metric].values.copy()
+    model.evaluate(processes=2, chunksize=5, scheduler='locality')
+    assert_allclose(model.table[good_metric].values, serial_values)
+    with pytest.raises(ValueError): model.evaluate(processes=2, scheduler='none')
+
+def test_sample_order():
+    from biosteam.evaluation._sample_order import (
+        sample_order, dense_nearest_neighbor_order, nearest_neighbor_order, 
+        hilbert_order, nearest_sample_limit, normalize_samples
+    )
+    np.random.seed(0)
+    for D in (1, 2, 4):
+        samples = np.random.random([500, D])
+        for distance, p in (('cityblock', 1), ('euclidean', 2)):
+            assert nearest_neighbor_order(samples, p) == dense_nearest_neighbor_order(samples, distance)
+        for method in ('nearest', 'dense', 'hilbert', 'morton'):
+            assert sorted(sample_order(samples, method)) == list(range(500))
+    
+    # Consecutive points along the Hilbert curve are adjacent
+    grid = np.array([(i, j) for i in range(8) for j in range(8)], float)
+    index = hilbert_order(grid / 7, bits=3)
+    assert (np.abs(np.diff(grid[index], axis=0)).sum(axis=1) == 1).all()
+    with pytest.raises(ValueError): sample_order(grid, 'random')
+    
+    # Large samples follow a Hilbert curve by default
+    samples = normalize_samples(np.random.random([nearest_sample_limit + 1, 2]))
+    assert sample_order(samples) == hilbert_order(samples)
+    samples = normalize_samples(samples[:500])
+    assert sample_order(samples) == nearest_neighbor_order(samples)
+
+def test_sample_order_convergence():
+    import biosteam as bst
+    from chaospy import distributions as shape
+    bst.main_flowsheet.set_flowsheet('sample_order_convergence')
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    feed = bst.Stream('feed', Water=1000, Ethanol=100)
+    recycle = bst.Stream('recycle')
+    M1 = bst.Mixer('M1', [feed, recycle])
+    F1 = bst.Flash('F1', M1-0, V=0.5, P=101325)
+    S1 = bst.Splitter('S1', F1-1, ['product', recycle], split=0.5)
+    sys = bst.main_flowsheet.create_system('sys')
+    sys.set_tolerance(rmol=1e-6, mol=1e-6)
+    model = bst.Model(sys)
+    @model.parameter(element=S1, kind='coupled', distribution=shape.Uniform(0.1, 0.9))
+    def set_split(split): S1.split[:] = split
+    
+    @model.parameter(element=F1, kind='coupled', distribution=shape.Uniform(0.2, 0.8))
+    def set_V(V): F1.V = V
+    
+    model.metric(lambda: sys._iter, 'Iterations')
+    np.random.seed(1)
+    samples = model.sample(100, 'L')
+    iterations = {}
+    for optimize in (False, 'dense', 'nearest', 'hilbert'):
+        model.load_samples(samples, optimize=optimize)
+        sys.empty_recycles()
+        model.evaluate()
+        iterations[optimize] = model.table.values[:, -1].sum()
+    assert iterations['nearest'] == iterations['dense']
+    assert iterations['nearest'] < iterations[False]
+    assert iterations['hilbert'] < iterations[False]
+
+def test_result_store(tmp_path):
+    import biosteam as bst
+    model = create_evaluation_model()
+    good_metric = model.metrics[0].index
+    serial_values = model.table[good_metric].values.copy()
+    count = [0]
+    def interrupt():
+        count[0] += 1
+        if count[0] == 35: raise KeyboardInterrupt
+        return count[0]
+    
+    model.metrics = [*model.metrics, bst.Metric('Count', interrupt)]
+    model.load_samples(model.table[[i.index for i in model.parameters]].values)
+    store = bst.ResultStore(str(tmp_path / 'results'))
+    with pytest.raises(KeyboardInterrupt): model.evaluate(file=store, autosave=10)
+    # Results are appended every 10 samples (and once more on interruption)
+    assert len(store.chunk_files()) == 4
+    assert store.evaluated(100).sum() == 34
+    
+    count[0] = 100
+    model.evaluate(file=store, autosave=10, autoload=True)
+    assert count[0] == 166 # Only the remaining samples were evaluated
+    assert_allclose(model.table[good_metric].values, serial_values)
+    table = model.table.copy()
+    model.table.loc[:, good_metric] = np.nan
+    model.load_pickled_results(store)
+    assert_allclose(model.table.values, table.values)
+    
+    # Evaluating without autoload overwrites the store
+    model.evaluate(file=store, autosave=50)
+    assert len(store.chunk_files()) == 2
+
+def test_incremental_evaluation(monkeypatch):
+    import biosteam as bst
+    from chaospy import distributions as shape
+    bst.main_flowsheet.set_flowsheet('incremental_evaluation')
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    feed = bst.Stream('feed', Water=1000, Ethanol=100)
+    recycle = bst.Stream('recycle')
+    M1 = bst.Mixer('M1', [feed, recycle])
+    F1 = bst.Flash('F1', M1-0, V=0.5, P=101325)
+    S1 = bst.Splitter('S1', F1-1, ['', recycle], split=0.5)
+    S2 = bst.Splitter('S2', S1-0, split=0.5)
+    H1 = bst.HXutility('H1', S2-0, T=320)
+    sys = bst.main_flowsheet.create_system('sys')
+    sys.set_tolerance(rmol=1e-6, mol=1e-6, subsystems=True)
+    model = bst.Model(sys)
+    @model.parameter(element=S2, kind='coupled', distribution=shape.Uniform(0.1, 0.9))
+    def set_split(split): S2.split[:] = split
+    
+    @model.parameter(element=H1, kind='coupled', distribution=shape.Uniform(300, 340))
+    def set_T(T): H1.T = T
+    
+    model.metric(lambda: H1.outs[0].F_mol, 'Flow')
+    model.metric(lambda: H1.purchase_cost, 'Cost')
+    model.metric(lambda: H1.heat_utilities[0].duty, 'Duty')
+    N_runs = [0]
+    run = bst.Unit.run
+    def counted_run(self):
+        N_runs[0] += 1
+        return run(self)
+    monkeypatch.setattr(bst.Unit, 'run', counted_run)
+    np.random.seed(1)
+    samples = model.sample(20, 'L')
+    model.load_samples(samples)
+    results = {}
+    runs = {}
+    for incremental in (False, True):
+        sys.incremental = incremental
+        N_runs[0] = 0
+        model.evaluate()
+        runs[incremental] = N_runs[0]
+        results[incremental] = model.table.values.copy()
+    assert_allclose(results[True], results[False], rtol=1e-6)
+    assert 2 * runs[True] < runs[False]
+    
+    # Only elements of parameters that changed since the last sample are rerun
+    samples[:, 0] = samples[0, 0]
+    model.load_samples(samples)
+    N_runs[0] = 0
+    model.evaluate()
+    assert N_runs[0] == len(samples) + 1 # S2 and H1 once, then only H1
+    sys.incremental = False
+
+
+def create_kind_aware_model():
+    import biosteam as bst
+    from chaospy import distributions as shape
+    bst.main_flowsheet.set_flowsheet('kind_aware_evaluation')
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    feed = bst.Stream('feed', Water=1000, Ethanol=100)
+    recycle = bst.Stream('recycle')
+    M1 = bst.Mixer('M1', [feed, recycle])
+    F1 = bst.Flash('F1', M1-0, V=0.5, P=101325)
+    S1 = bst.Splitter('S1', F1-1, ['', recycle], split=0.5)
+    T1 = bst.StorageTank('T1', S1-0, tau=10)
+    sys = bst.main_flowsheet.create_system('sys')
+    sys.set_tolerance(rmol=1e-6, mol=1e-6, subsystems=True)
+    model = bst.Model(sys)
+    @model.parameter(element=F1, kind='coupled', distribution=shape.Uniform(0.3, 0.7))
+    def set_V(V): F1.V = V
+    
+    @model.parameter(element=T1, kind='design', distribution=shape.Uniform(5, 20))
+    def set_tau(tau): T1.tau = tau
+    
+    @model.parameter(element=feed, kind='cost', distribution=shape.Uniform(0.1, 0.2))
+    def set_price(price): feed.price = price
+    
+    multiplier = [1.]
+    @model.parameter(kind='isolated', distribution=shape.Uniform(1, 2))
+    def set_multiplier(x): multiplier[0] = x
+    
+    model.metric(lambda: T1.outs[0].F_mol, 'Flow')
+    model.metric(lambda: T1.purchase_cost, 'Cost')
+    model.metric(lambda: multiplier[0] * feed.cost, 'Feed cost')
+    return model
+
+def count_convergence(monkeypatch):
+    import biosteam as bst
+    N_converge = [0]
+    converge = bst.System.converge
+    def counted_converge(self, *args, **kwargs):
+        N_converge[0] += 1
+        return converge(self, *args, **kwargs)
+    monkeypatch.setattr(bst.System, 'converge', counted_converge)
+    return N_converge
+
+def test_kind_aware_evaluation(monkeypatch):
+    model = create_kind_aware_model()
+    N_converge = count_convergence(monkeypatch)
+    np.random.seed(1)
+    samples = model.sample(20, 'L')
+    samples[:, 0] = np.repeat([0.4, 0.6, 0.5, 0.3], 5)
+    np.random.shuffle(samples)
+    model.load_samples(samples)
+    order = samples[model._index, 0]
+    assert (np.diff(order) != 0).sum() == 3 # Samples grouped by coupled parameters
+    results = {}
+    converged = {}
+    for minimize_reevaluation in (False, True):
+        model.minimize_reevaluation = minimize_reevaluation
+        N_converge[0] = 0
+        model.evaluate()
+        converged[minimize_reevaluation] = N_converge[0]
+        results[minimize_reevaluation] = model.table.values.copy()
+    # Only converged once per value of the coupled parameter
+    assert 5 * converged[True] == converged[False]
+    assert_allclose(results[True], results[False], rtol=1e-6)
+    
+    # Always simulated after direct updates
+    model(samples[0])
+    N_converge[0] = 0
+    model._evaluate_sample(samples[0])
+    assert N_converge[0]
+    
+    # Only explicitly isolated parameters skip simulation
+    sample = samples[0].copy()
+    sample[3] = 1.5
+    N_converge[0] = 0
+    model._evaluate_sample(sample)
+    assert not N_converge[0]
+    model.parameters[3].kind = None
+    sample[3] = 1.6
+    model._evaluate_sample(sample)
+    assert N_converge[0]
+
+def test_nested_sampling(monkeypatch):
+    model = create_kind_aware_model()
+    N_converge = count_convergence(monkeypatch)
+    np.random.seed(1)
+    samples = model.sample_nested(4, 5)
+    assert samples.shape == (20, 4)
+    outer = samples[:, 0].reshape([4, 5])
+    assert (outer == outer[:, :1]).all()
+    assert len(np.unique(outer[:, 0])) == 4
+    assert len(np.unique(samples[:, 1:], axis=0)) == 20
+    lb, ub = np.array([i.bounds for i in model.parameters]).transpose()
+    assert ((lb <= samples) & (samples <= ub)).all()
+    model.load_samples(samples)
+    model.minimize_reevaluation = False
+    model.evaluate()
+    N_full = N_converge[0]
+    values = model.table.values.copy()
+    N_converge[0] = 0
+    model.minimize_reevaluation = True
+    model.evaluate()
+    assert 5 * N_converge[0] == N_full
+    assert_allclose(model.table.values, values, rtol=1e-6)
+    with pytest.raises(ValueError): model.sample_nested(4, 5, 'MORRIS')
+    
+    # Inner samples of isolated parameters are not simulated
+    import biosteam as bst
+    N_summary = [0]
+    summary = bst.System._summary
+    def counted_summary(self, *args, **kwargs):
+        if self is model.system: N_summary[0] += 1
+        return summary(self, *args, **kwargs)
+    monkeypatch.setattr(bst.System, '_summary', counted_summary)
+    set_V, set_tau, set_price, set_multiplier = model.parameters
+    model.parameters = [set_V, set_multiplier]
+    samples = model.sample_nested(4, 5)
+    model.load_samples(samples)
+    N_converge[0] = 0
+    model.evaluate()
+    assert N_summary[0] == 4 # Simulated once per outer sample
+    assert 5 * N_converge[0] == N_full
+    
+    # Parameters without a declared kind are sampled in the outer level
+    set_multiplier.kind = None
+    samples = model.sample_nested(4, 5)
+    assert len(np.unique(samples[:, 1])) == 4
+
+def test_parallel_sensitivity_and_coordinate():
+    import biosteam as bst
+    model = create_kind_aware_model()
+    serial = model.single_point_sensitivity(array=True)
+    parallel = model.single_point_sensitivity(array=True, processes=3, chunksize=2)
+    for i, j in zip(serial, parallel): assert_allclose(i, j, rtol=1e-6)
+    
+    np.random.seed(1)
+    model.load_samples(model.sample(6, 'L'))
+    F1 = model.system.flowsheet.unit.F1
+    def f_coordinate(P): F1.P = P
+    coordinate = [101325, 2 * 101325, 3 * 101325]
+    kwargs = dict(notify_coordinate=False)
+    serial = model.evaluate_across_coordinate('P', f_coordinate, coordinate, **kwargs)
+    table = model.table.copy()
+    model.table[[i.index for i in model.metrics]] = 0.
+    parallel = model.evaluate_across_coordinate('P', f_coordinate, coordinate, processes=2, **kwargs)
+    assert serial.keys() == parallel.keys()
+    for i in serial: assert_allclose(serial[i], parallel[i], rtol=1e-6)
+    assert_allclose(model.table.values, table.values, rtol=1e-6) # Last coordinate
+    
+    def f_coordinate(P): 
+        if P > 101325: raise ValueError('invalid pressure')
+    with pytest.raises(ValueError): 
+        model.evaluate_across_coordinate('P', f_coordinate, coordinate, processes=2, **kwargs)
+    
+    model.exception_hook = 'raise'
+    model.metrics = [*model.metrics, bst.Metric('bad', lambda: 1/0)]
+    with pytest.raises(ZeroDivisionError): 
+        model.single_point_sensitivity(processes=2)
+
+def test_surrogate():
+    import biosteam as bst
+    from chaospy import distributions as shape
+    sys = bst.System(None, ())
+    model = bst.Model(sys)
+    x = np.zeros(3)
+    for i in range(3):
+        def setter(value, i=i): x[i] = value
+        model.parameter(setter, name=f'x{i}', distribution=shape.Uniform(0, 1))
+    model.metric(lambda: x[0] + 2 * x[1], 'Linear')
+    model.metric(lambda: (x[0] - 0.3) ** 2 + (x[1] - 0.6) ** 2 + x[0] * x[2], 'Quadratic')
+    model.metric(lambda: np.exp(x[0]) * np.sin(3 * x[1]), 'Smooth')
+    with pytest.raises(RuntimeError): model.create_fitted_model()
+    np.random.seed(0)
+    model.load_samples(model.sample(100, 'L'))
+    model.evaluate()
+    surrogate = model.create_fitted_model()
+    assert surrogate.degree > 2
+    error = surrogate.cross_validation_error()
+    assert (error['R2'] > 0.999).all()
+    samples = surrogate.sample(1000)
+    values = []
+    for sample in samples[:20]: 
+        model._update_state(sample)
+        values.append([i() for i in model.metrics])
+    values = np.array(values)
+    predicted = surrogate.predict(samples[:20])
+    assert_allclose(predicted[:, :2], values[:, :2], atol=1e-9) # Polynomials are exact
+    assert_allclose(predicted[:, 2], values[:, 2], atol=0.05)
+    predicted, std = surrogate.predict(samples, std=True)
+    assert predicted.shape == std.shape == (1000, 3)
+    assert (std[:, 2] > 0).all()
+    
+    # Sobol indices of the linear metric are 1/5 and 4/5
+    first, total = surrogate.sobol_indices(N=2**14)
+    linear = model.metrics[0].index
+    assert_allclose(first[linear].values, [0.2, 0.8, 0.], atol=0.03)
+    assert_allclose(total[linear].values, [0.2, 0.8, 0.], atol=0.03)
+    
+    # Minimum of the quadratic metric is at x = (0.3, 0.6, 0)
+    sample, value = surrogate.optimize(model.metrics[1])
+    assert_allclose(sample.values, [0.3, 0.6, 0.], atol=1e-3)
+    assert abs(value) < 1e-6
+    
+    # Refine with simulations where the surrogate is most uncertain
+    quadratic = model.create_fitted_model(metrics=model.metrics[1], degree=2)
+    assert quadratic.degree == 2 and quadratic.metrics == (model.metrics[1],)
+    N_samples = len(quadratic.samples)
+    quadratic.refine(N_iterations=2, N_samples=5, N_candidates=100)
+    assert len(quadratic.samples) == N_samples + 10
+    assert_allclose(quadratic.predict(samples[:20])[:, 0], values[:, 1], atol=1e-9)
+
+def test_sensitivity_indices(monkeypatch):
+    import biosteam as bst
+    from chaospy import distributions as shape
+    sys = bst.System(None, ())
+    model = bst.Model(sys)
+    x = np.zeros(3)
+    for i in range(3):
+        def setter(value, i=i): x[i] = value
+        model.parameter(setter, name=f'x{i}', distribution=shape.Uniform(0, 1))
+    model.metric(lambda: x[0] + 2 * x[1], 'Linear')
+    model.metric(lambda: x[0] * x[2], 'Interaction')
+    
+    # Sobol indices of the linear metric are 1/5 and 4/5
+    indices = model.sobol_indices(2 ** 10, seed=0, processes=2)
+    linear, interaction = [i.index for i in model.metrics]
+    assert_allclose(indices['S1'][linear].values, [0.2, 0.8, 0.], atol=0.03)
+    assert_allclose(indices['ST'][linear].values, [0.2, 0.8, 0.], atol=0.03)
+    assert (indices['ST'][interaction].values[[0, 2]] > indices['S1'][interaction].values[[0, 2]]).all()
+    assert model.table.shape[0] == 2 ** 10 * 5
+    
+    # Only new samples are evaluated until confidence intervals are within tolerance
+    evaluated = []
+    evaluate = bst.Model.evaluate
+    def count_evaluations(self, **kwargs):
+        evaluated.append(len(self._samples))
+        return evaluate(self, **kwargs)
+    monkeypatch.setattr(bst.Model, 'evaluate', count_evaluations)
+    indices = model.sobol_indices(2 ** 6, metrics=[model.metrics[0]], tol=0.05, 
+                                  N_max=2 ** 12, calc_second_order=True, seed=0)
+    convergence = indices['convergence']
+    assert (convergence['N'].values == 2 ** 6 * 2 ** np.arange(len(convergence))).all()
+    assert evaluated == list(convergence['Evaluations'].diff().fillna(convergence['Evaluations'][0]))
+    assert convergence['Error'].values[-1] <= 0.05 < convergence['Error'].values[0]
+    assert indices['ST_conf'].values.max() <= 0.05
+    assert indices['S2'].shape == (3, 1)
+    assert_allclose(indices['S2'].values, 0, atol=0.05)
+    
+    # Elementary effects of the linear metric are 1 and 2
+    indices = model.morris_indices(20, seed=0)
+    assert_allclose(indices['mu_star'][linear].values, [1., 2., 0.])
+    assert_allclose(indices['sigma'][linear].values, 0, atol=1e-12)
+    indices = model.morris_indices(4, tol=0.2, N_max=64, seed=0)
+    assert indices['convergence']['Error'].values[-1] <= 0.2
+    assert len(model.table) == indices['convergence']['N'].values[-1] * 4
+    with pytest.raises(ValueError): model.morris_indices(4, tol=0.2)
+    
+    # Failed evaluations never meet the tolerance
+    model.metric(lambda: np.nan if x[0] > 0.9 else x[0], 'Failing')
+    with pytest.warns(RuntimeWarning):
+        indices = model.morris_indices(4, metrics=[model.metrics[-1]], tol=0.2, N_max=16, seed=0)
+    assert (indices['convergence']['Error'] == np.inf).all()
+    assert indices['convergence']['N'].values[-1] == 16
+
+def test_streaming_statistics():
+    import biosteam as bst
+    from scipy import stats
+    model = create_evaluation_model()
+    np.random.seed(2)
+    model.load_samples(model.sample(500, 'L'))
+    statistics = bst.StreamingStatistics(model.parameters, model.metrics[:1], reservoir_size=1000, bins=20, seed=0)
+    model.metrics = model.metrics[:1]
+    model.evaluate(statistics=statistics)
+    table = model.table
+    metric = model.metrics[0]
+    values = table[metric.index].values
+    assert statistics.count == 500 and statistics.failed == 0
+    assert_allclose(statistics.mean().values, values.mean())
+    assert_allclose(statistics.std().values, values.std(ddof=1))
+    summary = statistics.summary()
+    assert_allclose(summary['min'], values.min())
+    assert_allclose(summary['max'], values.max())
+    assert_allclose(summary['50%'], np.median(values)) # All evaluations in reservoir
+    assert_allclose(statistics.pearson_r()[0].values, model.pearson_r()[0].values)
+    assert_allclose(statistics.spearman_r()[0].values, model.spearman_r()[0].values)
+    assert_allclose(statistics.kendall_tau()[0].values, model.kendall_tau()[0].values)
+    counts, edges = statistics.histogram(metric)
+    assert counts.sum() == 500
+    assert_allclose(counts, np.histogram(values, edges)[0])
+    points, density = statistics.kde(metric)
+    assert_allclose((density * (edges[1] - edges[0])).sum(), 1, rtol=0.05)
+    
+    # Chunks of evaluations give the same moments, histograms widen as needed,
+    # and reservoirs remain a uniform sample of all evaluations
+    chunked = bst.StreamingStatistics(model.parameters, model.metrics, reservoir_size=100, bins=20, seed=0)
+    samples = table[[i.index for i in model.parameters]].values
+    for i in range(0, 500, 70): chunked.update(samples[i:i + 70], values[i:i + 70, None])
+    chunked.update(samples[0], [np.nan])
+    assert chunked.count == 500 and chunked.failed == 1
+    assert_allclose(chunked.mean().values, values.mean())
+    assert_allclose(chunked.std().values, values.std(ddof=1))
+    assert_allclose(chunked.pearson_r()[0].values, model.pearson_r()[0].values)
+    counts, edges = chunked.histogram(metric)
+    assert counts.sum() == 500 and edges[0] <= values.min() and values.max() < edges[-1]
+    assert len(chunked._reservoir) == 100
+    assert stats.ks_2samp(chunked._reservoir[:, -1], values).pvalue > 0.01
+    with pytest.raises(ValueError): bst.StreamingStatistics(model.parameters, model.metrics, bins=3)
+    
+    parallel = bst.StreamingStatistics(model.parameters, model.metrics)
+    model.evaluate(processes=2, chunksize=100, statistics=parallel)
+    assert parallel.count == 500
+    assert_allclose(parallel.mean().values, values.mean())
+    
+    # Only statistics are kept if values are not stored
+    model.table[metric.index] = np.nan
+    for processes in (None, 2):
+        statistics = bst.StreamingStatistics(model.parameters, model.metrics)
+        model.evaluate(processes=processes, chunksize=100, statistics=statistics, store_values=False)
+        assert statistics.count == 500
+        assert_allclose(statistics.mean().values, values.mean())
+        assert model.table[metric.index].isna().all()
+    with pytest.raises(ValueError): 
+        model.evaluate(file='results.pckl', autosave=10, store_values=False)
+
+def test_parallel_evaluation():
+    import biosteam as bst
+    model = create_evaluation_model()
+    serial_table = model.table.copy()
+    model.evaluate(processes=1, chunksize=7)
+    table_1 = model.table.copy()
+    model.evaluate(processes=3, chunksize=7)
+    table_3 = model.table.copy()
+    assert_allclose(table_1.values, table_3.values)
+    # Metrics that do not depend on the state of previous evaluations
+    # match serial evaluation
+    good_metric = model.metrics[0].index
+    assert_allclose(table_3[good_metric], serial_table[good_metric])
+    
+    def exception_hook(exception, sample): raise exception
+    model.exception_hook = exception_hook
+    model.metrics = [*model.metrics, bst.Metric('bad', lambda: 1/0)]
+    model.load_samples(model.table[[i.index for i in model.parameters]].values)
+    with pytest.raises(ZeroDivisionError): model.evaluate(processes=2)
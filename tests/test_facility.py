@@ -9,6 +9,7 @@
 """
 import pytest
 import biosteam as bst
+import numpy as np
 from numpy.testing import assert_allclose
 
 def test_facility_inheritance():
@@ -19,5 +20,86 @@ def test_facility_inheritance():
     class NewFacility(bst.Facility): 
         network_priority = 2
     
+def test_enthalpy_curve():
+    from biosteam.units.facilities.hxn.hxn_synthesis import EnthalpyCurve
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    feed = bst.Stream(None, Water=800, Ethanol=200, T=300)
+    curve = EnthalpyCurve(feed, [300, 380])
+    assert curve.T[0] == 300 and curve.T[-1] == 380
+    assert feed.T == 300 and feed.phase == 'l' # Stream not modified
+    H_range = curve.H.max() - curve.H.min()
+    for T in np.linspace(300, 380, 17):
+        stream = feed.copy()
+        stream.vle(T=T, P=feed.P)
+        assert_allclose(curve(T), stream.H, atol=5e-3 * H_range)
+    assert_allclose(curve(300), bst.Stream(None, Water=800, Ethanol=200, T=300).H)
+    
+def test_incremental_heat_exchanger_network(monkeypatch):
+    from biosteam.units.facilities.hxn import _heat_exchanger_network
+    synthesize_network = _heat_exchanger_network.synthesize_network
+    calls = []
+    def counted_synthesize_network(*args, **kwargs):
+        calls.append(None)
+        return synthesize_network(*args, **kwargs)
+    monkeypatch.setattr(_heat_exchanger_network, 'synthesize_network', counted_synthesize_network)
+    bst.main_flowsheet.set_flowsheet('incremental_HXN')
+    bst.settings.set_thermo(['Water', 'Methanol', 'Glycerol'], cache=True)
+    feed1 = bst.Stream('feed1', flow=(8000, 100, 25))
+    feed2 = bst.Stream('feed2', flow=(10000, 1000, 10))
+    D1 = bst.ShortcutColumn(
+        'D1', ins=feed1, outs=('distillate', 'bottoms_product'),
+        LHK=('Methanol', 'Water'), y_top=0.99, x_bot=0.01, k=2,
+        is_divided=True
+    )
+    D1_H1 = bst.HXutility('D1_H1', ins=D1.outs[1], T=300)
+    D1_H2 = bst.HXutility('D1_H2', ins=D1.outs[0], T=300)
+    F1 = bst.Flash('F1', ins=feed2, outs=('vapor', 'liquid'), V=0.9, P=101325)
+    HXN = bst.HeatExchangerNetwork('HXN', T_min_app=5.)
+    sys = bst.main_flowsheet.create_system('incremental_HXN_sys')
+    sys.simulate()
+    sys.simulate()
+    HXN.cache_network = HXN.incremental = True
+    sys.simulate()
+    assert len(calls) == 2
+    
+    # Remove a utility; its matches are removed and other matches are kept
+    HXN_sys = HXN.HXN_sys
+    N_HXs = len(HXN.new_HXs)
+    D1_H2.T = D1.outs[0].T
+    sys.simulate()
+    assert len(calls) == 2
+    assert HXN.HXN_sys is not HXN_sys
+    assert len(HXN.new_HXs) < N_HXs
+    assert D1_H2 not in HXN.original_heat_exchangers
+    assert abs(HXN.energy_balance_percent_error) < 0.01
+    loads = HXN.actual_heat_util_load, HXN.actual_cool_util_load
+    HXN.cache_network = False
+    sys.simulate()
+    assert_allclose(loads, (HXN.actual_heat_util_load, HXN.actual_cool_util_load), rtol=1e-3)
+    HXN.cache_network = True
+    sys.simulate()
+    assert len(calls) == 3
+    
+    # Add a utility; existing matches are kept
+    HXN_sys = HXN.HXN_sys
+    D1_H2.T = 300
+    sys.simulate()
+    assert len(calls) == 3
+    assert D1_H2 in HXN.original_heat_exchangers
+    assert abs(HXN.energy_balance_percent_error) < 0.01
+    assert HXN.HXN_sys is not HXN_sys
+    HXN_sys = HXN.HXN_sys
+    sys.simulate()
+    assert len(calls) == 3
+    assert HXN.HXN_sys is HXN_sys
+    
+    # Synthesize a new network when temperatures drift beyond tolerance
+    HXN.T_tolerance = 1.
+    D1_H2.T = 310
+    sys.simulate()
+    assert len(calls) == 4
+    
 if __name__ == '__main__':
-    test_facility_inheritance()
\ No newline at end of file
+    test_facility_inheritance()
+    test_enthalpy_curve()
+    test_incremental_heat_exchanger_network(pytest.MonkeyPatch())
\ No newline at end of file
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# BioSTEAM: The Biorefinery Simulation and Techno-Economic Analysis Modules
+# Copyright (C) 2020-2023, Yoel Cortes-Pena <yoelcortes@gmail.com>
+#
+# This module is under the UIUC open-source license. See
+# github.com/BioSTEAMDevelopmentGroup/biosteam/blob/master/LICENSE.txt
+# for license details.
+"""
+"""
+import pytest
+import biosteam as bst
+import numpy as np
+from numpy.testing import assert_allclose
+
+def create_recycle_system():
+    bst.main_flowsheet.set_flowsheet('recycle_solvers')
+    bst.settings.set_thermo(['Water', 'Ethanol', 'Methanol', 'Glycerol'], cache=True)
+
+    class Separator(bst.Unit):
+        _N_outs = 2
+        base_split = np.array([0.99, 0.8, 0.9, 0.97])
+        coupling = np.random.default_rng(1).uniform(0, 1, (4, 4))
+
+        def _run(self):
+            feed, = self.ins
+            top, bottom = self.outs
+            x = feed.mol / feed.F_mol
+            split = self.base_split * (1 - 0.3 * x @ self.coupling)
+            top.mol[:] = feed.mol * split
+            bottom.mol[:] = feed.mol - top.mol
+
+    feed = bst.Stream('feed', Water=100, Ethanol=100, Methanol=50, Glycerol=20)
+    recycle = bst.Stream('recycle')
+    M1 = bst.Mixer('M1', [feed, recycle])
+    U1 = Separator('U1', M1-0, [recycle, 'product'])
+    sys = bst.System.from_units('sys', [M1, U1])
+    return sys, feed
+
+def test_recycle_solvers():
+    sys, feed = create_recycle_system()
+    product = sys.flowsheet.stream.product
+    iterations = {}
+    results = {}
+    for method in ('fixedpoint', 'aitken', 'wegstein', 'anderson-acceleration', 'broyden', 'broyden-reuse'):
+        sys.set_tolerance(method=method.replace('-reuse', ''), mol=1e-6, rmol=1e-6, maxiter=1000)
+        sys.cache_solver_state = method == 'broyden-reuse'
+        sys.empty_recycles()
+        np.random.seed(0)
+        total = 0
+        for n in range(5):
+            feed.imol['Water', 'Ethanol'] = 100 * np.random.uniform(0.95, 1.05, 2)
+            sys.simulate()
+            total += sys._iter
+        iterations[method] = total
+        results[method] = product.mol.copy()
+    for method, mol in results.items():
+        assert_allclose(mol, results['fixedpoint'], rtol=1e-4)
+    assert iterations['anderson-acceleration'] < iterations['aitken'] < iterations['fixedpoint']
+    assert iterations['broyden'] < iterations['aitken']
+    
+    # Broyden's Jacobian approximation is reused in successive simulations
+    assert iterations['broyden-reuse'] < iterations['broyden']
+    
+    # Options of convergence methods are set by system
+    sys.cache_solver_state = False
+    sys.set_tolerance(method='anderson-acceleration', method_options=dict(depth=1, mixing=0.5))
+    sys.empty_recycles()
+    sys.simulate()
+    assert_allclose(product.mol, results['fixedpoint'], rtol=1e-4)
+    sys.method_options['bad_option'] = None
+    with pytest.raises(TypeError): sys.simulate()
+    sys.method_options.clear()
+    
+    # Anderson mixing of scipy is still available under its own name
+    sys.method = 'anderson'
+    assert sys.available_methods['anderson'][0] is not sys.available_methods['andersonacceleration'][0]
+    assert all(len(i) == 3 for i in sys.available_methods.values())
+    assert {'aitken', 'wegstein', 'broyden'} <= sys.stateful_methods
+    assert 'anderson' not in sys.stateful_methods
+
+def test_solver_state_cache():
+    sys, feed = create_recycle_system()
+    sys.set_tolerance(mol=1e-6, rmol=1e-6, maxiter=1000)
+    iterations = {}
+    for cache in (False, True):
+        sys.cache_solver_state = cache
+        sys.reset_cache()
+        sys.empty_recycles()
+        np.random.seed(0)
+        total = 0
+        for n in range(8):
+            feed.imol['Water', 'Ethanol'] = 100 * np.random.uniform(0.95, 1.05, 2)
+            sys.simulate()
+            total += sys._iter
+        iterations[cache] = total
+    assert iterations[True] < iterations[False]
+    state = sys._solver_state['aitken']
+    assert state['size'] == sys._get_recycle_data().size
+    assert np.isfinite(state['weights']).all()
+    sys.reset_cache()
+    assert not sys._solver_state
+    sys.simulate()
+    assert sys._solver_state
+    sys.update_configuration()
+    assert not sys._solver_state
+    sys.cache_solver_state = False
+    sys.simulate()
+    assert not sys._solver_state
+
+def test_wegstein_convergence():
+    sys, feed = create_recycle_system()
+    product = sys.flowsheet.stream.product
+    sys.set_tolerance(method='fixedpoint', mol=1e-8, rmol=1e-8, maxiter=1000)
+    sys.simulate()
+    expected = product.mol.copy()
+    fixedpoint_iterations = sys._iter
+    sys.set_tolerance(method='wegstein', mol=1e-8, rmol=1e-8, maxiter=1000)
+    for cache in (False, True):
+        sys.cache_solver_state = cache
+        for n in range(3):
+            sys.reset_cache()
+            sys.empty_recycles()
+            sys.simulate()
+            assert sys._iter < fixedpoint_iterations
+            assert_allclose(product.mol, expected, rtol=1e-6)
+    assert np.isfinite(sys._solver_state['wegstein']['weights']).all()
+
+def test_recycle_buffer():
+    sys, feed = create_recycle_system()
+    sys.simulate()
+    recycle = sys.recycle
+    data = sys._get_recycle_data()
+    assert data.size == recycle.chemicals.size + 2
+    assert data[0] == recycle.T and data[1] == recycle.P
+    assert_allclose(data[2:], recycle.mol)
+    buffer = sys._recycle_buffer
+    data[2:] *= 2
+    sys._set_recycle_data(data)
+    assert_allclose(recycle.mol, data[2:])
+    assert sys._recycle_buffer is buffer # Buffer is reused
+    data[2:] = 0
+    assert_allclose(sys._get_recycle_data()[2:], recycle.mol) # Copies are returned
+    
+    # Buffer is rebuilt when the size of recycle data changes
+    recycle.phases = ('g', 'l')
+    data = sys._get_recycle_data()
+    assert sys._recycle_buffer is not buffer
+    assert data.size == 2 * recycle.chemicals.size + 2
+    with pytest.raises(IndexError): sys._set_recycle_data(data[:-1])
+    sys.update_configuration()
+    assert sys._recycle_buffer is None
+
+def test_incremental_simulation(monkeypatch):
+    sys, feed = create_recycle_system()
+    f = sys.flowsheet
+    S1 = bst.Splitter('S1', f.stream.product, split=0.5)
+    H1 = bst.HXutility('H1', S1-0, T=360)
+    sys = f.create_system('incremental_sys')
+    sys.set_tolerance(mol=1e-6, rmol=1e-6, maxiter=1000, subsystems=True)
+    runs = []
+    run = bst.Unit.run
+    def counted_run(self):
+        runs.append(self)
+        return run(self)
+    monkeypatch.setattr(bst.Unit, 'run', counted_run)
+    
+    def simulate():
+        runs.clear()
+        sys.simulate()
+        return set(runs)
+    
+    def assert_full_simulation_results():
+        results = [i.mol.copy() for i in sys.streams] + [i.purchase_cost for i in sys.units]
+        sys.incremental = False
+        sys.simulate()
+        sys.incremental = True
+        for i, j in zip(results, [i.mol for i in sys.streams] + [i.purchase_cost for i in sys.units]):
+            assert_allclose(i, j, rtol=1e-6, atol=1e-9)
+        sys.simulate()
+    
+    sys.incremental = True
+    assert len(simulate()) == len(sys.units)
+    assert simulate() == set() # No changes
+    S1.split[:] = 0.3 # Changes to chemical indexers are detected
+    assert simulate() == {S1, H1}
+    assert_full_simulation_results()
+    H1.T = 350
+    assert simulate() == {H1}
+    assert_full_simulation_results()
+    feed.imol['Water'] = 120 # Changes to feeds are detected
+    assert simulate() == set(sys.units)
+    assert_full_simulation_results()
+    sys.mark_dirty(S1-0)
+    assert simulate() == {H1}
+    CE = bst.CE
+    bst.CE = 2 * CE # Changes to prices rerun the whole system
+    try:
+        assert simulate() == set(sys.units)
+    finally:
+        bst.CE = CE
+    sys.simulate()
+    sys.mark_dirty()
+    assert simulate() == set(sys.units)
+    sys.reset_cache()
+    assert simulate() == set(sys.units)
+    sys.incremental = False
+    assert simulate() == set(sys.units)
+    assert sys._incremental_state is None
+    
+    # Recycle loops are only reconverged if affected by changes
+    M1, U1 = f.unit.M1, f.unit.U1
+    sys = bst.System('top_level_recycle_sys', [M1, U1, S1, H1], recycle=U1-0)
+    sys.set_tolerance(mol=1e-6, rmol=1e-6, maxiter=1000)
+    sys.incremental = True
+    sys.simulate()
+    H1.T = 360
+    simulate()
+    assert runs == [H1]
+    assert_full_simulation_results()
+    U1.base_split = 0.9 * U1.base_split
+    assert simulate() == set(sys.units)
+    assert len(runs) > len(sys.units)
+    assert_full_simulation_results()
+
+if __name__ == '__main__':
+    test_recycle_solvers()
+    test_solver_state_cache()
+    test_wegstein_convergence()
+    test_recycle_buffer()
+    test_incremental_simulation(pytest.MonkeyPatch())
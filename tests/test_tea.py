@@ -51,6 +51,202 @@ def test_depreciation_schedule():
     with pytest.raises(ValueError):
         tea.depreciation = 'bad'
 
+def test_batch_cashflow_analysis():
+    import biosteam as bst
+    from biorefineries.sugarcane import create_tea
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    
+    class Reactor(bst.Unit):
+        _F_BM_default = {'Reactor': 2}
+        _default_equipment_lifetime = {'Reactor': 7}
+        
+        def _cost(self):
+            self.baseline_purchase_costs['Reactor'] = 5e6
+            self.add_power_utility(500)
+    
+    feed = bst.Stream('batch_feed', Water=1000, price=0.05)
+    R1 = Reactor(None, feed, bst.Stream('batch_product', price=0.2))
+    sys = bst.System.from_units('batch_sys', [R1])
+    sys.simulate()
+    tea = create_tea(sys)
+    product = R1.outs[0]
+    N = 20
+    rng = np.random.default_rng(0)
+    schedule = rng.uniform(0.2, 0.6, N)
+    parameters = dict(
+        IRR=rng.uniform(0.05, 0.15, N),
+        income_tax=rng.uniform(0.2, 0.4, N),
+        finance_interest=rng.choice([0., 0.05, 0.08], N),
+        finance_fraction=rng.uniform(0.2, 0.6, N),
+        finance_years=rng.choice([5, 10], N),
+        startup_months=rng.uniform(0, 6, N),
+        WC_over_FCI=rng.uniform(0.03, 0.08, N),
+        construction_schedule=np.column_stack([schedule, 1 - schedule]),
+    )
+    prices = {feed: rng.uniform(0.04, 0.06, N), product: rng.uniform(0.15, 0.25, N)}
+    NPV = tea.batch_NPV(prices, **parameters)
+    IRR = tea.batch_solve_IRR(prices, **parameters)
+    price = tea.batch_solve_price(product, prices, **parameters)
+    cashflows = tea.batch_cashflow_arrays(prices, **parameters)
+    assert cashflows.shape == (N, tea._start + tea._years)
+    
+    original_parameters = {i: getattr(tea, i) for i in parameters}
+    original_prices = {i: i.price for i in prices}
+    try:
+        for i in range(N):
+            for name, value in parameters.items(): setattr(tea, name, value[i])
+            for stream, value in prices.items(): stream.price = value[i]
+            assert_allclose(cashflows[i], tea.cashflow_array, rtol=1e-6, atol=10)
+            assert_allclose(NPV[i], tea.NPV, rtol=1e-6, atol=10)
+            assert_allclose(IRR[i], tea.solve_IRR(), atol=1e-6)
+            assert_allclose(price[i], tea.solve_price(product), rtol=1e-5)
+    finally:
+        for name, value in original_parameters.items(): setattr(tea, name, value)
+        for stream, value in original_prices.items(): stream.price = value
+    
+    # Scalar parameters are broadcasted
+    assert_allclose(tea.batch_NPV(IRR=[tea.IRR]), [tea.NPV])
+    assert_allclose(tea.batch_NPV(income_tax=[0.2, 0.3])[0], tea.batch_NPV(income_tax=0.2))
+    with pytest.raises(TypeError):
+        tea.batch_NPV(lang_factor=[3, 4])
+    with pytest.raises(ValueError):
+        tea.batch_NPV(IRR=[0.1, 0.2], income_tax=[0.2, 0.3, 0.4])
+    
+    # Custom cash flows are evaluated one scenario at a time
+    class GrantTEA(type(tea)):
+        __slots__ = ()
+        
+        def _taxable_nontaxable_depreciation_cashflows(self):
+            taxable, nontaxable, depreciation = super()._taxable_nontaxable_depreciation_cashflows()
+            nontaxable[self._start - 1] += 1e6
+            return taxable, nontaxable, depreciation
+    
+    tea.__class__ = GrantTEA
+    try:
+        grant_NPV = tea.batch_NPV(prices, **parameters)
+        assert (grant_NPV > NPV).all()
+        for i in range(N):
+            for name, value in parameters.items(): setattr(tea, name, value[i])
+            for stream, value in prices.items(): stream.price = value[i]
+            assert_allclose(grant_NPV[i], tea.NPV, rtol=1e-6, atol=10)
+    finally:
+        tea.__class__ = GrantTEA.__base__
+        for name, value in original_parameters.items(): setattr(tea, name, value)
+        for stream, value in original_prices.items(): stream.price = value
+
+def test_cashflow_cache(monkeypatch):
+    import biosteam as bst
+    from biorefineries.sugarcane import create_tea
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    
+    class Reactor(bst.Unit):
+        _F_BM_default = {'Reactor': 2}
+        _default_equipment_lifetime = {'Reactor': 7}
+        
+        def _cost(self):
+            self.baseline_purchase_costs['Reactor'] = 5e3 * self.ins[0].F_mass
+    
+    feed = bst.Stream('cache_feed', Water=1000, price=0.05)
+    R1 = Reactor(None, feed, bst.Stream('cache_product', price=0.2))
+    sys = bst.System.from_units('cache_sys', [R1])
+    sys.simulate()
+    tea = create_tea(sys)
+    calls = []
+    f = TEA._taxable_nontaxable_depreciation_cashflows
+    def count_calls(self): 
+        calls.append(1)
+        return f(self)
+    monkeypatch.setattr(TEA, '_taxable_nontaxable_depreciation_cashflows', count_calls)
+    
+    def uncached(name):
+        tea.reset_cache()
+        return getattr(tea, name)() if name.startswith('solve') else getattr(tea, name)
+    
+    # Cash flows are built once for all metrics
+    metrics = (tea.NPV, tea.cashflow_array, tea.net_earnings_array, tea.solve_IRR(),
+               tea.solve_price(R1.outs[0]))
+    assert len(calls) == 1
+    assert_allclose(metrics[0], uncached('NPV'))
+    assert_allclose(metrics[3], uncached('solve_IRR'))
+    tea.cashflow_array[:] = 0 # Cached arrays are not exposed
+    assert_allclose(tea.cashflow_array, metrics[1])
+    
+    # Cash flows are rebuilt after changes in prices, TEA attributes, and costs
+    N_calls = len(calls)
+    tea.IRR = 0.2
+    assert_allclose(tea.NPV, uncached('NPV'))
+    assert len(calls) == N_calls + 1
+    for change in (lambda: setattr(feed, 'price', 0.06),
+                   lambda: setattr(tea, 'income_tax', 0.3),
+                   lambda: setattr(tea, 'operating_days', 300),
+                   lambda: (feed.set_total_flow(2000, 'kg/hr'), sys.simulate())):
+        NPV = tea.NPV
+        change()
+        N_calls = len(calls)
+        assert tea.NPV != NPV
+        assert len(calls) == N_calls + 1
+        assert_allclose(tea.NPV, uncached('NPV'))
+
+def test_break_even_solvers():
+    import biosteam as bst
+    from biorefineries.sugarcane import create_tea
+    from biosteam._tea import solve_sales_with_income_tax
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    
+    class Reactor(bst.Unit):
+        _F_BM_default = {'Reactor': 2}
+        _default_equipment_lifetime = {'Reactor': 7}
+        
+        def _cost(self):
+            self.baseline_purchase_costs['Reactor'] = 5e6
+            self.add_power_utility(500)
+    
+    feed = bst.Stream('break_even_feed', Water=1000, price=0.05)
+    R1 = Reactor(None, feed, bst.Stream('break_even_product', price=0.2))
+    sys = bst.System.from_units('break_even_sys', [R1])
+    sys.simulate()
+    tea = create_tea(sys)
+    product = R1.outs[0]
+    for income_tax in (0., 0.21, 0.35):
+        tea.income_tax = income_tax
+        for price in (0.01, 0.2, 1.):
+            product.price = price
+            product.price = tea.solve_price(product)
+            assert abs(tea.NPV) < 1e-3
+            tea.IRR = tea.solve_IRR()
+            assert abs(tea.NPV) < 1e-3
+            tea.IRR = 0.1
+    
+    # NPV is piecewise linear in sales; the break even point is exact
+    rng = np.random.default_rng(0)
+    taxable = rng.normal(0, 1e6, (50, 20))
+    nontaxable = rng.normal(0, 1e6, (50, 20))
+    coefficients = rng.uniform(0, 1, (50, 20))
+    coefficients[:, :3] = 0.
+    discount_factors = 1.1 ** np.arange(-2, 18.)
+    income_tax = rng.uniform(0, 0.5, 50)
+    sales = solve_sales_with_income_tax(
+        taxable, nontaxable, coefficients, np.tile(discount_factors, (50, 1)), income_tax
+    )
+    taxable = taxable + sales[:, None] * coefficients
+    tax = income_tax[:, None] * np.maximum(taxable, 0.)
+    assert_allclose(((nontaxable + taxable - tax) / discount_factors).sum(1), 0., atol=1e-6)
+    
+    # Break even points with incentives are solved numerically
+    class IncentiveTEA(type(tea)):
+        __slots__ = ()
+        
+        def _fill_tax_and_incentives(self, incentives, taxable_cashflow, nontaxable_cashflow, tax, depreciation):
+            super()._fill_tax_and_incentives(incentives, taxable_cashflow, nontaxable_cashflow, tax, depreciation)
+            incentives[:] = 0.5 * tax
+    
+    tea = tea.copy()
+    tea.__class__ = IncentiveTEA
+    product.price = tea.solve_price(product)
+    assert abs(tea.NPV) < 1e4
 
 if __name__ == '__main__':
-    test_depreciation_schedule()
\ No newline at end of file
+    test_depreciation_schedule()
+    test_batch_cashflow_analysis()
+    test_cashflow_cache(pytest.MonkeyPatch())
+    test_break_even_solvers()
\ No newline at end of file
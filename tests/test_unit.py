@@ -264,6 +264,85 @@ def test_equipment_lifetimes():
        -7321300., -4321300., -4321300., -3556300.
     ]
     assert_allclose(tea.cashflow_array, cashflows)
+
+def test_summary_memoization():
+    bst.settings.set_thermo(['Water', 'Ethanol'], cache=True)
+    designs = []
+    
+    class Tank(bst.Unit):
+        _F_BM_default = {'Tank': 2}
+        memoize_summary = True # Opt in
+        tau = 2
+        
+        def _design(self):
+            designs.append(self)
+            self.design_results['Volume'] = self.tau * self.feed.F_vol
+            self.add_heat_utility(1e5 * self.tau, self.feed.T)
+            
+        def _cost(self):
+            self.baseline_purchase_costs['Tank'] = 1e3 * self.design_results['Volume'] ** 0.6
+            self.add_power_utility(self.design_results['Volume'])
+    
+    feed = bst.Stream(Water=100, Ethanol=10)
+    T1 = Tank(ins=feed)
+    
+    def simulate():
+        designs.clear()
+        T1.simulate()
+        return (T1.design_results.copy(), T1.installed_cost, T1.utility_cost, 
+                T1.power_utility.rate, [i.duty for i in T1.heat_utilities])
+    
+    results = simulate()
+    assert designs == [T1]
+    assert simulate() == results and not designs # Results are reused
+    assert T1.summary_cache_info() == (1, 1)
+    T1.tau = 3 # Changes to unit attributes are detected
+    assert simulate() != results and designs == [T1]
+    T1.tau = 2
+    feed.imol['Water'] = 200 # Changes to streams are detected
+    assert simulate() != results and designs == [T1]
+    feed.imol['Water'] = 100
+    assert simulate() == results and designs == [T1]
+    T1.F_BM['Tank'] = 3 # Changes to cost factors are detected
+    assert simulate()[1] != results[1] and designs == [T1]
+    T1.F_BM['Tank'] = 2
+    assert simulate() == results and designs == [T1]
+    T1.memoize_summary = False # Opt out
+    assert simulate() == results and designs == [T1]
+    del T1.memoize_summary
+    assert simulate() == results and not designs
+    CE = bst.CE
+    bst.CE = 2 * CE # Changes to prices are detected
+    try: 
+        simulate()
+        assert designs == [T1]
+    finally:
+        bst.CE = CE
+    assert T1.summary_cache_info() == (2, 7)
+    assert T1.summary_cache_info().hit_rate == 2 / 9
+    T1.clear_summary_cache()
+    assert T1.summary_cache_info() == (0, 0)
+    
+    # Changes to class attributes are not detected
+    simulate()
+    Tank.tau = 3
+    assert simulate() == results and not designs
+    Tank.tau = 2
+    
+    # Units do not memoize results by default
+    assert not bst.Flash.memoize_summary
+    
+    # Auxiliary units are also restored
+    F1 = bst.Flash(ins=bst.Stream(Water=100, Ethanol=10), T=360, P=101325)
+    F1.memoize_summary = True
+    S1 = bst.Splitter(ins=F1-0, split=0.5)
+    sys = bst.System.from_units(units=[F1, S1])
+    sys.simulate()
+    results = F1.results()
+    sys.simulate()
+    assert F1.summary_cache_info().hits == 1
+    assert (F1.results() == results).all().all()
+    assert sys.summary_cache_info() == (1, 1) # Splitter has no design or cost algorithms
     
 if __name__ == '__main__':
     test_unit_inheritance_setup_method()
@@ -271,4 +350,5 @@ if __name__ == '__main__':
     test_process_specifications_with_recycles()
     test_unit_connections()
     test_unit_graphics()
-    test_equipment_lifetimes()
\ No newline at end of file
+    test_equipment_lifetimes()
+    test_summary_memoization()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import pytest
 import biosteam as bst
+import numpy as np
 from numpy import allclose
 
 def test_heat_util_sum():
@@ -53,6 +54,69 @@ def test_power_util_sum():
     )
     pass
 
+def test_heat_util_batch_evaluate():
+    rng = np.random.default_rng(0)
+    N = 200
+    unit_duties = rng.uniform(-1e6, 1e6, N)
+    unit_duties[::10] = 0.
+    T_in = rng.uniform(280, 450, N)
+    dT = rng.uniform(0, 30, N)
+    T_out = np.where(unit_duties < 0, T_in - dT, T_in + dT)
+    hus = [bst.HeatUtility() for i in range(N)]
+    agents, flows, duties, costs = bst.HeatUtility.batch_evaluate(
+        unit_duties, T_in, T_out, heat_utilities=hus
+    )
+    for i in range(N):
+        hu = bst.HeatUtility()
+        hu(unit_duties[i], T_in[i], T_out[i])
+        assert agents[i] is hu.agent is hus[i].agent
+        assert allclose([flows[i], duties[i], costs[i]], [hu.flow, hu.duty, hu.cost])
+        assert allclose([hus[i].flow, hus[i].duty, hus[i].cost], [hu.flow, hu.duty, hu.cost])
+        if hu.agent:
+            assert hus[i].outlet_utility_stream.T == hu.outlet_utility_stream.T
+            assert hus[i].outlet_utility_stream.phase == hu.outlet_utility_stream.phase
+    
+def test_suitable_agent_table():
+    HeatUtility = bst.HeatUtility
+    low_pressure_steam = HeatUtility.get_heating_agent('low_pressure_steam')
+    medium_pressure_steam = HeatUtility.get_heating_agent('medium_pressure_steam')
+    cooling_water = HeatUtility.get_cooling_agent('cooling_water')
+    assert HeatUtility.get_suitable_heating_agent(400) is low_pressure_steam
+    assert HeatUtility.get_suitable_cooling_agent(310) is cooling_water
+    T = low_pressure_steam.T
+    try:
+        # Table is rebuilt when agent temperatures change
+        low_pressure_steam.T = 390
+        assert HeatUtility.get_suitable_heating_agent(400) is medium_pressure_steam
+    finally:
+        low_pressure_steam.T = T
+    assert HeatUtility.get_suitable_heating_agent(400) is low_pressure_steam
+    heating_agents = HeatUtility.heating_agents
+    try:
+        # Table is rebuilt when agents change; the first suitable agent 
+        # (by order of preference) is selected
+        HeatUtility.heating_agents = heating_agents[::-1]
+        assert HeatUtility.get_suitable_heating_agent(400).ID == 'high_pressure_steam'
+        HeatUtility.heating_agents.append(low_pressure_steam)
+        assert HeatUtility.get_suitable_heating_agent(500).ID == 'high_pressure_steam'
+        with pytest.raises(RuntimeError):
+            HeatUtility.get_suitable_heating_agent(600)
+    finally:
+        HeatUtility.heating_agents = heating_agents
+    assert HeatUtility.get_suitable_heating_agent(400) is low_pressure_steam
+    
+def test_reused_utility_streams():
+    agent = bst.HeatUtility.get_agent('low_pressure_steam')
+    hu = bst.HeatUtility()
+    hu(1e6, 300, 350, agent)
+    hu.outlet_utility_stream.T = 600 # E.g., after mixing or reversing utilities
+    hu.empty()
+    hu(1e6, 300, 350, agent)
+    assert hu.outlet_utility_stream.T == agent.T
+    
 if __name__ == '__main__':
     test_heat_util_sum()
-    test_power_util_sum()
\ No newline at end of file
+    test_power_util_sum()
+    test_heat_util_batch_evaluate()
+    test_suitable_agent_table()
+    test_reused_utility_streams()